@@ -12,4 +12,4 @@ https://packaging.python.org/en/latest/tutorials/packaging-projects/
 
 """
 
-__all__ = ["homemade", "lecroy", "srs", "thorlabs"]
\ No newline at end of file
+__all__ = ["control", "homemade", "lecroy", "srs", "thorlabs"]
\ No newline at end of file
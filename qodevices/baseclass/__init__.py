@@ -6,4 +6,6 @@ from pip library.
 
 """
 
-__all__ = ["baseserial"]
+__all__ = ["baseserial", "batching", "channels", "dump",
+           "moments", "polling", "ringbuffer",
+           "error_queue", "usbtmc_transport", "waiting"]
@@ -5,6 +5,7 @@ Basic serial communications class for all serial instruments
 Builds on pip's pyserial library
 
 Thormund 18 Nov 2022
+Thormund 19 Oct 2026 - add raw and pipelined read/write helpers
 """
 from pathlib import Path
 from serial import Serial
@@ -34,6 +35,10 @@ class serial_comm(Serial):
         """
         super().write((string + '\n').encode())
 
+    def write_raw(self, data: bytes) -> None:
+        """writes pre-encoded bytes to serial device, without a terminator"""
+        super().write(data)
+
     def _serial_read(self) -> bytes:
         """Reads from serial device"""
         # old get_response method using read(64) is unreliable
@@ -43,3 +48,19 @@ class serial_comm(Serial):
         """Queries response after writing to device."""
         self.write(string)
         return self._serial_read()
+
+    def write_many(self, strings) -> None:
+        """Writes several commands to the device in a single transfer."""
+        self.write_raw(''.join(f'{string}\n' for string in strings).encode())
+
+    def ask_many(self, strings) -> list:
+        """Queries several commands in a single pipelined transfer.
+
+        All commands are written at once before any reply is read, so the
+        device never waits on the host between commands. Every command
+        must produce exactly one line of reply.
+        Returns a list of replies, in the order of the commands.
+        """
+        strings = list(strings)
+        self.write_many(strings)
+        return [self._serial_read() for _ in strings]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Chained query batching
+
+SRS instruments, and SCPI instruments in general, accept several commands on
+one line separated by ';' and answer all queries of that line in a single
+reply, again separated by ';'. Chaining queries this way replaces one round
+trip per query by one round trip per line.
+
+Works with any driver that has an ask(str) method returning a line of reply,
+either as bytes (serial_comm) or as str (usbtmc Instrument).
+
+Thormund 19 Oct 2026 - created for single round trip SRS monitoring
+"""
+__all__ = ["chain", "split_reply", "ask_chained"]
+
+##### batching constants #####
+
+SEPARATOR = ';'
+
+# conservative input buffer size shared by SRS and most SCPI instruments
+MAX_LINE_LENGTH = 255
+
+def chain(commands, separator: str = SEPARATOR,
+          max_length: int = MAX_LINE_LENGTH) -> list:
+    """
+    Groups commands into as few lines as possible, no line exceeding
+    max_length characters. Returns a list of lists of commands.
+    """
+    lines, line, length = [], [], 0
+    for command in commands:
+        if len(command) > max_length:
+            raise ValueError(f"{command = } exceeds {max_length = }")
+        added = len(command) + (len(separator) if line else 0)
+        if line and length + added > max_length:
+            lines.append(line)
+            line, length = [], 0
+            added = len(command)
+        line.append(command)
+        length += added
+    if line:
+        lines.append(line)
+    return lines
+
+def split_reply(reply, separator: str = SEPARATOR) -> list:
+    """splits a combined reply into its stripped fields, as str"""
+    if isinstance(reply, bytes):
+        reply = reply.decode()
+    return [field.strip() for field in reply.strip().split(separator)]
+
+def ask_chained(device, commands, separator: str = SEPARATOR,
+                max_length: int = MAX_LINE_LENGTH) -> list:
+    """
+    Queries all commands in as few chained lines as possible.
+
+    Input
+    -----
+    device: driver with an ask method
+    commands (iterable of str): commands, only those containing '?' are
+        expected to produce a reply
+    separator (str): Optional. command and reply separator
+    max_length (int): Optional. longest line the instrument accepts
+
+    Returns a list of str replies, one per query, in order.
+    Raises ValueError if the number of replies does not match.
+    """
+    replies = []
+    for line in chain(commands, separator, max_length):
+        expected = sum('?' in command for command in line)
+        if not expected:
+            device.write(separator.join(line))
+            continue
+        fields = split_reply(device.ask(separator.join(line)), separator)
+        # some firmware answers every query of a line on its own line
+        read_more = getattr(device, '_serial_read', None)
+        while len(fields) < expected and read_more is not None:
+            more = read_more()
+            if not more:
+                break
+            fields += split_reply(more, separator)
+        if len(fields) != expected:
+            raise ValueError(
+                f"Expected {expected} replies to {line}, got {fields}")
+        replies += fields
+    return replies
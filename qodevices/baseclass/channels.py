@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Channel-indexed access for multi-channel serial devices
+
+A channelArray is declared once on a driver class for a family of per-channel
+commands, such as 'OUT? n' / 'OUT n v'. Indexing it on an instance pipelines
+the commands for every selected channel in a single transfer (see
+serial_comm.ask_many and serial_comm.write_many):
+
+    dev.out[:]          -> numpy array of all outputs
+    dev.out[0]          -> single value
+    dev.set[0] = x
+    dev.out[:] = array
+    dev.out = array     -> same as dev.out[:] = array
+
+Indices are positions in the channels tuple given to the channelArray, which
+need not coincide with the channel numbers of the device.
+
+Thormund 19 Oct 2026 - created for pipelined per-channel reads and writes
+"""
+__all__ = ["channelArray"]
+
+import numpy as np
+
+
+class channelArray:
+    """Descriptor declaring an indexed family of per-channel commands."""
+
+    def __init__(self, query: str, command: str = None,
+                 channels: tuple = (0, 1), dtype=float,
+                 validate=None, doc: str = None) -> None:
+        """
+        Creates a channelArray descriptor.
+
+        Input
+        -----
+        query (str): query format with one field for the channel, 'OUT? {}'
+        command (str): Optional. write format with fields for channel and
+            value, 'OUT {} {}'. Read-only if not given.
+        channels (tuple): Optional. channel numbers, in index order
+        dtype: Optional. type of the values, float or int
+        validate (callable): Optional. called with the array of values to be
+            written, should raise ValueError on illegal values
+        doc (str): Optional. docstring
+        """
+        self.query = query
+        self.command = command
+        self.channels = tuple(channels)
+        self.dtype = dtype
+        self.validate = validate
+        self.__doc__ = doc
+
+    def __set_name__(self, owner, name) -> None:
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return boundChannels(self, instance)
+
+    def __set__(self, instance, value) -> None:
+        boundChannels(self, instance)[:] = value
+
+
+class boundChannels:
+    """A channelArray bound to a device instance."""
+
+    def __init__(self, spec: channelArray, device) -> None:
+        self._spec = spec
+        self._device = device
+
+    def __len__(self) -> int:
+        return len(self._spec.channels)
+
+    def __repr__(self) -> str:
+        return f"<{self._spec.name} channels {self._spec.channels}>"
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        values = self[:]
+        return values if dtype is None else values.astype(dtype)
+
+    def _select(self, key) -> tuple:
+        """returns (channel numbers, True if key selects a single channel)"""
+        channels = self._spec.channels
+        if isinstance(key, (int, np.integer)):
+            return [channels[key]], True
+        if isinstance(key, slice):
+            return list(channels[key]), False
+        return np.asarray(channels)[key].tolist(), False
+
+    def __getitem__(self, key):
+        selected, single = self._select(key)
+        spec = self._spec
+        replies = self._device.ask_many(spec.query.format(c) for c in selected)
+        try:
+            values = np.array(replies, dtype=bytes).astype(spec.dtype)
+        except ValueError:
+            raise ValueError(f"Unexpected replies {replies} to {spec.query}")
+        return values[0].item() if single else values
+
+    def __setitem__(self, key, value) -> None:
+        spec = self._spec
+        if spec.command is None:
+            raise AttributeError(f"{spec.name} is read-only")
+        selected, _ = self._select(key)
+        values = np.broadcast_to(np.asarray(value), (len(selected),))
+        if spec.validate is not None:
+            spec.validate(values)
+        values = values.astype(spec.dtype).tolist()
+        self._device.write_many(
+            spec.command.format(c, v) for c, v in zip(selected, values))
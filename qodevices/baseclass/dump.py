@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Bulk property dump
+
+Reads every readable property of a driver in a handful of round trips, for
+lab notebook records. Works for serial and usbtmc drivers alike, without any
+per-driver tables:
+
+1. each property getter is run once against a stand-in for the device that
+   records the query it sends, instead of sending it
+2. the recorded queries are sent in batches, ';' chained where the driver
+   supports it (ask_chained) or pipelined on serial lines (ask_many).
+   Recorded commands without a '?' get no reply on a chained line and are
+   asked one by one.
+3. each getter is run again against a stand-in that replays its reply, so
+   that the getter's own parsing produces the typed value
+
+A batch that fails is retried one query at a time, so a single bad command
+costs only its own value.
+
+Thormund 19 Oct 2026 - created for lab notebook records of all settings
+"""
+__all__ = ["dump", "readable_properties"]
+
+import logging
+
+from serial import SerialException
+
+from .baseserial import serial_comm
+from .batching import ask_chained, chain
+
+##### dump constants #####
+
+# queries per pipelined batch on serial lines
+PIPELINE_BATCH = 16
+
+class _recorded(Exception):
+    """raised by the recording stand-in to stop a getter after its query"""
+
+def _stand_in(cls, transport: dict):
+    """
+    Returns an uninitialised instance of a subclass of cls whose transport
+    methods are replaced, so that getters see their own class and any
+    descriptors they use, but never touch the real device.
+    """
+    namespace = dict(transport)
+    # uninitialised serial ports must not try to close on garbage collection
+    namespace['close'] = lambda self: None
+    namespace['__del__'] = lambda self: None
+    stand_in = type(f'_{cls.__name__}StandIn', (cls,), namespace)
+    return stand_in.__new__(stand_in)
+
+def readable_properties(cls) -> list:
+    """
+    returns the names of all public properties with a getter that cls
+    defines or inherits from this package. Settings of the pyserial or usbtmc
+    base classes are not device queries and are left out.
+    """
+    package = __name__.split('.')[0]
+    names = []
+    for name in dir(cls):
+        prop = getattr(cls, name, None)
+        if (not name.startswith('_') and isinstance(prop, property)
+                and prop.fget is not None
+                and prop.fget.__module__.split('.')[0] == package):
+            names.append(name)
+    return names
+
+def _record_queries(cls, names) -> dict:
+    """returns {name: [queries]} of the getters that query the device"""
+    recorded = []
+
+    def ask(self, command, *args, **kwargs):
+        recorded.append(command)
+        raise _recorded
+
+    def ask_many(self, commands):
+        recorded.extend(commands)
+        raise _recorded
+
+    recorder = _stand_in(cls, {'ask': ask, 'query': ask, 'ask_many': ask_many})
+    queries = {}
+    for name in names:
+        recorded.clear()
+        try:
+            getattr(cls, name).fget(recorder)
+            # getter does not talk to the device, e.g. not implemented
+            queries[name] = []
+        except _recorded:
+            queries[name] = list(recorded)
+        except Exception:
+            # getters that need more than the transport are read one by one
+            queries[name] = None
+    return queries
+
+def _replayer(cls, encode: bool):
+    """
+    Returns replay(name, replies), which runs the getter of name on replies
+    instead of the device.
+    """
+    state = {}
+
+    def ask(self, command, *args, **kwargs):
+        reply = next(state['replies'])
+        return reply.encode() if encode else reply
+
+    def ask_many(self, commands):
+        return [ask(self, command) for command in commands]
+
+    stand_in = _stand_in(cls, {'ask': ask, 'query': ask, 'ask_many': ask_many})
+
+    def replay(name: str, replies: list):
+        state['replies'] = iter(replies)
+        return getattr(cls, name).fget(stand_in)
+    return replay
+
+def _send(device, commands: list) -> list:
+    """sends commands in batches, returns replies as str or Exceptions"""
+    if isinstance(device, serial_comm) and not hasattr(device, 'ask_chained'):
+        batches = [commands[i:i + PIPELINE_BATCH]
+                   for i in range(0, len(commands), PIPELINE_BATCH)]
+
+        def send_batch(batch):
+            replies = [r.decode() for r in device.ask_many(batch)]
+            if not all(replies):
+                # a missing reply may still arrive later, drop it
+                device.reset_input_buffer()
+                raise TimeoutError(f"No reply to some of {batch}")
+            return replies
+    else:
+        chained = getattr(device, 'ask_chained', None)
+        # chained lines only answer commands with a '?', getters that ask
+        # anything else, e.g. 'FILT:STAT', get a round trip of their own
+        batches, run = [], []
+        for command in commands:
+            if '?' in command:
+                run.append(command)
+                continue
+            if run:
+                batches += chain(run)
+                run = []
+            batches.append([command])
+        if run:
+            batches += chain(run)
+
+        def send_batch(batch):
+            if '?' not in batch[0]:
+                reply = device.ask(batch[0])
+                return [reply.decode() if isinstance(reply, bytes) else reply]
+            if chained is not None:
+                return chained(batch)
+            return ask_chained(device, batch)
+
+    replies = []
+    for batch in batches:
+        try:
+            replies += send_batch(batch)
+            continue
+        except (ValueError, TimeoutError, SerialException, OSError) as exc:
+            logging.info(f"batch failed with {exc!r}, retrying one by one")
+        for command in batch:
+            try:
+                replies += send_batch([command])
+            except Exception as exc:
+                replies.append(exc)
+    return replies
+
+def dump(device, names=None) -> dict:
+    """
+    Reads all readable properties of device in batched round trips.
+
+    Input
+    -----
+    device: any serial_comm or usbtmc Instrument based driver
+    names (iterable of str): Optional. properties to read, all by default
+
+    Returns a dict of property name to value, typed as the property returns
+    it, except that raw bytes replies are decoded to str. Properties that
+    could not be read map to the Exception raised instead.
+    """
+    cls = type(device)
+    names = readable_properties(cls) if names is None else list(names)
+    queries = _record_queries(cls, names)
+    batched = [name for name in names if queries.get(name)]
+    commands = [q for name in batched for q in queries[name]]
+    replies = _send(device, commands)
+    if len(replies) != len(commands):
+        # replies can no longer be told apart, none of them is trusted
+        mismatch = ValueError(f"Got {len(replies)} replies to "
+                              f"{len(commands)} queries")
+        replies = [mismatch] * len(commands)
+    replies = iter(replies)
+    replay = _replayer(cls, isinstance(device, serial_comm))
+
+    values = {}
+    for name in names:
+        if name in batched:
+            own = [next(replies) for _ in queries[name]]
+            failed = [r for r in own if isinstance(r, Exception)]
+            try:
+                if failed:
+                    raise failed[0]
+                value = replay(name, own)
+            except Exception as exc:
+                value = exc
+        elif queries.get(name) is None:
+            try:
+                value = getattr(device, name)
+            except Exception as exc:
+                value = exc
+        else:
+            continue
+        values[name] = value.decode() if isinstance(value, bytes) else value
+    return values
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Deferred SCPI error-queue checking
+
+Reading SYST:ERR? after every write costs one round trip per write. A
+deferredErrors instance attached to a usbtmc Instrument based driver instead
+records each command sent (a deque append) and drains the error queue in
+chained batches of SYST:ERR? queries only
+- at checkpoint(), e.g. at the end of a configuration block
+- every `every` commands
+- at the first command after `interval` seconds since the last drain
+- when leaving a with block
+
+Errors found at a drain are linked to the commands sent since the previous
+drain, which is exactly one command when every=1 and a short window
+otherwise. The error queue is only read between commands, never from another
+thread, so the instrument needs no locking.
+
+Thormund 19 Oct 2026 - created for error checks at full write throughput
+"""
+__all__ = ["deferredErrors"]
+
+import logging
+from collections import deque
+from time import perf_counter, time
+
+from .batching import split_reply
+
+##### error queue constants #####
+
+ERROR_QUERY = "SYST:ERR?"
+# SYST:ERR? queries chained per transaction when draining
+DRAIN_DEPTH = 8
+# drains per checkpoint before giving up on an error queue that never empties
+MAX_DRAINS = 32
+
+def _parse_error(field: str) -> tuple:
+    """parses '-113,"Undefined header"' into (-113, 'Undefined header')"""
+    code, _, message = field.partition(",")
+    return int(code), message.strip().strip('"')
+
+class deferredErrors:
+    """Records commands sent to an instrument and checks its error queue in
+    batches."""
+
+    def __init__(self, instrument, every: int = None, interval: float = None,
+                 window: int = 256, raise_errors: bool = False) -> None:
+        """
+        Creates a deferredErrors instance and attaches it to instrument.
+
+        Input
+        -----
+        instrument: usbtmc Instrument based driver
+        every (int): Optional. drain after this many commands
+        interval (float): Optional. drain at the first command this many
+            seconds after the last drain
+        window (int): Optional. most recent commands kept for linking
+        raise_errors (bool): Optional. raise ValueError at a drain that finds
+            errors, rather than only logging and recording them
+        """
+        self.instrument = instrument
+        self.every = every
+        self.interval = interval
+        self.raise_errors = raise_errors
+        self.errors = []
+        self._window = deque(maxlen=window)
+        self._sent = 0
+        self._drained_at = 0
+        self._last_drain = perf_counter()
+        self._write = instrument.write
+        instrument.write = self._recorded_write
+
+    def __enter__(self):
+        """dunder method for with statement"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """dunder method for with statement"""
+        try:
+            # do not mask an exception already on its way out
+            self.checkpoint(raise_errors=self.raise_errors and exc_type is None)
+        finally:
+            self.detach()
+
+    def detach(self) -> None:
+        """restores the instrument's own write method, if this instance's
+        wrapper is still installed"""
+        if vars(self.instrument).get("write") == self._recorded_write:
+            del self.instrument.write
+
+    ###### recording ######
+
+    def _recorded_write(self, message, *args, **kwargs) -> None:
+        # a due drain runs before this command, so that it never splits the
+        # write and read of a query
+        if self._due():
+            self.checkpoint()
+        self._sent += 1
+        self._window.append((self._sent, time(), message))
+        self._write(message, *args, **kwargs)
+
+    def _due(self) -> bool:
+        pending = self._sent - self._drained_at
+        if not pending:
+            return False
+        if self.every is not None and pending >= self.every:
+            return True
+        return (self.interval is not None
+                and perf_counter() - self._last_drain >= self.interval)
+
+    @property
+    def pending(self) -> int:
+        """returns the number of commands sent since the last drain"""
+        return self._sent - self._drained_at
+
+    ###### draining ######
+
+    def _read_queue(self) -> list:
+        """reads error queue entries until it reports no error"""
+        found = []
+        # a leading ':' resets the header path, else the second query of the
+        # line would resolve to SYST:SYST:ERR? and add an error
+        line = ";:".join([ERROR_QUERY] * DRAIN_DEPTH)
+        for _ in range(MAX_DRAINS):
+            self._write(line)
+            for field in split_reply(self.instrument.read()):
+                code, message = _parse_error(field)
+                if code == 0:
+                    return found
+                found.append((code, message))
+        logging.warning(f"error queue not empty after {MAX_DRAINS} drains")
+        return found
+
+    def checkpoint(self, raise_errors: bool = None) -> list:
+        """
+        Drains the error queue now.
+
+        Input
+        -----
+        raise_errors (bool): Optional. overrides the raise_errors setting
+
+        Returns a list of the new errors as dicts of code, message, command
+        (the causing command if the window holds a single command, else
+        None), candidates (list of (index, time, command) sent since the
+        previous drain) and drained (time of the drain).
+        Raises ValueError if errors were found and raise_errors is set.
+        """
+        first = self._drained_at + 1
+        candidates = [entry for entry in self._window if entry[0] >= first]
+        found = self._read_queue()
+        self._drained_at = self._sent
+        self._last_drain = perf_counter()
+
+        drained = time()
+        new = []
+        for code, message in found:
+            error = {
+                "code": code,
+                "message": message,
+                "command": candidates[0][2] if len(candidates) == 1 else None,
+                "candidates": candidates,
+                "drained": drained,
+            }
+            logging.warning(
+                f"SCPI error {code} {message!r} after "
+                f"{[command for _, _, command in candidates]}")
+            new.append(error)
+        self.errors += new
+
+        if raise_errors is None:
+            raise_errors = self.raise_errors
+        if new and raise_errors:
+            raise ValueError(
+                "SCPI errors: " + "; ".join(
+                    f"{e['code']} {e['message']!r}" for e in new)
+                + f" within commands "
+                f"{[command for _, _, command in candidates]}")
+        return new
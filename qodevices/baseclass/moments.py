@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Running moments of data arriving in chunks
+
+The mean and the sum of squared deviations (M2) of everything seen so far are
+updated with every chunk, using the pairwise merge of Chan et al., so that
+neither the raw data nor a running sum of squares, which loses precision, has
+to be kept. M2 holds either the per-column sums, for variances, or the full
+matrix, for covariances.
+
+Thormund 19 Oct 2026 - shared by the loop analyzer and the PAX statistics
+"""
+__all__ = ["merge_moments"]
+
+import numpy as np
+
+def merge_moments(count: int, mean: np.ndarray, m2: np.ndarray,
+                  values: np.ndarray) -> int:
+    """
+    Merges the moments of a chunk into the running moments, in place.
+
+    Input
+    -----
+    count (int): number of rows seen before the chunk
+    mean (np.ndarray): running mean, one entry per column
+    m2 (np.ndarray): running sum of squared deviations, one entry per column,
+        or (columns, columns) for the co-deviations
+    values (np.ndarray): (n, columns) chunk, n > 0
+
+    Returns the number of rows seen including the chunk.
+    """
+    n = len(values)
+    chunk_mean = values.mean(axis=0)
+    centred = values - chunk_mean
+    total = count + n
+    delta = chunk_mean - mean
+    if m2.ndim == 2:
+        m2 += centred.T @ centred + np.outer(delta, delta) * count * n / total
+    else:
+        m2 += (centred**2).sum(axis=0) + delta**2 * count * n / total
+    mean += delta * n / total
+    return total
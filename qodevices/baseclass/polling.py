@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Parallel multi-instrument polling
+
+USB bulk transfers release the GIL, so instruments on separate USBTMC
+connections can be read at the same time from separate threads. A
+pollingManager gives every instrument its own single worker thread, so that
+calls to one instrument never interleave, and reads all of them together each
+cycle. A fleet cycle then takes about as long as its slowest instrument
+rather than the sum of all of them.
+
+Each cycle becomes one timestamped row of an aligned table, together with the
+cycle latency, the read time of each instrument and the slowest instrument.
+
+Thormund 19 Oct 2026 - created for polling several ITC4001 and a PAX1000
+"""
+__all__ = ["pollingManager"]
+
+from concurrent.futures import ThreadPoolExecutor
+from numbers import Number
+from time import perf_counter, sleep, time
+
+import numpy as np
+
+
+def _flatten(name: str, reading) -> dict:
+    """flattens one reading into {column: value}"""
+    if isinstance(reading, np.void) and reading.dtype.names:
+        reading = {f: reading[f] for f in reading.dtype.names if f != 't'}
+    if isinstance(reading, dict):
+        return {f"{name}.{key}": value for key, value in reading.items()}
+    if isinstance(reading, (tuple, list, np.ndarray)):
+        return {f"{name}.{i}": value for i, value in enumerate(reading)}
+    return {name: reading}
+
+
+class pollingManager:
+    """Reads several instruments concurrently, one worker per instrument."""
+
+    def __init__(self, devices: dict) -> None:
+        """
+        Creates a pollingManager instance.
+
+        Input
+        -----
+        devices (dict): name -> device, or name -> (device, read) where
+            read(device) returns a number, sequence, dict or structured
+            record. Devices without a read use their measure_all method.
+        """
+        self._devices = {}
+        for name, entry in devices.items():
+            device, read = entry if isinstance(entry, tuple) else (entry, None)
+            if read is None:
+                if not hasattr(device, "measure_all"):
+                    raise ValueError(f"No read given for {name}")
+                read = type(device).measure_all
+            self._devices[name] = (device, read)
+        self._workers = {name: ThreadPoolExecutor(1, f"poll-{name}")
+                         for name in self._devices}
+
+    def __enter__(self):
+        """dunder method for with statement"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """dunder method for with statement"""
+        self.close()
+
+    def close(self) -> None:
+        """stops the worker threads, the devices are left open"""
+        for worker in self._workers.values():
+            worker.shutdown()
+
+    @staticmethod
+    def _timed(device, read) -> tuple:
+        start = perf_counter()
+        reading = read(device)
+        return reading, perf_counter() - start
+
+    def poll(self) -> dict:
+        """
+        Reads every device once, concurrently.
+
+        Returns a row dict with t (time at the start of the cycle), one
+        column per reading, latency (s) for the whole cycle, read_time
+        (dict of s per device) and slowest (name of the slowest device)
+        """
+        t = time()
+        start = perf_counter()
+        futures = {name: self._workers[name].submit(self._timed, *entry)
+                   for name, entry in self._devices.items()}
+        row = {"t": t}
+        read_time = {}
+        for name, future in futures.items():
+            reading, read_time[name] = future.result()
+            row.update(_flatten(name, reading))
+        row["latency"] = perf_counter() - start
+        row["read_time"] = read_time
+        row["slowest"] = max(read_time, key=read_time.get)
+        return row
+
+    def run(self, n: int, interval: float = 0.) -> dict:
+        """
+        Polls n cycles, starting a cycle at most every interval seconds.
+
+        Returns the table as a dict of numpy arrays, one entry per column
+        of poll(), with read times as read_time.<name> columns. Numeric
+        columns are float, text columns str and any others object arrays.
+        Columns missing from some cycles, e.g. a device returning fewer keys,
+        are nan there. The table is empty for n = 0.
+        """
+        table = {}
+        next_start = perf_counter()
+        for i in range(n):
+            delay = next_start - perf_counter()
+            if delay > 0:
+                sleep(delay)
+            next_start += interval
+            row = self.poll()
+            row.update({f"read_time.{name}": value
+                        for name, value in row.pop("read_time").items()})
+            for key, value in row.items():
+                if key not in table:
+                    table[key] = np.full(n, np.nan, dtype=object)
+                table[key][i] = value
+        return {key: _typed(column) for key, column in table.items()}
+
+
+def _typed(column: np.ndarray) -> np.ndarray:
+    """returns an object column as float or str if all its values are"""
+    if all(isinstance(value, (Number, np.number)) for value in column):
+        return column.astype(float)
+    if all(isinstance(value, (str, np.str_)) for value in column):
+        return column.astype(str)
+    return column
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Fixed-size ring buffer for background acquisition
+
+A single writer thread appends rows into a preallocated NumPy array, while any
+number of reader threads take snapshots without locking. The writer publishes
+a row only after it has been filled, by incrementing a monotonic row counter.
+Readers copy the rows they want and then check the counter again, discarding
+any rows that were overwritten while they were copying. The row the writer
+is filling is never readable, so at most size - 1 rows are.
+
+Thormund 19 Oct 2026 - created for high rate strain gauge acquisition
+"""
+__all__ = ["ringBuffer"]
+
+import numpy as np
+
+
+class ringBuffer:
+    """Preallocated (size, width) ring buffer with lock-free snapshots."""
+
+    def __init__(self, size: int, width: int, dtype=float) -> None:
+        """
+        Creates a ringBuffer instance.
+
+        Input
+        -----
+        size (int): number of rows in the buffer, at least 2. The latest
+            size - 1 rows are readable, the remaining one is being written.
+        width (int): number of columns in each row
+        dtype: Optional. NumPy dtype of the buffer
+        """
+        if size < 2 or width < 1:
+            raise ValueError(f"Illegal buffer shape of {(size, width) = }")
+        self._data = np.zeros((size, width), dtype=dtype)
+        self._size = size
+        self._count = 0
+
+    @property
+    def size(self) -> int:
+        """returns number of rows the buffer can hold"""
+        return self._size
+
+    @property
+    def count(self) -> int:
+        """returns total number of rows written since creation or clear"""
+        return self._count
+
+    def __len__(self) -> int:
+        return min(self._count, self._size - 1)
+
+    def clear(self) -> None:
+        """forgets all rows. Only to be called while there is no writer."""
+        self._count = 0
+
+    ### writer side
+
+    def slot(self) -> np.ndarray:
+        """Returns a view of the next row to be filled by the writer.
+
+        The row becomes visible to readers only after commit().
+        """
+        return self._data[self._count % self._size]
+
+    def commit(self) -> None:
+        """publishes the row last returned by slot()"""
+        self._count += 1
+
+    def append(self, values) -> None:
+        """copies values into the next row and publishes it"""
+        self._data[self._count % self._size] = values
+        self._count += 1
+
+    ### reader side
+
+    def views(self, n: int = None) -> tuple:
+        """Returns the latest n rows as (older, newer) views without copying.
+
+        The views alias the live buffer, so their contents may change if the
+        writer laps them. Use snapshot() for a consistent copy. They never
+        include the row being filled by the writer.
+        """
+        end = self._count
+        n = self._readable(end, n)
+        start = (end - n) % self._size
+        stop = end % self._size
+        if n == 0:
+            return self._data[:0], self._data[:0]
+        if start < stop:
+            return self._data[start:stop], self._data[:0]
+        return self._data[start:], self._data[:stop]
+
+    def snapshot(self, n: int = None) -> np.ndarray:
+        """Returns a consistent copy of the latest n rows, oldest first."""
+        end = self._count
+        n = self._readable(end, n)
+        return self._copy(end - n, end)
+
+    def read_since(self, start: int) -> tuple:
+        """Returns (rows, count) of all rows published after row number start.
+
+        Pass the returned count as start of the next call to stream the
+        buffer without gaps. Rows that were already overwritten are skipped,
+        which can be detected as len(rows) < count - start.
+        """
+        end = self._count
+        return self._copy(max(start, end - self._size + 1), end), end
+
+    def _readable(self, end: int, n: int = None) -> int:
+        """returns how many of the latest n rows before row end are readable"""
+        n = self._size - 1 if n is None else n
+        return max(min(n, end, self._size - 1), 0)
+
+    def _copy(self, first: int, end: int) -> np.ndarray:
+        """copies rows [first, end), dropping those overwritten meanwhile"""
+        indices = np.arange(first, end) % self._size
+        rows = self._data.take(indices, axis=0)
+        # rows below this row number may have been overwritten during take,
+        # the writer can be filling row count already
+        clobbered = self._count + 1 - self._size
+        if clobbered > first:
+            rows = rows[clobbered - first:]
+        return rows
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+USBTMC transfer tuning and instrumentation
+
+usbtmcTransport attaches to any usbtmc Instrument based driver, such as
+thorlabsLaserDriver or thorlabsPolarimeterDriver, and
+- sets the bulk transfer size, the read chunk size and the timeout of that
+  instrument
+- records, for every SCPI command, the bytes sent and received and the
+  latency from the start of the write to the end of the reply
+
+fakeUsbtmcBackend stands in for the USB endpoints of an instrument, speaking
+the USBTMC bulk protocol with a configurable latency model. Together with
+benchmark() it measures what larger transfers and fewer transactions gain,
+without any hardware.
+
+Thormund 19 Oct 2026 - created to tune and observe Thorlabs USB transfers
+"""
+__all__ = ["usbtmcTransport", "fakeUsbtmcBackend", "fake_instrument",
+           "benchmark"]
+
+import struct
+from array import array
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+
+##### usbtmc protocol constants #####
+
+USBTMC_HEADER_SIZE = 12
+MSGID_DEV_DEP_MSG_OUT = 1
+MSGID_DEV_DEP_MSG_IN = 2
+
+LOG_DTYPE = np.dtype([
+    ("t", np.float64),
+    ("command", "U64"),
+    ("bytes_out", np.int64),
+    ("bytes_in", np.int64),
+    ("latency", np.float64),
+])
+
+
+class usbtmcTransport:
+    """Per-instrument USBTMC transfer settings and per-command statistics."""
+
+    def __init__(self, instrument, max_transfer_size: int = None,
+                 read_chunk: int = None, timeout: float = None,
+                 log_size: int = 4096) -> None:
+        """
+        Creates a usbtmcTransport instance and attaches it to instrument.
+
+        Input
+        -----
+        instrument: usbtmc Instrument based driver
+        max_transfer_size (int): Optional. largest bulk-out transfer in bytes
+        read_chunk (int): Optional. bytes requested per bulk-in transfer,
+            defaults to max_transfer_size
+        timeout (float): Optional. transfer timeout in seconds
+        log_size (int): Optional. number of latest commands kept in the log
+        """
+        self.instrument = instrument
+        self.read_chunk = read_chunk
+        if max_transfer_size is not None:
+            instrument.max_transfer_size = max_transfer_size
+        if timeout is not None:
+            instrument.timeout = timeout
+        self._log = deque(maxlen=log_size)
+        self._pending = None
+        self._write_raw = instrument.write_raw
+        self._read_raw = instrument.read_raw
+        instrument.write_raw = self._traced_write
+        instrument.read_raw = self._traced_read
+
+    def __enter__(self):
+        """dunder method for with statement"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """dunder method for with statement"""
+        self.detach()
+
+    def detach(self) -> None:
+        """restores the instrument's own transfer methods"""
+        self._flush_pending()
+        del self.instrument.write_raw
+        del self.instrument.read_raw
+
+    ###### settings ######
+
+    @property
+    def max_transfer_size(self) -> int:
+        """returns largest bulk transfer in bytes"""
+        return self.instrument.max_transfer_size
+
+    @max_transfer_size.setter
+    def max_transfer_size(self, value: int) -> None:
+        """sets largest bulk transfer in bytes"""
+        self.instrument.max_transfer_size = int(value)
+
+    @property
+    def timeout(self) -> float:
+        """returns transfer timeout in seconds"""
+        return self.instrument.timeout
+
+    @timeout.setter
+    def timeout(self, value: float) -> None:
+        """sets transfer timeout in seconds"""
+        self.instrument.timeout = float(value)
+
+    ###### tracing ######
+
+    def _flush_pending(self) -> None:
+        """logs a write that was not followed by a read"""
+        if self._pending is not None:
+            start, command, bytes_out, end = self._pending
+            self._log.append((start, command, bytes_out, 0, end - start))
+            self._pending = None
+
+    def _traced_write(self, data) -> None:
+        self._flush_pending()
+        start = perf_counter()
+        self._write_raw(data)
+        command = bytes(data[:64]).decode(errors="replace").rstrip()
+        self._pending = (start, command, len(data), perf_counter())
+
+    def _traced_read(self, num: int = -1) -> bytes:
+        instrument = self.instrument
+        size = instrument.max_transfer_size
+        start = perf_counter()
+        try:
+            if self.read_chunk is not None:
+                instrument.max_transfer_size = self.read_chunk
+            data = self._read_raw(num)
+        finally:
+            instrument.max_transfer_size = size
+        end = perf_counter()
+        if self._pending is not None:
+            start, command, bytes_out, _ = self._pending
+            self._pending = None
+        else:
+            command, bytes_out = "", 0
+        self._log.append((start, command, bytes_out, len(data), end - start))
+        return data
+
+    ###### statistics ######
+
+    @property
+    def log(self) -> np.ndarray:
+        """returns the logged commands as a LOG_DTYPE structured array"""
+        return np.array(list(self._log), dtype=LOG_DTYPE)
+
+    def clear(self) -> None:
+        """forgets the logged commands"""
+        self._log.clear()
+
+    def stats(self) -> dict:
+        """
+        returns per command statistics from the log, as
+        {command: dict of count, bytes_out, bytes_in, mean_latency,
+        max_latency}, with bytes totalled over all calls
+        """
+        log = self.log
+        stats = {}
+        for command in np.unique(log["command"]):
+            entries = log[log["command"] == command]
+            stats[str(command)] = {
+                "count": len(entries),
+                "bytes_out": int(entries["bytes_out"].sum()),
+                "bytes_in": int(entries["bytes_in"].sum()),
+                "mean_latency": float(entries["latency"].mean()),
+                "max_latency": float(entries["latency"].max()),
+            }
+        return stats
+
+
+###### fake backend ######
+
+def _spin(seconds: float) -> None:
+    """waits precisely, sleep() is too coarse for USB timescales"""
+    end = perf_counter() + seconds
+    while perf_counter() < end:
+        pass
+
+
+class _endpoint:
+    def __init__(self, transfer) -> None:
+        self._transfer = transfer
+
+    def write(self, data, timeout=None) -> int:
+        return self._transfer(bytes(data))
+
+    def read(self, size, timeout=None) -> array:
+        return array("B", self._transfer(size))
+
+
+class fakeUsbtmcBackend:
+    """
+    USBTMC bulk endpoints of a simulated instrument.
+
+    Every bulk transfer costs transfer_latency plus its size over bandwidth,
+    and every command costs response_time before its reply is available.
+    """
+
+    def __init__(self, responder, transfer_latency: float = 125e-6,
+                 bandwidth: float = 30e6, response_time: float = 1e-3) -> None:
+        """
+        Creates a fakeUsbtmcBackend instance.
+
+        Input
+        -----
+        responder (callable): maps a received command str to the reply
+            bytes, or None for commands without reply
+        transfer_latency (float): Optional. seconds per bulk transfer
+        bandwidth (float): Optional. bytes per second
+        response_time (float): Optional. seconds of instrument processing
+            per received message
+        """
+        self.responder = responder
+        self.transfer_latency = transfer_latency
+        self.bandwidth = bandwidth
+        self.response_time = response_time
+        self.transfers = 0
+        self._message = b""
+        self._output = b""
+        self._request = None
+        self.bulk_out_ep = _endpoint(self._bulk_out)
+        self.bulk_in_ep = _endpoint(self._bulk_in)
+
+    def _cost(self, size: int) -> None:
+        self.transfers += 1
+        _spin(self.transfer_latency + size / self.bandwidth)
+
+    def _bulk_out(self, data: bytes) -> int:
+        self._cost(len(data))
+        msgid, btag = data[0], data[1]
+        size, attributes = struct.unpack_from("<LB", data, 4)
+        if msgid == MSGID_DEV_DEP_MSG_OUT:
+            self._message += data[USBTMC_HEADER_SIZE:USBTMC_HEADER_SIZE + size]
+            if attributes & 1:
+                _spin(self.response_time)
+                reply = self.responder(self._message.decode())
+                self._message = b""
+                if reply is not None:
+                    self._output += reply
+        elif msgid == MSGID_DEV_DEP_MSG_IN:
+            self._request = (btag, size)
+        return len(data)
+
+    def _bulk_in(self, size: int) -> bytes:
+        btag, requested = self._request
+        chunk = self._output[:requested]
+        self._output = self._output[len(chunk):]
+        eom = not self._output
+        packet = struct.pack("<BBBxLBxxx", MSGID_DEV_DEP_MSG_IN, btag,
+                             ~btag & 0xFF, len(chunk), eom) + chunk
+        packet += b"\0" * ((4 - len(packet) % 4) % 4)
+        self._cost(len(packet))
+        return packet
+
+
+def fake_instrument(cls, backend: fakeUsbtmcBackend):
+    """returns an instance of the usbtmc driver class cls on backend"""
+    fake = type(f"fake{cls.__name__}", (cls,), {
+        "close": lambda self: setattr(self, "connected", False),
+        "open": lambda self: None,
+    })
+    instrument = fake(device=backend)
+    instrument.bulk_out_ep = backend.bulk_out_ep
+    instrument.bulk_in_ep = backend.bulk_in_ep
+    instrument.connected = True
+    return instrument
+
+
+###### benchmark ######
+
+def benchmark(block_size: int = 1 << 20, repeat: int = 20) -> dict:
+    """
+    Measures on a fake backend
+    - the time to read a block_size IEEE block with different read chunk
+      sizes, i.e. bulk-in transfers per reply
+    - the time per ITC monitoring cycle with five separate queries against
+      one chained measure_all transaction
+
+    Returns dict of seconds per operation, keyed by case
+    """
+    from ..thorlabs.thorlabs_laser_driver import thorlabsLaserDriver
+
+    digits = str(block_size)
+    block = f"#{len(digits)}{digits}".encode() + bytes(block_size) + b"\n"
+    readings = {"MEAS:CURR?": "1.000E-2", "MEAS:VOLT?": "1.5",
+                "MEAS:TEMP?": "25.0", "OUTP?": "1", "OUTP2?": "1"}
+
+    def responder(command: str):
+        if command == "DATA?":
+            return block
+        return (";".join(readings.get(c, "0") for c in command.split(";"))
+                + "\n").encode()
+
+    backend = fakeUsbtmcBackend(responder)
+    itc = fake_instrument(thorlabsLaserDriver, backend)
+    transport = usbtmcTransport(itc)
+    results = {}
+
+    def timed(name, operation):
+        start = perf_counter()
+        for _ in range(repeat):
+            operation()
+        results[name] = (perf_counter() - start) / repeat
+
+    for chunk in (4096, 65536, 1 << 20):
+        transport.read_chunk = chunk
+        timed(f"block read, {chunk} byte chunks",
+              lambda: itc.ask_raw(b"DATA?"))
+    transport.read_chunk = None
+    timed("monitor, separate queries", lambda: (
+        itc.meas_curr, itc.meas_volt, itc.meas_temp, itc.outp, itc.outp2))
+    timed("monitor, measure_all", itc.measure_all)
+    transport.detach()
+    return results
+
+
+if __name__ == "__main__":
+    for case, seconds in benchmark().items():
+        print(f"{case}: {seconds * 1e3:.3f} ms")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Event-driven waits for SCPI instruments
+
+Instead of sleeping a fixed, pessimistic time after a command, poll the
+instrument until it reports that it is ready:
+- wait_opc: *OPC?, which the instrument answers once all pending operations
+  have completed
+- wait_stb: bits of the status byte, read with the USBTMC READ_STATUS_BYTE
+  control request where available, otherwise with *STB?
+- wait_register: bits of any condition register, e.g. STAT:OPER:COND?
+- wait_until: any condition, e.g. a measured value settling
+
+Polling starts at min_interval and grows by growth per poll up to
+max_interval, so a wait returns within a few milliseconds of the instrument
+being ready, without flooding it during long waits. Every wait has an overall
+deadline and raises TimeoutError when it passes.
+
+Thormund 19 Oct 2026 - created to replace fixed sleeps in device bring-up
+"""
+__all__ = ["wait_until", "wait_opc", "wait_stb", "wait_register"]
+
+from time import perf_counter, sleep
+
+from serial import SerialTimeoutException
+from usb.core import USBTimeoutError
+
+##### polling constants #####
+
+# transfer timeouts of the transports, other errors are passed on
+TRANSFER_TIMEOUTS = (USBTimeoutError, SerialTimeoutException, TimeoutError)
+
+MIN_INTERVAL = 1e-3
+MAX_INTERVAL = 0.1
+GROWTH = 1.5
+
+def wait_until(condition, timeout: float = 10.,
+               min_interval: float = MIN_INTERVAL,
+               max_interval: float = MAX_INTERVAL,
+               growth: float = GROWTH, description: str = None) -> float:
+    """
+    Polls condition until it returns a true value.
+
+    Input
+    -----
+    condition (callable): called without arguments, checked for truth
+    timeout (float): Optional. overall deadline in seconds
+    min_interval (float): Optional. first poll interval in seconds
+    max_interval (float): Optional. longest poll interval in seconds
+    growth (float): Optional. factor the interval grows by per poll
+    description (str): Optional. what is waited for, for the error message
+
+    Returns the time waited in seconds.
+    Raises TimeoutError if condition is still false after timeout.
+    """
+    start = perf_counter()
+    deadline = start + timeout
+    interval = min_interval
+    while not condition():
+        now = perf_counter()
+        if now >= deadline:
+            raise TimeoutError(
+                f"{description or condition} not reached within {timeout} s")
+        sleep(min(interval, deadline - now))
+        interval = min(interval * growth, max_interval)
+    return perf_counter() - start
+
+def _as_int(reply) -> int:
+    """parses a register reply, as str or bytes, e.g. '+32' or b'32'"""
+    if isinstance(reply, bytes):
+        reply = reply.decode()
+    return int(float(reply.strip()))
+
+def wait_opc(device, timeout: float = 10.) -> float:
+    """
+    Waits for all pending operations of device to complete with a single
+    *OPC? query, which the instrument only answers once they have. The
+    transfer timeout of device is raised to timeout for the query.
+
+    Returns the time waited in seconds.
+    Raises TimeoutError if there is no reply within timeout, ValueError if
+    the reply is not 1.
+    """
+    start = perf_counter()
+    transfer_timeout = device.timeout
+    device.timeout = max(transfer_timeout, timeout)
+    try:
+        reply = device.ask("*OPC?")
+    except TRANSFER_TIMEOUTS as exc:
+        # usbtmc raises usb.core.USBTimeoutError
+        raise TimeoutError(f"*OPC? not answered within {timeout} s") from exc
+    finally:
+        device.timeout = transfer_timeout
+    if not reply:
+        # serial returns nothing on a timeout
+        raise TimeoutError(f"*OPC? not answered within {timeout} s")
+    if _as_int(reply) != 1:
+        raise ValueError(f"Unexpected reply {reply!r} to *OPC?")
+    return perf_counter() - start
+
+def wait_stb(device, mask: int, timeout: float = 10., **kwargs) -> int:
+    """
+    Waits until any of the bits in mask are set in the status byte, e.g.
+    mask=0x20 for the event status bit or 0x10 for message available.
+    Further keyword arguments are passed on to wait_until.
+
+    Returns the status byte.
+    Raises TimeoutError if none of the bits are set after timeout.
+    """
+    read_stb = getattr(device, 'read_stb', None)
+    if read_stb is None:
+        read_stb = lambda: _as_int(device.ask("*STB?"))
+    state = {}
+
+    def ready():
+        state['stb'] = read_stb()
+        return state['stb'] & mask
+    kwargs.setdefault('description', f"status byte & {mask:#04x}")
+    wait_until(ready, timeout, **kwargs)
+    return state['stb']
+
+def wait_register(device, query: str, mask: int, value: int = None,
+                  timeout: float = 10., **kwargs) -> int:
+    """
+    Waits until the bits in mask of the register read by query are set or,
+    if value is given, equal value. Further keyword arguments are passed on
+    to wait_until.
+
+    Input
+    -----
+    device: driver with an ask method
+    query (str): register query, e.g. 'STAT:OPER:COND?'
+    mask (int): bits of interest
+    value (int): Optional. required state of the masked bits, by default
+        any of them being set
+    timeout (float): Optional. overall deadline in seconds
+
+    Returns the register value.
+    Raises TimeoutError if the bits do not reach the state after timeout.
+    """
+    state = {}
+
+    def ready():
+        state['register'] = _as_int(device.ask(query))
+        bits = state['register'] & mask
+        return bits == value if value is not None else bits
+    kwargs.setdefault('description', f"{query} & {mask:#x}")
+    wait_until(ready, timeout, **kwargs)
+    return state['register']
@@ -0,0 +1,9 @@
+"""
+Feedback control across devices
+
+
+"""
+
+__all__ = [
+    "polarisation_lock"
+    ]
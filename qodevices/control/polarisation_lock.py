@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Closed-loop polarisation compensation
+
+Holds the polarisation state seen by a thorlabsPolarimeterDriver at a target
+on the Poincare sphere, by driving piezo fibre squeezers from the outputs of
+a qoStrainGaugeDriver. Each iteration
+1. measures the unit Stokes vector from a batch of PAX data sets
+2. estimates the local Jacobian d(S1, S2, S3)/d(output) by dithering one
+   output at a time, unless a recent estimate is reused
+3. solves for the output step that moves the state towards the target
+4. writes all outputs in one pipelined write
+
+and records how long each stage took, so that the loop rate can be traced to
+its slowest part.
+
+simulatedPolarisationPlant stands in for the fibre, the squeezers and both
+instruments, with drift, noise and instrument latencies, so that the loop can
+be tested and benchmarked without hardware.
+
+Thormund, 2026.10.19 - created to replace hand tuning of fibre squeezers
+"""
+__all__ = ["polarisationController", "simulatedPolarisationPlant",
+           "benchmark"]
+
+from time import perf_counter, sleep, time
+
+import numpy as np
+
+from ..thorlabs.thorlabs_PAX_driver import DATA_FIELDS, stokes
+
+SPHERE = slice(1, 4)
+STAGES = ("measure", "dither", "solve", "write")
+
+##### controller constants #####
+
+# singular values below this fraction of the largest are ignored in the solve
+RCOND = 0.05
+
+def _unit_stokes(data: np.ndarray) -> np.ndarray:
+    """returns the normalised mean S1, S2, S3 of a batch of PAX data sets"""
+    mean = stokes(data)[:, SPHERE].mean(axis=0)
+    return mean / np.linalg.norm(mean)
+
+def _angle(a: np.ndarray, b: np.ndarray) -> float:
+    """returns the angle between unit vectors a and b in rad"""
+    return float(np.arccos(np.clip(a @ b, -1, 1)))
+
+class polarisationController:
+    """
+    Jacobian-based feedback from PAX Stokes vectors to strain gauge outputs
+    """
+
+    def __init__(self, pax, sg, target, channels=(0, 1), samples: int = 4,
+                 dither: float = 0.05, gain: float = 0.7,
+                 max_step: float = 0.5, settle: float = 0.035,
+                 refresh: int = 1, limits: tuple = None) -> None:
+        """
+        Creates a polarisationController instance.
+
+        Input
+        -----
+        pax: thorlabsPolarimeterDriver, or anything with acquire(n)
+            returning PAX data sets
+        sg: qoStrainGaugeDriver, or anything with an out channel array
+        target (array): S1, S2, S3 to hold, normalised internally
+        channels (tuple): Optional. strain gauge outputs driving squeezers
+        samples (int): Optional. PAX data sets averaged per measurement
+        dither (float): Optional. output step in volt for the Jacobian
+        gain (float): Optional. fraction of the solved step applied
+        max_step (float): Optional. largest output change per iteration in
+            volt
+        settle (float): Optional. wait in seconds after each write, at least
+            one waveplate revolution so the PAX data is fresh
+        refresh (int): Optional. iterations between Jacobian estimates
+        limits (tuple): Optional. (low, high) output range in volt
+        """
+        target = np.asarray(target, dtype=float)
+        if target.shape != (3,) or not np.linalg.norm(target):
+            raise ValueError(f"Illegal target {target}, expected S1, S2, S3")
+        if limits is not None and not limits[0] < limits[1]:
+            raise ValueError(f"Illegal argument with {limits = }")
+        self.pax = pax
+        self.sg = sg
+        self.target = target / np.linalg.norm(target)
+        self.channels = list(channels)
+        self.samples = samples
+        self.dither = dither
+        self.gain = gain
+        self.max_step = max_step
+        self.settle = settle
+        self.refresh = refresh
+        self.limits = limits
+        self.jacobian = None
+        self.iterations = 0
+        self.outputs = np.asarray(sg.out[self.channels], dtype=float)
+
+    ###### plant access ######
+
+    def _measure(self) -> np.ndarray:
+        return _unit_stokes(self.pax.acquire(self.samples))
+
+    def _write(self, outputs: np.ndarray) -> None:
+        # one pipelined write of all channels
+        self.sg.out[self.channels] = outputs
+        if self.settle:
+            sleep(self.settle)
+
+    def _clip(self, outputs: np.ndarray) -> np.ndarray:
+        if self.limits is None:
+            return outputs
+        return np.clip(outputs, *self.limits)
+
+    ###### loop ######
+
+    def estimate_jacobian(self, state: np.ndarray = None) -> np.ndarray:
+        """
+        Estimates d(S1, S2, S3)/d(output) by forward differences, dithering
+        one output at a time, and leaves the outputs where they were.
+
+        Returns (3, channels) array in 1/volt
+        Raises ValueError if the limits leave an output no room to dither.
+        """
+        if state is None:
+            state = self._measure()
+        jacobian = np.empty((3, len(self.channels)))
+        for k in range(len(self.channels)):
+            dithered = self.outputs.copy()
+            dithered[k] += self.dither
+            dithered = self._clip(dithered)
+            step = dithered[k] - self.outputs[k]
+            if not step:
+                # at a limit, dither the other way
+                dithered[k] = self._clip(self.outputs[k:k + 1]
+                                         - self.dither)[0]
+                step = dithered[k] - self.outputs[k]
+            if not step:
+                raise ValueError(f"Output {self.channels[k]} cannot be "
+                                 f"dithered within {self.limits = }")
+            self._write(dithered)
+            jacobian[:, k] = (self._measure() - state) / step
+        self._write(self.outputs)
+        self.jacobian = jacobian
+        return jacobian
+
+    def step(self) -> dict:
+        """
+        Runs one iteration of the loop.
+
+        Returns a record dict of t, error (rad, angle to the target before
+        the step), outputs (volt, after the step), step (volt) and the
+        latency (s) of each of the stages measure, dither, solve, write
+        together with their total
+        """
+        start = perf_counter()
+        t = time()
+        state = self._measure()
+        measured = perf_counter()
+
+        if self.jacobian is None or self.iterations % self.refresh == 0:
+            self.estimate_jacobian(state)
+        dithered = perf_counter()
+
+        # least squares step on the tangent plane, small singular values
+        # (squeezer axes parallel to the state) are left out
+        error = self.target - state
+        delta, *_ = np.linalg.lstsq(self.jacobian, error, rcond=RCOND)
+        delta *= self.gain
+        largest = np.max(np.abs(delta))
+        if largest > self.max_step:
+            delta *= self.max_step / largest
+        previous = self.outputs
+        outputs = self._clip(previous + delta)
+        solved = perf_counter()
+
+        self._write(outputs)
+        self.outputs = outputs
+        written = perf_counter()
+        self.iterations += 1
+
+        latency = {
+            "measure": measured - start,
+            "dither": dithered - measured,
+            "solve": solved - dithered,
+            "write": written - solved,
+            "total": written - start,
+        }
+        return {
+            "t": t,
+            "error": _angle(state, self.target),
+            "outputs": outputs.copy(),
+            "step": outputs - previous,
+            "latency": latency,
+        }
+
+    def run(self, iterations: int, tolerance: float = None) -> dict:
+        """
+        Runs the loop for a number of iterations, or until the angle to the
+        target is below tolerance (rad).
+
+        Returns dict of numpy arrays t, error (rad), outputs (volt, one
+        column per channel) and one latency column per stage plus total
+        """
+        table = {
+            "t": np.full(iterations, np.nan),
+            "error": np.full(iterations, np.nan),
+            "outputs": np.full((iterations, len(self.channels)), np.nan),
+        }
+        table.update({stage: np.full(iterations, np.nan)
+                      for stage in STAGES + ("total",)})
+        for i in range(iterations):
+            record = self.step()
+            table["t"][i] = record["t"]
+            table["error"][i] = record["error"]
+            table["outputs"][i] = record["outputs"]
+            for stage, value in record["latency"].items():
+                table[stage][i] = value
+            if tolerance is not None and record["error"] < tolerance:
+                table = {key: value[:i + 1] for key, value in table.items()}
+                break
+        return table
+
+
+###### simulated plant ######
+
+def _rotation(axis: np.ndarray, angle: float) -> np.ndarray:
+    """returns the matrix rotating by angle about the unit vector axis"""
+    x, y, z = axis
+    k = np.array([[0, -z, y], [z, 0, -x], [-y, x, 0]])
+    return np.eye(3) + np.sin(angle) * k + (1 - np.cos(angle)) * k @ k
+
+class _simulatedOutputs:
+    """out channel array of the simulated strain gauge"""
+
+    def __init__(self, plant) -> None:
+        self._plant = plant
+
+    def __len__(self) -> int:
+        return len(self._plant.voltages)
+
+    def __getitem__(self, key):
+        values = self._plant.voltages[key]
+        return values.copy() if isinstance(values, np.ndarray) else values
+
+    def __setitem__(self, key, value) -> None:
+        sleep(self._plant.write_time)
+        self._plant.voltages[key] = value
+
+class _simulatedStrainGauge:
+    def __init__(self, plant) -> None:
+        self.out = _simulatedOutputs(plant)
+
+class _simulatedPolarimeter:
+    def __init__(self, plant) -> None:
+        self._plant = plant
+        self._rev = 0
+
+    def acquire(self, n: int) -> np.ndarray:
+        plant = self._plant
+        data = np.zeros((n, len(DATA_FIELDS)))
+        for i in range(n):
+            sleep(plant.sample_time)
+            s = plant.state() + plant.rng.normal(0, plant.noise, 3)
+            self._rev += 1
+            data[i, DATA_FIELDS.index("rev")] = self._rev
+            data[i, DATA_FIELDS.index("timestamp")] = perf_counter()
+            # azimuth and ellipticity, as the PAX reports them
+            data[i, DATA_FIELDS.index("theta")] = np.arctan2(s[1], s[0]) / 2
+            data[i, DATA_FIELDS.index("eta")] = np.arcsin(
+                np.clip(s[2] / np.linalg.norm(s), -1, 1)) / 2
+            data[i, DATA_FIELDS.index("DOP")] = 1.
+            data[i, DATA_FIELDS.index("Ptotal")] = 1e-3
+        return data
+
+class simulatedPolarisationPlant:
+    """
+    A fibre with piezo squeezers, between a strain gauge driver and a PAX.
+
+    Each squeezer retards by radians_per_volt times its voltage about a
+    fixed axis in the S1-S2 plane. The fibre before them rotates the input
+    state about a slowly random-walking axis. sg and pax are stand-ins for
+    the two drivers with the write and sample times of the hardware.
+    """
+
+    def __init__(self, channels: int = 3, radians_per_volt: float = 0.5,
+                 drift: float = 0.02, noise: float = 2e-3,
+                 write_time: float = 2e-3, sample_time: float = 1 / 60,
+                 seed: int = None) -> None:
+        """
+        Creates a simulatedPolarisationPlant instance.
+
+        Input
+        -----
+        channels (int): Optional. number of strain gauge outputs
+        radians_per_volt (float): Optional. squeezer retardance per volt
+        drift (float): Optional. fibre drift in rad per sqrt(s)
+        noise (float): Optional. Stokes noise per PAX data set
+        write_time (float): Optional. seconds per output write
+        sample_time (float): Optional. seconds per PAX data set
+        seed (int): Optional. random seed
+        """
+        self.rng = np.random.default_rng(seed)
+        self.radians_per_volt = radians_per_volt
+        self.drift = drift
+        self.noise = noise
+        self.write_time = write_time
+        self.sample_time = sample_time
+        self.voltages = np.zeros(channels)
+        # squeezers at 0 and 45 degrees, repeating
+        angles = np.pi / 2 * np.arange(channels)
+        self.axes = np.stack(
+            (np.cos(angles), np.sin(angles), np.zeros(channels)), axis=1)
+        self.source = np.array([0., 0., 1.])
+        self._fibre = np.eye(3)
+        self._last = perf_counter()
+        self.sg = _simulatedStrainGauge(self)
+        self.pax = _simulatedPolarimeter(self)
+
+    def state(self) -> np.ndarray:
+        """returns the unit Stokes vector at the PAX now"""
+        now = perf_counter()
+        elapsed, self._last = now - self._last, now
+        if self.drift:
+            kick = self.rng.normal(0, self.drift * np.sqrt(elapsed), 3)
+            angle = np.linalg.norm(kick)
+            if angle:
+                self._fibre = _rotation(kick / angle, angle) @ self._fibre
+        s = self._fibre @ self.source
+        for axis, voltage in zip(self.axes, self.voltages):
+            s = _rotation(axis, self.radians_per_volt * voltage) @ s
+        return s
+
+
+###### benchmark ######
+
+def benchmark(iterations: int = 50, refresh=(1, 5)) -> dict:
+    """
+    Runs the loop on a simulated plant towards a target 90 degrees away on
+    the sphere, for each Jacobian refresh interval.
+
+    Returns dict of refresh -> dict of iterations to reach 0.05 rad,
+    final_error (rad) and the mean latency (s) of every stage
+    """
+    results = {}
+    for every in refresh:
+        plant = simulatedPolarisationPlant(seed=1)
+        controller = polarisationController(
+            plant.pax, plant.sg, target=(1, 0, 0), channels=(0, 1, 2),
+            settle=0., refresh=every)
+        table = controller.run(iterations)
+        locked = np.flatnonzero(table["error"] < 0.05)
+        results[every] = {
+            "iterations_to_lock": int(locked[0]) if len(locked) else None,
+            "final_error": float(table["error"][-1]),
+        }
+        results[every].update({stage: float(np.mean(table[stage]))
+                               for stage in STAGES + ("total",)})
+    return results
+
+
+if __name__ == "__main__":
+    for every, result in benchmark().items():
+        print(f"jacobian every {every} iterations: {result}")
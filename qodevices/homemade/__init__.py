@@ -8,6 +8,8 @@ __all__ = [
     'qo_digital_power_meter',
     'qo_fibre_switch_driver',
     'qo_laser_driver',
+    'qo_loop_analyzer',
+    'qo_strain_gauge_acquisition',
     'qo_strain_gauge_driver',
     'qo_temperature_rh_sensor'
     ]
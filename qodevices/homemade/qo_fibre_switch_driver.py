@@ -8,15 +8,25 @@ To Do:
 
 Seth, 2022.03.29 - overhauled fibre driver control script
 Thormund, 2022.11.18   - switched pyserial dependencies, added type hinting
+Thormund, 2026.10.19   - switch_n properties now wrap a channel-indexed array
 """
 __all__ = ["qoFibreSwitchDriver"]
 
+import numpy as np
+
 from ..baseclass.baseserial import serial_comm
+from ..baseclass.channels import channelArray
 
 ##### limit constants #####
 
 MAX_PULSE_DURATION = 255
 
+SWITCH_CHANNELS = (1, 2, 3)
+
+def _check_position(values: np.ndarray) -> None:
+    if not np.all((values == 0) | (values == 1)):
+        raise ValueError(f"Illegal switch positions {values = }")
+
 class qoFibreSwitchDriver(serial_comm):
     """
     Fibre switch driver class
@@ -36,6 +46,15 @@ class qoFibreSwitchDriver(serial_comm):
         # Do not catch all errors in init method haphazardly
         super().__init__(device_path, timeout=2)
 
+    ###### channel-indexed arrays ######
+
+    switch = channelArray('SWITCH? {}', 'SWITCH {} {}', SWITCH_CHANNELS, int,
+                          validate=_check_position, doc="""
+        positions of switches 1 to 3 (0 or 1) at indices 0 to 2,
+        or error condition -1 for both closed, -2 for both open.
+        e.g. dev.switch[:] = (1, 0, 1)
+        """)
+
     ###### properties ######
 
     @property
@@ -62,7 +81,7 @@ class qoFibreSwitchDriver(serial_comm):
         Returns position value of switch 1 (0 or 1),
         or error condition -1 for both closed, -2 for both open.
         """
-        return int(self.ask('SWITCH? 1'))
+        return self.switch[0]
 
     @switch_1.setter
     def switch_1(self, value: int) -> None:
@@ -70,7 +89,7 @@ class qoFibreSwitchDriver(serial_comm):
         sets channel 1 to value (0 or 1).
         """
         if value == 0 or value == 1:
-            self.write(f'SWITCH 1 {value}')
+            self.switch[0] = value
         else:
             print('Illegal value')
 
@@ -80,7 +99,7 @@ class qoFibreSwitchDriver(serial_comm):
         Returns position value of switch 2 (0 or 1),
         or error condition -1 for both closed, -2 for both open.
         """
-        return int(self.ask('SWITCH? 2'))
+        return self.switch[1]
 
     @switch_2.setter
     def switch_2(self, value: int) -> None:
@@ -88,7 +107,7 @@ class qoFibreSwitchDriver(serial_comm):
         sets channel 2 to value (0 or 1).
         """
         if value == 0 or value == 1:
-            self.write(f'SWITCH 2 {value}')
+            self.switch[1] = value
         else:
             print('Illegal value')
 
@@ -98,7 +117,7 @@ class qoFibreSwitchDriver(serial_comm):
         Returns position value of switch 3 (0 or 1),
         or error condition -1 for both closed, -2 for both open.
         """
-        return int(self.ask('SWITCH? 3'))
+        return self.switch[2]
 
     @switch_3.setter
     def switch_3(self, value: int) -> None:
@@ -106,7 +125,7 @@ class qoFibreSwitchDriver(serial_comm):
         sets channel 3 to value (0 or 1).
         """
         if value == 0 or value == 1:
-            self.write(f'SWITCH 3 {value}')
+            self.switch[2] = value
         else:
             print('Illegal value')
 
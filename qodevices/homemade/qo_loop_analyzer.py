@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Strain gauge control loop analyzer
+
+Consumes err_0/err_1 streams, for example from strainGaugeAcquisition, and
+keeps running statistics in constant memory:
+- mean, standard deviation, rms and peak-to-peak of each error signal
+- Welch power spectral density, Hann window with 50% overlap, averaged with
+  exponential forgetting so that new features show up within a few segments
+- oscillation peaks, flagged when a spectral line rises above the noise floor
+
+The raw stream is not stored. Only the last partial segment is kept between
+updates. If reading a followed acquisition fails, following stops, the
+exception is kept in the exception attribute and stop() raises it.
+
+Thormund, 2026.10.19 - created to judge strain gauge loop tuning online
+"""
+__all__ = ["loopAnalyzer"]
+
+import logging
+import threading
+from collections import deque
+from time import sleep, time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..baseclass.moments import merge_moments
+from .qo_strain_gauge_acquisition import COLUMNS
+
+##### analyzer constants #####
+
+ERROR_COLUMNS = (COLUMNS.index('err0'), COLUMNS.index('err1'))
+
+MAX_PEAK_RECORDS = 1000
+
+class loopAnalyzer:
+    """
+    Online rms, peak-to-peak and Welch PSD of control loop errors
+    """
+
+    def __init__(self, fs: float, channels: int = 2, nperseg: int = 256,
+                 memory: float = 32, threshold: float = 20.,
+                 on_peak=None) -> None:
+        """
+        Creates a loopAnalyzer instance.
+
+        Input
+        -----
+        fs (float): sample rate of the error streams in Hz
+        channels (int): Optional. number of error streams
+        nperseg (int): Optional. Welch segment length in samples
+        memory (float): Optional. number of segments the PSD averages over
+        threshold (float): Optional. a spectral line is flagged as an
+            oscillation when it exceeds threshold times the median PSD
+        on_peak (callable): Optional. called with every new peak record
+        """
+        if fs <= 0 or nperseg < 4:
+            raise ValueError(f"Illegal argument with {fs = }, {nperseg = }")
+        self.fs = fs
+        self.nperseg = nperseg
+        self.step = nperseg // 2
+        self.memory = memory
+        self.threshold = threshold
+        self.on_peak = on_peak
+
+        self._window = np.hanning(nperseg)
+        # one-sided density scaling, DC and nyquist bins are not doubled
+        self._scale = np.full(nperseg // 2 + 1, 2 / (fs * np.sum(self._window**2)))
+        self._scale[0] /= 2
+        if nperseg % 2 == 0:
+            self._scale[-1] /= 2
+        self.freqs = np.fft.rfftfreq(nperseg, 1 / fs)
+
+        # samples lost while following an acquisition
+        self.dropped = 0
+        # exception that ended following an acquisition, if any
+        self.exception = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = threading.Event()
+        self.reset(channels)
+
+    def reset(self, channels: int = None) -> None:
+        """forgets all statistics"""
+        channels = channels or len(self._mean)
+        with self._lock:
+            self._count = 0
+            self._mean = np.zeros(channels)
+            self._m2 = np.zeros(channels)
+            self._min = np.full(channels, np.inf)
+            self._max = np.full(channels, -np.inf)
+            self._tail = np.zeros((0, channels))
+            self._psd = np.zeros((channels, len(self.freqs)))
+            self._segments = 0
+            self._active = [set() for _ in range(channels)]
+            self.peaks = deque(maxlen=MAX_PEAK_RECORDS)
+
+    ###### updates ######
+
+    def update(self, errors) -> None:
+        """
+        Adds a chunk of samples.
+
+        Input
+        -----
+        errors (array): shape (n, channels), one column per error stream
+        """
+        errors = np.asarray(errors, dtype=float)
+        if errors.ndim == 1:
+            errors = errors[:, None]
+        if len(errors) == 0:
+            return
+        with self._lock:
+            self._update_moments(errors)
+            self._update_psd(errors)
+
+    def _update_moments(self, errors: np.ndarray) -> None:
+        self._count = merge_moments(self._count, self._mean, self._m2, errors)
+        np.minimum(self._min, errors.min(axis=0), out=self._min)
+        np.maximum(self._max, errors.max(axis=0), out=self._max)
+
+    def _update_psd(self, errors: np.ndarray) -> None:
+        data = np.concatenate((self._tail, errors))
+        if len(data) < self.nperseg:
+            self._tail = data
+            return
+        segments = sliding_window_view(data, self.nperseg, axis=0)[::self.step]
+        used = (len(segments) - 1) * self.step + self.nperseg
+        self._tail = data[used - self.nperseg + self.step:].copy()
+
+        # segments is (k, channels, nperseg)
+        detrended = segments - segments.mean(axis=-1, keepdims=True)
+        spectra = np.abs(np.fft.rfft(detrended * self._window, axis=-1))**2
+        spectra *= self._scale
+        # exponentially forgetting average over segments, warming up as a
+        # plain mean until memory segments have been seen
+        for spectrum in spectra:
+            self._segments += 1
+            weight = 1 / min(self._segments, self.memory)
+            self._psd += weight * (spectrum - self._psd)
+        self._flag_peaks()
+
+    def _flag_peaks(self) -> None:
+        psd = self._psd
+        floor = np.median(psd[:, 1:], axis=1, keepdims=True)
+        inner = psd[:, 1:-1]
+        is_peak = ((inner > psd[:, :-2]) & (inner >= psd[:, 2:])
+                   & (inner > self.threshold * floor))
+        now = time()
+        for channel, bins in enumerate(is_peak):
+            found = set((np.flatnonzero(bins) + 1).tolist())
+            active = self._active[channel]
+            # a line drifting by one bin is not a new oscillation
+            new = {b for b in found if not active & {b - 1, b, b + 1}}
+            self._active[channel] = found
+            for b in sorted(new):
+                peak = {
+                    't': now,
+                    'channel': channel,
+                    'frequency': float(self.freqs[b]),
+                    'psd': float(psd[channel, b]),
+                    'floor': float(floor[channel, 0]),
+                }
+                self.peaks.append(peak)
+                logging.info(f"oscillation flagged: {peak}")
+                if self.on_peak is not None:
+                    self.on_peak(peak)
+
+    ###### results ######
+
+    @property
+    def count(self) -> int:
+        """returns number of samples seen"""
+        return self._count
+
+    def results(self) -> dict:
+        """
+        returns a consistent copy of the current estimates:
+        count, mean, std, rms, p2p (one entry per channel),
+        freqs (Hz), psd (units^2/Hz, one row per channel),
+        active (frequencies currently above threshold, per channel)
+        """
+        with self._lock:
+            count = self._count
+            var = self._m2 / count if count else np.full_like(self._m2, np.nan)
+            return {
+                'count': count,
+                'mean': self._mean.copy(),
+                'std': np.sqrt(var),
+                'rms': np.sqrt(var + self._mean**2),
+                'p2p': self._max - self._min,
+                'freqs': self.freqs,
+                'psd': self._psd.copy(),
+                'active': [self.freqs[sorted(a)] for a in self._active],
+            }
+
+    ###### following an acquisition ######
+
+    def follow(self, acquisition, interval: float = 0.1) -> None:
+        """
+        Starts a background thread feeding the error columns of a running
+        strainGaugeAcquisition into the analyzer every interval seconds.
+        Samples overwritten in the ring buffer before they were read are
+        skipped and counted in self.dropped.
+        """
+        if self._running.is_set():
+            return
+        self.dropped = 0
+        self.exception = None
+        self._running.set()
+        self._thread = threading.Thread(
+            target=self._follow, args=(acquisition.buffer, interval),
+            name='loopAnalyzer', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        stops following an acquisition. Raises the exception that ended the
+        background thread, if any.
+        """
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.exception is not None:
+            exception, self.exception = self.exception, None
+            raise exception
+
+    def _follow(self, buffer, interval: float) -> None:
+        try:
+            self._read(buffer, interval)
+        except Exception as exc:
+            self.exception = exc
+            logging.exception("loop analyzer stopped following")
+        finally:
+            self._running.clear()
+
+    def _read(self, buffer, interval: float) -> None:
+        position = buffer.count
+        while self._running.is_set():
+            sleep(interval)
+            rows, count = buffer.read_since(position)
+            self.dropped += count - position - len(rows)
+            position = count
+            self.update(rows[:, ERROR_COLUMNS])
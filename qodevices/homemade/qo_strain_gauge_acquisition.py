@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Strain gauge background acquisition
+https://qoptics.quantumlah.org/wiki/index.php/Strain_gauge_adapter
+
+Reading in_0, in_1, err_0 and err_1 through their properties costs one round
+trip each. This module instead keeps ALLIN? and ERR? queries pipelined on the
+serial line from a background thread: the next request is already written
+before the reply to the current one is parsed, so the device is never idle
+waiting for the host. Samples land in a fixed-size ring buffer of
+(t, in0, in1, err0, err1) rows.
+
+While an acquisition is running, no other thread may talk to the device. If
+the serial line fails, the acquisition stops by itself, keeps the exception
+in its exception attribute and stop() raises it.
+
+Thormund, 2026.10.19 - created for loop noise measurements above a few Hz
+"""
+__all__ = ["strainGaugeAcquisition"]
+
+import logging
+import threading
+from time import perf_counter, time
+
+import numpy as np
+
+from ..baseclass.ringbuffer import ringBuffer
+from .qo_strain_gauge_driver import qoStrainGaugeDriver
+
+##### acquisition constants #####
+
+COLUMNS = ('t', 'in0', 'in1', 'err0', 'err1')
+
+# one sample worth of queries, encoded once
+SAMPLE_QUERY = b'ALLIN?\nERR? 0\nERR? 1\n'
+
+class strainGaugeAcquisition:
+    """
+    Background ALLIN?/ERR? acquisition into a ring buffer
+    """
+
+    def __init__(self, device: qoStrainGaugeDriver, size: int = 65536) -> None:
+        """
+        Creates a strainGaugeAcquisition instance.
+
+        Input
+        -----
+        device (qoStrainGaugeDriver): opened strain gauge driver
+        size (int): Optional. number of samples kept in the ring buffer
+        """
+        self.device = device
+        self.buffer = ringBuffer(size, len(COLUMNS))
+        self.errors = 0
+        # exception that ended the background thread, if any
+        self.exception = None
+        self._thread = None
+        self._running = threading.Event()
+
+    def __enter__(self):
+        """dunder method for with statement"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """dunder method for with statement"""
+        self.stop()
+
+    ###### control ######
+
+    @property
+    def running(self) -> bool:
+        """returns True while the background thread is acquiring"""
+        return self._running.is_set()
+
+    def start(self) -> None:
+        """starts acquiring in a background thread"""
+        if self.running:
+            return
+        self.device.reset_input_buffer()
+        self.exception = None
+        self._running.set()
+        self._thread = threading.Thread(
+            target=self._run, name='strainGaugeAcquisition', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        stops acquiring and waits for the outstanding replies. Raises the
+        exception that ended the background thread, if any.
+        """
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.exception is not None:
+            exception, self.exception = self.exception, None
+            raise exception
+
+    ###### data access ######
+
+    def snapshot(self, n: int = None) -> np.ndarray:
+        """
+        returns a copy of the latest n samples as rows of
+        (t, in0, in1, err0, err1), oldest first
+        """
+        return self.buffer.snapshot(n)
+
+    def views(self, n: int = None) -> tuple:
+        """
+        returns the latest n samples as two zero-copy views into the ring
+        buffer, (older, newer). See ringBuffer.views for the caveats.
+        """
+        return self.buffer.views(n)
+
+    @property
+    def rate(self) -> float:
+        """
+        returns the measured sample rate in Hz over the samples in the buffer
+        """
+        older, newer = self.buffer.views()
+        n = len(older) + len(newer)
+        if n < 2:
+            return 0.
+        first = older[0, 0]
+        last = newer[-1, 0] if len(newer) else older[-1, 0]
+        if last <= first:
+            return 0.
+        return (n - 1) / (last - first)
+
+    ###### acquisition loop ######
+
+    def _read_sample(self, row: np.ndarray) -> bool:
+        """reads one pipelined sample into row, returns False on bad reply"""
+        read = self.device._serial_read
+        allin, err0, err1 = read(), read(), read()
+        try:
+            row[1:3] = allin.split()[:2]
+            row[3] = float(err0)
+            row[4] = float(err1)
+        except ValueError:
+            return False
+        return True
+
+    def _run(self) -> None:
+        try:
+            self._acquire()
+        except Exception as exc:
+            self.exception = exc
+            logging.exception("strain gauge acquisition stopped")
+        finally:
+            self._running.clear()
+
+    def _acquire(self) -> None:
+        device = self.device
+        buffer = self.buffer
+        # map perf_counter onto wall clock once, instead of per sample
+        offset = time() - perf_counter()
+        scratch = np.empty(len(COLUMNS))
+        device.write_raw(SAMPLE_QUERY)
+        t_sent = perf_counter()
+        while self._running.is_set():
+            # keep the next request in flight while this one is parsed
+            device.write_raw(SAMPLE_QUERY)
+            t_next = perf_counter()
+            row = buffer.slot()
+            if self._read_sample(row):
+                row[0] = t_sent + offset
+                buffer.commit()
+            else:
+                # lost alignment with the replies, let the request in
+                # flight finish and start the pipeline afresh
+                self.errors += 1
+                logging.warning("strain gauge reply could not be parsed")
+                self._read_sample(scratch)
+                device.reset_input_buffer()
+                device.write_raw(SAMPLE_QUERY)
+                t_next = perf_counter()
+            t_sent = t_next
+        # drain the request still in flight
+        self._read_sample(scratch)
@@ -8,15 +8,42 @@ To Do:
 
 Seth Poh, 2022.04.18 - created strain gauge driver control script
 Thormund, 2022.11.18 - switched pyserial dependency, depreciating getresponse
+Thormund, 2026.10.19 - added play_waveform for streaming output waveforms
+                     - per-channel properties now wrap channel-indexed arrays
 """
 __all__ = ["qoStrainGaugeDriver"]
 
+from time import perf_counter, sleep
+
+import numpy as np
+
 from ..baseclass.baseserial import serial_comm
+from ..baseclass.channels import channelArray
 
 ##### limit constants #####
 
 MAX_CONSTPID = 569.325056
 
+OUTPUT_CHANNELS = (0, 1, 2)
+LOOP_CHANNELS = (0, 1)
+
+def _check_constpid(values: np.ndarray) -> None:
+    if np.any(values > MAX_CONSTPID):
+        raise ValueError(f'Constant setting out of range.\n\
+            {MAX_CONSTPID = }, {values = }')
+
+def _format_out_commands(channels, samples: np.ndarray) -> tuple:
+    """
+    Formats a (n, len(channels)) array of output values into one block of
+    'OUT n v' commands. Returns the encoded block and the byte offset at which
+    each of the n rows starts, plus the end offset.
+    """
+    formats = np.array([f'OUT {channel} %.6f\n' for channel in channels])
+    commands = np.char.mod(formats[None, :], samples)
+    offsets = np.zeros(len(samples) + 1, dtype=np.int64)
+    np.cumsum(np.char.str_len(commands).sum(axis=1), out=offsets[1:])
+    return ''.join(commands.ravel().tolist()).encode('ascii'), offsets
+
 class qoStrainGaugeDriver(serial_comm):
     """
     Strain gauge driver class
@@ -36,6 +63,34 @@ class qoStrainGaugeDriver(serial_comm):
         # Do not catch all errors in init method haphazardly
         super().__init__(device_path, timeout=2)
 
+    ###### channel-indexed arrays ######
+    # e.g. dev.out[:], dev.set[0] = x, dev.out[:] = array
+
+    out = channelArray('OUT? {}', 'OUT {} {}', OUTPUT_CHANNELS, doc="""
+        output setpoints in volt, writes only take effect if the loop is off
+        """)
+    inp = channelArray('IN? {}', channels=LOOP_CHANNELS, doc="""
+        inputs, 64/125 of the voltage after the instrumentation amplifier
+        """)
+    set = channelArray('SET? {}', 'SET {} {}', LOOP_CHANNELS, doc="""
+        control loop setpoints
+        """)
+    constp = channelArray('CONSTP? {}', 'CONSTP {} {}', LOOP_CHANNELS,
+                          validate=_check_constpid, doc="""
+        p constants of the control loops
+        """)
+    consti = channelArray('CONSTI? {}', 'CONSTI {} {}', LOOP_CHANNELS,
+                          validate=_check_constpid, doc="""
+        i constants of the control loops
+        """)
+    constd = channelArray('CONSTD? {}', 'CONSTD {} {}', LOOP_CHANNELS,
+                          validate=_check_constpid, doc="""
+        d constants of the control loops
+        """)
+    err = channelArray('ERR? {}', channels=LOOP_CHANNELS, doc="""
+        current differences between setpoint and input
+        """)
+
     ###### properties ######
 
     @property
@@ -63,42 +118,42 @@ class qoStrainGaugeDriver(serial_comm):
         """
         returns output setpoint of output 0 (format: x.xxxxxx)
         """
-        return float(self.ask('OUT? 0'))
+        return self.out[0]
 
     @out_0.setter
     def out_0(self, value: float) -> None:
         """
         sets output 0 to a given value (in volt) if the loop is off. (format: x.xxxxxx)
         """
-        self.write(f'OUT 0 {value}')
+        self.out[0] = value
 
     @property
     def out_1(self) -> float:
         """
         returns output setpoint of output 1 (format: x.xxxxxx)
         """
-        return float(self.ask('OUT? 1'))
+        return self.out[1]
 
     @out_1.setter
     def out_1(self, value) -> None:
         """
         sets output 1 to a given value (in volt) if the loop is off. (format: x.xxxxxx)
         """
-        self.write(f'OUT 1 {value}')
+        self.out[1] = value
 
     @property
     def out_2(self) -> float:
         """
         returns output setpoint of output 2 (format: x.xxxxxx)
         """
-        return float(self.ask('OUT? 2'))
+        return self.out[2]
 
     @out_2.setter
     def out_2(self, value) -> None:
         """
         sets output 2 to a given value (in volt) if the loop is off. (format: x.xxxxxx)
         """
-        self.write(f'OUT 2 {value}')
+        self.out[2] = value
 
     ### input
 
@@ -107,14 +162,14 @@ class qoStrainGaugeDriver(serial_comm):
         """
         returns the input of a channel 0. The value is 64/125 of the voltage after the instrumentation amplifier. (format: x.xxxxxx)
         """
-        return float(self.ask('IN? 0'))
+        return self.inp[0]
 
     @property
     def in_1(self) -> float:
         """
         returns the input of a channel 1. The value is 64/125 of the voltage after the instrumentation amplifier. (format: x.xxxxxx)
         """
-        return float(self.ask('IN? 1'))
+        return self.inp[1]
 
     @property
     def allin(self) -> bytes:
@@ -130,28 +185,28 @@ class qoStrainGaugeDriver(serial_comm):
         """
         returns setpoint of channel 0 (format: x.xxxxxx)
         """
-        return float(self.ask('SET? 0'))
+        return self.set[0]
 
     @set_0.setter
     def set_0(self, value: float) -> None:
         """
         setpoint of channel 0 (format: x.xxxxxx)
         """
-        self.write(f'SET 0 {value}')
+        self.set[0] = value
 
     @property
     def set_1(self) -> float:
         """
         returns setpoint of channel 1 (format: x.xxxxxx)
         """
-        return float(self.ask('SET? 1'))
+        return self.set[1]
 
     @set_1.setter
     def set_1(self, value: float) -> None:
         """
         setpoint of channel 1 (format: x.xxxxxx)
         """
-        self.write(f'SET 1 {value}')
+        self.set[1] = value
 
     @property
     def loop_0(self):
@@ -189,108 +244,84 @@ class qoStrainGaugeDriver(serial_comm):
         """
         sets the p constant for the control loop
         """
-        return float(self.ask('CONSTP? 0'))
+        return self.constp[0]
 
     @constp_0.setter
     def constp_0(self, value: float) -> None:
         """
         returns the p constant for the control loop
         """
-        if value > MAX_CONSTPID:
-            raise ValueError(f'Constant setting out of range.\n\
-                {MAX_CONSTPID = }, {value = }')
-        else:
-            self.write(f'CONSTP 0 {value}')
+        self.constp[0] = value
 
     @property
     def consti_0(self) -> float:
         """
         returns the i constant for the control loop
         """
-        return float(self.ask('CONSTI? 0'))
+        return self.consti[0]
 
     @consti_0.setter
     def consti_0(self, value: float) -> None:
         """
         sets the i constant for the control loop
         """
-        if value > MAX_CONSTPID:
-            raise ValueError(f'Constant setting out of range.\n\
-                {MAX_CONSTPID = }, {value = }')
-        else:
-            self.write(f'CONSTI 0 {value}')
+        self.consti[0] = value
 
     @property
     def constd_0(self) -> float:
         """
         sets the d constant for the control loop
         """
-        return float(self.ask('CONSTD? 0'))
+        return self.constd[0]
 
     @constd_0.setter
     def constd_0(self, value: float) -> None:
         """
         sets the d constant for the control loop
         """
-        if value > MAX_CONSTPID:
-            raise ValueError(f'Constant setting out of range.\n\
-                {MAX_CONSTPID = }, {value = }')
-        else:
-            self.write(f'CONSTD 0 {value}')
+        self.constd[0] = value
 
     @property
     def constp_1(self) -> float:
         """
         sets the p constant for the control loop
         """
-        return float(self.ask('CONSTP? 1'))
+        return self.constp[1]
 
     @constp_1.setter
     def constp_1(self, value: float) -> None:
         """
         returns the p constant for the control loop
         """
-        if value > MAX_CONSTPID:
-            raise ValueError(f'Constant setting out of range.\n\
-                {MAX_CONSTPID = }, {value = }')
-        else:
-            self.write(f'CONSTP 1 {value}')
+        self.constp[1] = value
 
     @property
     def consti_1(self) -> float:
         """
         returns the i constant for the control loop
         """
-        return float(self.ask('CONSTI? 1'))
+        return self.consti[1]
 
     @consti_1.setter
     def consti_1(self, value: float) -> None:
         """
         sets the i constant for the control loop
         """
-        if value > MAX_CONSTPID:
-            raise ValueError(f'Constant setting out of range.\n\
-                {MAX_CONSTPID = }, {value = }')
-        else:
-            self.write(f'CONSTI 1 {value}')
+        self.consti[1] = value
 
     @property
     def constd_1(self) -> float:
         """
         sets the d constant for the control loop
         """
-        return float(self.ask('CONSTD? 1'))
+        return self.constd[1]
 
     @constd_1.setter
     def constd_1(self, value: float) -> None:
         """
         sets the d constant for the control loop
         """
-        if value > MAX_CONSTPID:
-            raise ValueError(f'Constant setting out of range.\n\
-                {MAX_CONSTPID = }, {value = }')
-        else:
-            self.write(f'CONSTD 1 {value}')
+        self.constd[1] = value
 
     ### errors
 
@@ -299,14 +330,89 @@ class qoStrainGaugeDriver(serial_comm):
         """
         returns the current difference between setpoint and input for channel 0 (format: x.xxxxxx)
         """
-        return float(self.ask('ERR? 0'))
+        return self.err[0]
 
     @property
     def err_1(self) -> float:
         """
         returns the current difference between setpoint and input for channel 1 (format: x.xxxxxx)
         """
-        return float(self.ask('ERR? 1'))
+        return self.err[1]
+
+    ### waveform output
+
+    def play_waveform(self, channel, samples, rate: float,
+                      tick: float = 0.005) -> dict:
+        """
+        Streams an array of output values to one or more outputs at a fixed
+        rate. All commands are formatted up front, and every sample that is
+        due within one scheduling tick goes out in a single write. If the
+        host falls behind, all overdue samples are sent at once.
+
+        Input
+        -----
+        channel (int or sequence of int): output channel(s), 0 to 2
+        samples (array): output values in volt. 1D for a single channel, or
+            of shape (n, len(channel)) for synchronised channels
+        rate (float): output rate in samples per second
+        tick (float): Optional. scheduling interval in seconds
+
+        Returns
+        -------
+        dict of samples, duration (s), rate (achieved, n / duration in Hz,
+        nan without samples),
+        underruns (ticks that started more than a tick late) and
+        max_lag (s)
+        """
+        channels = np.atleast_1d(channel).tolist()
+        if any(c not in OUTPUT_CHANNELS for c in channels):
+            raise ValueError(f"Illegal value of {channel = }, \
+                allowed channels are {OUTPUT_CHANNELS}")
+        samples = np.asarray(samples, dtype=float)
+        if len(channels) == 1 and samples.ndim == 1:
+            samples = samples[:, None]
+        if samples.ndim != 2 or samples.shape[1] != len(channels):
+            raise ValueError(f"samples of shape {samples.shape} do not match \
+                {len(channels)} channels, expected (n, {len(channels)})")
+        if not np.all(np.isfinite(samples)):
+            raise ValueError("samples must all be finite")
+        if rate <= 0:
+            raise ValueError(f"Illegal argument with {rate = }")
+        n = len(samples)
+        if n == 0:
+            return {'samples': 0, 'duration': 0., 'rate': np.nan,
+                    'underruns': 0, 'max_lag': 0.}
+        block, offsets = _format_out_commands(channels, samples)
+
+        period = 1 / rate
+        per_tick = max(1, int(round(tick * rate)))
+        sent = underruns = 0
+        max_lag = 0.
+        start = perf_counter()
+        while sent < n:
+            deadline = start + sent * period
+            now = perf_counter()
+            if deadline > now:
+                sleep(deadline - now)
+                due = sent
+            else:
+                lag = now - deadline
+                max_lag = max(max_lag, lag)
+                if lag > per_tick * period:
+                    underruns += 1
+                due = int((now - start) * rate) + 1
+            stop = min(max(sent + per_tick, due), n)
+            self.write_raw(block[offsets[sent]:offsets[stop]])
+            sent = stop
+        self.flush()
+        duration = perf_counter() - start
+        return {
+            'samples': n,
+            'duration': duration,
+            'rate': n / duration,
+            'underruns': underruns,
+            'max_lag': max_lag,
+        }
 
     ###### device control ######
 
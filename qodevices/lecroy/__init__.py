@@ -8,5 +8,12 @@ pip.
 """
 
 __all__ = [
-    "transport"
+    "acquisition",
+    "parameters",
+    "pulses",
+    "sequence",
+    "simulated",
+    "store",
+    "transport",
+    "waveform"
     ]
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""
+Double-buffered LeCroy acquisition loop
+
+Arming, waiting for the trigger, downloading and re-arming in series leaves
+the scope idle for the whole download. acquisitionLoop instead
+1. waits for the new signal bit of INR?
+2. latches the trace into a scope memory with STO, alternating M1 and M2
+3. re-arms straight away, so the next capture runs during the download
+4. downloads the latched memory, alternating between two host buffers
+5. hands the waveform to a consumer on a worker thread, which processes one
+   buffer while the other is being filled
+
+The dead time of every cycle, from seeing the trigger to re-arming, is
+recorded together with the trigger wait and download times.
+
+Thormund 19 Oct 2026 - created for trigger-rate-bound captures
+"""
+__all__ = [
+        "acquisitionLoop",
+        "benchmark"
+    ]
+
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import numpy as np
+from lecroydso import LeCroyDSO
+
+from ..baseclass.waiting import wait_until
+from .waveform import waveformReader, lecroyWaveform
+
+##### acquisition constants #####
+
+# INR? bit set when a new signal has been acquired
+INR_NEW_SIGNAL = 1
+
+TIMING_COLUMNS = ("wait", "dead_time", "download", "cycle")
+
+def _copy_raw(waveform: lecroyWaveform) -> np.ndarray:
+    """default consumer, keeps a copy of the samples"""
+    return waveform.raw.copy()
+
+class acquisitionLoop:
+    """Acquire-while-transfer capture loop for a LeCroyDSO."""
+
+    def __init__(self, dso: LeCroyDSO, source: str = "C1",
+                 fmt: str = "WORD", memories=("M1", "M2"), consumer=None,
+                 poll: float = 1e-4, trigger_timeout: float = 10.) -> None:
+        """
+        Creates an acquisitionLoop instance.
+
+        Input
+        -----
+        dso (LeCroyDSO): connected scope, as from connect_dso
+        source (str): Optional. channel to capture
+        fmt (str): Optional. 'BYTE' or 'WORD' samples
+        memories (tuple): Optional. scope memories latched in turn
+        consumer (callable): Optional. called with every lecroyWaveform on a
+            worker thread, its return values are collected. Keeps a copy of
+            the raw samples by default.
+        poll (float): Optional. shortest INR? poll interval in seconds
+        trigger_timeout (float): Optional. seconds to wait for a trigger
+        """
+        self.dso = dso
+        self.source = source
+        self.memories = tuple(memories)
+        self.consumer = consumer or _copy_raw
+        self.poll = poll
+        self.trigger_timeout = trigger_timeout
+        # one buffer per memory, so a consumer never sees it overwritten
+        self.readers = [waveformReader(dso, fmt) for _ in self.memories]
+
+    def _wait_trigger(self) -> None:
+        conn = self.dso._conn
+        wait_until(
+            lambda: int(float(conn.query("INR?"))) & INR_NEW_SIGNAL,
+            self.trigger_timeout, min_interval=self.poll,
+            max_interval=10 * self.poll, description="trigger")
+
+    def run(self, n: int, overlap: bool = True) -> dict:
+        """
+        Captures n triggers.
+
+        Input
+        -----
+        n (int): number of captures
+        overlap (bool): Optional. re-arm before downloading. False runs the
+            plain serial loop, for comparison.
+
+        Returns dict of results (consumer return values), throughput
+        (captures per second) and numpy arrays in seconds of wait (for the
+        trigger), dead_time (trigger seen to re-armed), download and cycle
+        """
+        conn = self.dso._conn
+        timing = {column: np.full(n, np.nan) for column in TIMING_COLUMNS}
+        futures = [None] * n
+        # capture whose consumer is using each buffer
+        using = [None] * len(self.memories)
+
+        conn.write("TRMD SINGLE")
+        conn.query("INR?")  # clears a stale new signal bit
+        conn.write("ARM")
+        begin = perf_counter()
+        with ThreadPoolExecutor(1, "lecroy-consumer") as worker:
+            for i in range(n):
+                start = perf_counter()
+                self._wait_trigger()
+                triggered = perf_counter()
+                k = i % len(self.memories)
+                if overlap:
+                    conn.write(f"STO {self.source},{self.memories[k]}")
+                    conn.write("ARM")
+                    armed = perf_counter()
+                if using[k] is not None:
+                    futures[using[k]].result()  # buffer free again
+                waveform = self.readers[k].read(
+                    self.memories[k] if overlap else self.source)
+                downloaded = perf_counter()
+                if not overlap:
+                    conn.write("ARM")
+                    armed = perf_counter()
+                futures[i] = worker.submit(self.consumer, waveform)
+                using[k] = i
+
+                timing["wait"][i] = triggered - start
+                timing["dead_time"][i] = armed - triggered
+                timing["download"][i] = downloaded - (
+                    armed if overlap else triggered)
+                timing["cycle"][i] = perf_counter() - start
+            results = [future.result() for future in futures]
+        elapsed = perf_counter() - begin
+        return {
+            "results": results,
+            "throughput": n / elapsed,
+            **timing,
+        }
+
+
+###### benchmark ######
+
+def benchmark(n: int = 100, samples: int = 200000,
+              trigger_rate: float = 200.) -> dict:
+    """
+    Compares the serial and the overlapped loop on a simulatedDSO whose
+    download takes longer than the trigger period.
+
+    Returns dict of mode -> dict of throughput (captures/s), mean
+    dead_time (s) and mean download (s)
+    """
+    from .simulated import simulatedDSO
+
+    results = {}
+    for overlap in (False, True):
+        dso = simulatedDSO(samples=samples, trigger_rate=trigger_rate, seed=1)
+        run = acquisitionLoop(dso).run(n, overlap=overlap)
+        results["overlapped" if overlap else "serial"] = {
+            "throughput": run["throughput"],
+            "dead_time": float(np.mean(run["dead_time"])),
+            "download": float(np.mean(run["download"])),
+        }
+    return results
+
+if __name__ == "__main__":
+    for mode, result in benchmark().items():
+        print(f"{mode}: {result}")
@@ -0,0 +1,222 @@
+"""
+Scope-side measurement parameter polling
+
+When only amplitudes, rise times or frequencies are needed, the scope can
+measure them itself in its parameters P1 to P8 and only the numbers have to
+be transferred. parameterPoller configures the parameters over VBS and then
+reads the value, status and statistics of every parameter with one batched
+VBS query per cycle, a few hundred bytes instead of a waveform. Polls are
+collected into numpy time series.
+
+lecroydso's get_measure_stats sends one query per statistic, seven round
+trips per parameter and cycle.
+
+Example
+    dso = connect_dso(get_oscilloscope_addr()[0])
+    poller = parameterPoller(dso, {"P1": ("AMPLITUDE", "C1"),
+                                   "P2": ("RISE", "C1"),
+                                   "P3": ("FREQUENCY", "C2")})
+    series = poller.poll(1000, interval=0.01)
+    series["t"], series["P1"]["value"], series["P2"]["mean"]
+
+Thormund 19 Oct 2026 - created for trend logging without waveforms
+"""
+__all__ = [
+        "parameterPoller",
+        "STATISTICS",
+        "benchmark"
+    ]
+
+from time import perf_counter, sleep
+
+import numpy as np
+from lecroydso import LeCroyDSO
+
+##### measurement constants #####
+
+# column: VBS result of app.Measure.Px, in the order of the batched query
+STATISTICS = {
+    "value": "Out.Result.Value",
+    "status": "Out.Result.Status",
+    "mean": "mean.Result.Value",
+    "min": "min.Result.Value",
+    "max": "max.Result.Value",
+    "sdev": "sdev.Result.Value",
+    "num": "num.Result.Value",
+}
+# columns available without statistics
+VALUE_COLUMNS = ("value", "status")
+
+def _float(text: str) -> float:
+    """parses a measurement, nan for replies such as 'No Data'"""
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+class parameterPoller:
+    """Batched polling of the scope's measurement parameters."""
+
+    def __init__(self, dso: LeCroyDSO, parameters: dict = None,
+                 statistics: bool = True) -> None:
+        """
+        Creates a parameterPoller instance and configures the parameters.
+
+        Input
+        -----
+        dso (LeCroyDSO): connected scope, as from connect_dso
+        parameters (dict): Optional. parameter -> (param engine, source1) or
+            (param engine, source1, source2), e.g. {"P1": ("AMPLITUDE",
+            "C1")}. Already configured parameters are only read if None,
+            pass their names with select() then.
+        statistics (bool): Optional. turn on the scope's statistics and
+            read mean, min, max, sdev and num along with the values
+        """
+        self.dso = dso
+        self.statistics = statistics
+        self.parameters = ()
+        dso.write_vbs(f"app.Measure.StatsOn = {int(statistics)}")
+        if parameters:
+            for parameter, setup in parameters.items():
+                self.configure(parameter, *setup)
+            self.select(*parameters)
+
+    @property
+    def columns(self) -> tuple:
+        """returns the statistics read per parameter"""
+        return tuple(STATISTICS) if self.statistics else VALUE_COLUMNS
+
+    def validate_parameter(self, parameter: str) -> str:
+        """returns parameter in upper case, raises ValueError unless the
+        scope has it"""
+        parameter = parameter.upper()
+        if parameter not in self.dso.available_parameters:
+            raise ValueError(f"Illegal value of {parameter} passed into argument.")
+        return parameter
+
+    def configure(self, parameter: str, engine: str, source1: str,
+                  source2: str = "None", view: bool = True) -> None:
+        """
+        Sets up one parameter with a single VBS write.
+
+        Input
+        -----
+        parameter (str): 'P1' to 'P8'
+        engine (str): param engine, e.g. 'AMPLITUDE', 'RISE', 'FREQUENCY'
+        source1 (str): trace measured, e.g. 'C1'
+        source2 (str): Optional. second trace of two-source engines
+        view (bool): Optional. show the parameter on the scope
+        """
+        parameter = self.validate_parameter(parameter)
+        prefix = f"app.Measure.{parameter}"
+        self.dso.write_vbs(":".join((
+            f'{prefix}.ParamEngine = "{engine.upper()}"',
+            f'{prefix}.Source1 = "{source1.upper()}"',
+            f'{prefix}.Source2 = "{source2.upper()}"',
+            f"app.Measure.View{parameter} = {int(view)}",
+        )))
+
+    def select(self, *parameters: str) -> None:
+        """sets the parameters read by every poll and builds their query"""
+        self.parameters = tuple(self.validate_parameter(parameter)
+                                for parameter in parameters)
+        self._query = ' & "," & '.join(
+            f"app.Measure.{parameter}.{STATISTICS[column]}"
+            for parameter in self.parameters for column in self.columns)
+
+    def clear(self) -> None:
+        """restarts the statistics of all parameters"""
+        self.dso.write_vbs("app.Measure.ClearSweeps")
+
+    def read(self) -> np.ndarray:
+        """
+        Reads all selected parameters with one query.
+        Returns (parameters, columns) array, nan where there is no data
+        """
+        if not self.parameters:
+            raise ValueError("No parameters selected")
+        reply = self.dso.query_vbs(self._query)
+        values = np.array([_float(text) for text in reply.split(",")])
+        return values.reshape(len(self.parameters), len(self.columns))
+
+    def poll(self, n: int, interval: float = 0., clear: bool = False) -> dict:
+        """
+        Polls the parameters n times.
+
+        Input
+        -----
+        n (int): number of polls
+        interval (float): Optional. seconds between the starts of polls, as
+            fast as possible by default
+        clear (bool): Optional. restart the statistics first
+
+        Returns dict of t (seconds since the first poll) and of every
+        parameter -> dict of column -> numpy array of n values
+        """
+        if clear:
+            self.clear()
+        t = np.empty(n)
+        data = np.empty((n, len(self.parameters), len(self.columns)))
+        start = perf_counter()
+        for i in range(n):
+            # scheduled from the start, so that slow replies do not add up
+            delay = start + i * interval - perf_counter()
+            if delay > 0:
+                sleep(delay)
+            t[i] = perf_counter() - start
+            data[i] = self.read()
+        series = {"t": t}
+        for k, parameter in enumerate(self.parameters):
+            series[parameter] = {column: data[:, k, j]
+                                 for j, column in enumerate(self.columns)}
+        return series
+
+
+###### benchmark ######
+
+def benchmark(n: int = 200, samples: int = 10000) -> dict:
+    """
+    Reads the statistics of 8 parameters of a simulatedDSO with one query
+    per statistic, as lecroydso's get_measure_stats, and batched, and
+    downloads the waveform for comparison.
+
+    Returns dict of method -> dict of cycles per second and bytes per cycle
+    """
+    from .simulated import simulatedDSO
+    from .waveform import waveformReader
+
+    dso = simulatedDSO(samples=samples, seed=1)
+    dso._conn.write("TRMD NORM")
+    engines = ("AMPLITUDE", "MAXIMUM", "MINIMUM", "MEAN", "RISE", "FALL",
+               "WIDTH", "AREA")
+    poller = parameterPoller(dso, {f"P{i + 1}": (engine, "C1")
+                                   for i, engine in enumerate(engines)})
+    results = {}
+
+    start = perf_counter()
+    received = 0
+    for _ in range(n):
+        for parameter in poller.parameters:
+            for column in poller.columns:
+                received += len(dso.query_vbs(
+                    f"app.Measure.{parameter}.{STATISTICS[column]}")) + 1
+    results["one query per statistic"] = {
+        "cycles": n / (perf_counter() - start), "bytes": received / n}
+
+    start = perf_counter()
+    poller.poll(n)
+    results["batched"] = {"cycles": n / (perf_counter() - start),
+                          "bytes": len(dso.query_vbs(poller._query)) + 1}
+
+    reader = waveformReader(dso)
+    start = perf_counter()
+    for _ in range(n):
+        waveform = reader.read("C1")
+    results["waveform"] = {"cycles": n / (perf_counter() - start),
+                           "bytes": len(waveform.block)}
+    return results
+
+if __name__ == "__main__":
+    for method, result in benchmark().items():
+        print(f"{method}: {result['cycles']:.0f} cycles/s, "
+              f"{result['bytes']:.0f} bytes")
@@ -0,0 +1,371 @@
+"""
+Simulated LeCroy oscilloscope
+
+simulatedDSO stands in for a LeCroyDSO, down to the pyvisa resource that
+waveformReader talks to, so that acquisition loops can be tested and
+benchmarked without a scope. It triggers periodically at trigger_rate while
+armed, and every transfer costs latency plus its size over bandwidth, as on
+USB.
+
+Supported remote commands: COMM_FORMAT, COMM_ORDER, TRMD, ARM, INR?,
+STO <channel>,<memory>, SEQ ON,<segments> / SEQ OFF, *OPC?, *IDN?,
+<source>:WF? ALL, and the measurement parameters over VBS: settings of
+app.Measure and app.Measure.Px, ClearSweeps, and Return = queries of
+Px.Out.Result and the Px statistics joined with & "," &. While the trigger
+mode is AUTO or NORM the parameters are updated at trigger_rate.
+
+Thormund 19 Oct 2026 - created to benchmark acquisition loops offline
+"""
+__all__ = [
+        "simulatedDSO"
+    ]
+
+import struct
+from time import perf_counter
+
+import numpy as np
+from pyvisa import constants
+
+from .waveform import WAVEDESC_SIZE
+
+INR_NEW_SIGNAL = 1
+
+# distinct traces cycled through by the triggers
+TRACE_BANK = 8
+
+# param engine: (mean, standard deviation) of the simulated measurements
+MEASURE_MODEL = {
+    "AMPLITUDE": (0.61, 0.01),
+    "MAXIMUM": (0.62, 0.01),
+    "MINIMUM": (-0.01, 0.005),
+    "MEAN": (0.08, 0.002),
+    "RISE": (5.6e-8, 2e-9),
+    "FALL": (5.6e-8, 2e-9),
+    "WIDTH": (1.18e-7, 3e-9),
+    "FREQUENCY": (1e3, 0.5),
+    "AREA": (7.7e-8, 1.5e-9),
+}
+# measurements drawn per update at most, bounds the simulation time
+MAX_SWEEPS = 100000
+
+def _spin(seconds: float) -> None:
+    """waits precisely, sleep() is too coarse for USB timescales"""
+    end = perf_counter() + seconds
+    while perf_counter() < end:
+        pass
+
+
+class _simulatedVisalib:
+    """low level read of the simulated resource"""
+
+    def __init__(self, resource) -> None:
+        self._resource = resource
+
+    def read(self, session, count: int) -> tuple:
+        resource = self._resource
+        chunk = bytes(resource._output[:count])
+        del resource._output[:count]
+        scope = resource._scope
+        _spin(scope.latency + len(chunk) / scope.bandwidth)
+        if resource._output:
+            return chunk, constants.StatusCode.success_max_count_read
+        return chunk, constants.StatusCode.success
+
+
+class _simulatedResource:
+    """the pyvisa MessageBasedResource of the simulated scope"""
+
+    def __init__(self, scope) -> None:
+        self._scope = scope
+        self._output = bytearray()
+        self.visalib = _simulatedVisalib(self)
+        self.session = 0
+        self.read_termination = "\n"
+        self.write_termination = "\n"
+
+    def ignore_warning(self, *warnings):
+        from contextlib import nullcontext
+        return nullcontext()
+
+    def write(self, message: str) -> None:
+        _spin(self._scope.latency)
+        for command in message.split(";"):
+            reply = self._scope._execute(command.strip())
+            if reply is not None:
+                self._output += reply
+
+    def read(self) -> str:
+        data, _ = self.visalib.read(self.session, len(self._output))
+        return data.decode().rstrip("\n")
+
+    def query(self, message: str) -> str:
+        self.write(message)
+        return self.read()
+
+
+class _simulatedConnection:
+    """the LeCroyVISA of the simulated scope"""
+
+    def __init__(self, scope) -> None:
+        self._visa = _simulatedResource(scope)
+        self.connection_string = "USB0::1535::4131::SIMULATED::0::INSTR"
+
+    def write(self, message: str) -> None:
+        self._visa.write(message)
+
+    def query(self, message: str) -> str:
+        return self._visa.query(message)
+
+    def write_vbs(self, message: str) -> None:
+        self.write(f"vbs '{message}'")
+
+    def query_vbs(self, message: str) -> str:
+        return self.query(f"vbs? 'Return = {message}'")
+
+
+class simulatedDSO:
+    """A LeCroyDSO stand-in with periodic triggers and a USB latency model."""
+
+    def __init__(self, samples: int = 10000, trigger_rate: float = 1000.,
+                 bandwidth: float = 40e6, latency: float = 2e-4,
+                 seed: int = None) -> None:
+        """
+        Creates a simulatedDSO instance.
+
+        Input
+        -----
+        samples (int): Optional. points per trace
+        trigger_rate (float): Optional. trigger events per second
+        bandwidth (float): Optional. transfer rate in bytes per second
+        latency (float): Optional. seconds per transfer
+        seed (int): Optional. random seed of the traces
+        """
+        self.samples = samples
+        self.trigger_rate = trigger_rate
+        self.bandwidth = bandwidth
+        self.latency = latency
+        self.rng = np.random.default_rng(seed)
+        self.available_channels = ["C1", "C2", "C3", "C4"]
+        self.available_digital_channels = []
+        self.available_functions = ["F1", "F2"]
+        self.available_memories = ["M1", "M2", "M3", "M4"]
+        self.available_parameters = [f"P{i}" for i in range(1, 9)]
+        self.available_zooms = []
+        self.word = True
+        self.trigger_mode = "STOP"
+        self.sequence = 0
+        self.triggers = 0
+        self._start = perf_counter()
+        self._armed_at = None
+        self._new_signal = False
+        self._traces = {}
+        self._trigtimes = {}
+        self._statistics = False
+        self._parameters = {parameter: {"paramengine": "NULL"}
+                            for parameter in self.available_parameters}
+        self._measured_at = self._start
+        # generated up front, so that triggers cost no simulation time
+        self._bank = [self._trace() for _ in range(TRACE_BANK)]
+        self._conn = _simulatedConnection(self)
+
+    def validate_source(self, source: str) -> bool:
+        """as LeCroyDSO.validate_source, analog channels only"""
+        if source.upper() in self.available_channels:
+            return True
+        raise ValueError(f"source {source} not found")
+
+    def write_vbs(self, message: str) -> None:
+        """as LeCroyDSO.write_vbs"""
+        self._conn.write_vbs(message)
+
+    def query_vbs(self, message: str) -> str:
+        """as LeCroyDSO.query_vbs"""
+        return self._conn.query_vbs(message)
+
+    ###### acquisition ######
+
+    def _next_trigger(self, after: float) -> float:
+        """returns the time of the first trigger event after a time"""
+        period = 1 / self.trigger_rate
+        return self._start + np.ceil((after - self._start) / period) * period
+
+    def _update(self) -> None:
+        """completes an armed acquisition once its last trigger has passed"""
+        if self._armed_at is None:
+            return
+        first = self._next_trigger(self._armed_at)
+        segments = max(self.sequence, 1)
+        if perf_counter() < first + (segments - 1) / self.trigger_rate:
+            return
+        self._armed_at = None
+        self._new_signal = True
+        bank = [self._bank[(self.triggers + i) % TRACE_BANK]
+                for i in range(segments)]
+        self.triggers += segments
+        self._traces["C1"] = bank[0] if segments == 1 else np.concatenate(bank)
+        times = first - self._start + np.arange(segments) / self.trigger_rate
+        offsets = np.full(segments, -self.samples / 2 * 1e-9)
+        self._trigtimes["C1"] = (np.stack((times, offsets), axis=1)
+                                 if self.sequence else None)
+
+    def _trace(self) -> np.ndarray:
+        """returns a noisy pulse at the trigger, as ADC codes"""
+        t = np.arange(self.samples) - self.samples // 2
+        pulse = 20000 * np.exp(-0.5 * (t / 50.)**2)
+        noise = self.rng.normal(0, 300, self.samples)
+        return (pulse + noise).astype(np.int16)
+
+    ###### remote commands ######
+
+    def _execute(self, command: str):
+        """executes one remote command, returns its reply bytes or None"""
+        self._update()
+        header, _, argument = command.partition(" ")
+        header = header.upper()
+        if header == "*IDN?":
+            return b"LECROY,SIMULATED,LCRY0000N00000,9.0.0\n"
+        if header == "*OPC?":
+            return b"1\n"
+        if header == "COMM_FORMAT":
+            self.word = "WORD" in argument.upper()
+        elif header in ("COMM_ORDER", "CHDR"):
+            pass
+        elif header == "TRMD":
+            self._measure()
+            self.trigger_mode = argument.strip().upper()
+        elif header in ("VBS", "VBS?"):
+            return self._vbs(argument.strip().strip("'"), header == "VBS?")
+        elif header == "SEQ":
+            state, _, segments = argument.partition(",")
+            self.sequence = int(segments) if state.strip() == "ON" else 0
+        elif header == "ARM":
+            self._armed_at = perf_counter()
+        elif header == "INR?":
+            value = INR_NEW_SIGNAL if self._new_signal else 0
+            self._new_signal = False
+            return f"{value}\n".encode()
+        elif header == "STO":
+            source, memory = (s.strip().upper() for s in argument.split(","))
+            if source in self._traces:
+                self._traces[memory] = self._traces[source].copy()
+                self._trigtimes[memory] = self._trigtimes.get(source)
+        elif header.endswith(":WF?"):
+            return self._waveform(header.split(":")[0])
+        else:
+            raise ValueError(f"Unsupported command {command!r}")
+        return None
+
+    ###### measurement parameters ######
+
+    def _measure(self) -> None:
+        """updates the parameters with the triggers since the last update"""
+        now = perf_counter()
+        sweeps = 0
+        if self.trigger_mode in ("AUTO", "NORM", "NORMAL"):
+            sweeps = int(now * self.trigger_rate) \
+                - int(self._measured_at * self.trigger_rate)
+        self._measured_at = now
+        if sweeps <= 0:
+            return
+        for state in self._parameters.values():
+            if state["paramengine"] == "NULL":
+                continue
+            mean, sdev = MEASURE_MODEL.get(state["paramengine"], (1., 0.01))
+            values = self.rng.normal(mean, sdev, min(sweeps, MAX_SWEEPS))
+            if not self._statistics or "num" not in state:
+                state.update(num=0, sum=0., sumsq=0., min=np.inf,
+                             max=-np.inf)
+            state["num"] += len(values)
+            state["sum"] += values.sum()
+            state["sumsq"] += (values**2).sum()
+            state["min"] = min(state["min"], values.min())
+            state["max"] = max(state["max"], values.max())
+            state["last"] = values[-1]
+
+    def _statistic(self, parameter: str, statistic: str) -> str:
+        """returns a statistic of a parameter as the scope formats it"""
+        state = self._parameters[parameter]
+        if state.get("num", 0) == 0:
+            return "No Data"
+        if statistic == "num":
+            return str(state["num"])
+        if statistic == "status":
+            return "0"
+        if statistic in ("last", "value"):
+            return repr(float(state["last"]))
+        mean = state["sum"] / state["num"]
+        if statistic == "mean":
+            return repr(float(mean))
+        if statistic == "sdev":
+            return repr(float(np.sqrt(max(
+                state["sumsq"] / state["num"] - mean**2, 0.))))
+        return repr(float(state[statistic]))
+
+    def _vbs(self, statement: str, query: bool):
+        """executes a VBS statement, returns the reply of a query"""
+        self._measure()
+        if query:
+            expressions = statement.partition("=")[2].split("&")
+            values = [self._vbs_value(expression.strip())
+                      for expression in expressions
+                      if expression.strip() != '","']
+            return (",".join(values) + "\n").encode()
+        for assignment in statement.split(":"):
+            target, _, value = assignment.partition("=")
+            path = target.strip().lower().replace("meas.", "app.measure.")
+            value = value.strip().strip('"').upper()
+            parts = path.split(".")
+            if path == "app.measure.clearsweeps":
+                for state in self._parameters.values():
+                    state.pop("num", None)
+            elif path == "app.measure.statson":
+                self._statistics = value == "1"
+            elif path.startswith("app.measure.p") and len(parts) == 4:
+                self._parameters[parts[2].upper()][parts[3]] = value
+            elif not path.startswith("app.measure."):
+                raise ValueError(f"Unsupported VBS statement {assignment!r}")
+        return None
+
+    def _vbs_value(self, expression: str) -> str:
+        """evaluates app.Measure.Px.<statistic>.Result.<Value|Status>"""
+        parts = expression.lower().replace("meas.", "app.measure.").split(".")
+        if len(parts) != 6 or parts[:2] != ["app", "measure"]:
+            raise ValueError(f"Unsupported VBS query {expression!r}")
+        parameter, statistic, field = parts[2].upper(), parts[3], parts[5]
+        if field == "status":
+            return self._statistic(parameter, "status")
+        if statistic == "out":
+            return self._statistic(parameter, "value")
+        if not self._statistics:
+            return "No Data"
+        return self._statistic(parameter, statistic)
+
+    def _descriptor(self, n: int, item: int, segments: int) -> bytearray:
+        desc = bytearray(WAVEDESC_SIZE)
+        trigtime = 16 * segments if segments > 1 else 0
+        struct.pack_into("<hh", desc, 32, item == 2, 1)
+        struct.pack_into("<7l", desc, 36, WAVEDESC_SIZE, 0, 0, trigtime, 0, 0,
+                         n * item)
+        struct.pack_into("<l", desc, 116, n)
+        struct.pack_into("<l", desc, 144, segments)
+        struct.pack_into("<ff", desc, 156, 1 / 32768 if item == 2 else 1 / 128,
+                         0.)
+        struct.pack_into("<h", desc, 172, 8)
+        struct.pack_into("<f", desc, 176, 1e-9)
+        struct.pack_into("<d", desc, 180, -self.samples / 2 * 1e-9)
+        return desc
+
+    def _waveform(self, source: str) -> bytes:
+        trace = self._traces.get(source)
+        if trace is None:
+            trace = np.zeros(self.samples, dtype=np.int16)
+        trigtimes = self._trigtimes.get(source)
+        segments = 1 if trigtimes is None else len(trigtimes)
+        if not self.word:
+            trace = (trace >> 8).astype(np.int8)
+        data = trace.astype(trace.dtype.newbyteorder("<")).tobytes()
+        payload = bytes(self._descriptor(len(trace), trace.itemsize, segments))
+        if trigtimes is not None:
+            payload += trigtimes.astype("<f8").tobytes()
+        payload += data
+        return b"ALL,#9%09d" % len(payload) + payload + b"\n"
@@ -0,0 +1,237 @@
+"""
+Memory-mapped capture store
+
+Long runs keep their waveforms on disk instead of in Python lists. A store is
+one preallocated file of
+- a small header: capacity, count, record size and the JSON metadata
+  (sample format, trace layout and free-form settings)
+- an index of one INDEX_DTYPE entry per record: host time, trigger time and
+  the vertical and horizontal scaling
+- fixed-size records, each the complete WF? ALL payload, descriptor included
+
+All of it is accessed through numpy memory maps. Readers slice any subset of
+records lazily, nothing is read from disk until it is used. download() has
+waveformReader read the binary reply straight into the mapped record, so a
+capture never has to fit into RAM.
+
+Example
+    reader = waveformReader(dso)
+    first = reader.read("C1")
+    store = captureStore.create("run.lcs", 100000, first,
+                                settings={"bias": 1.2})
+    store.append(first)
+    for _ in range(99999):
+        store.download(reader, "C1")
+    ...
+    store = captureStore("run.lcs")
+    store.raw[1000:2000], store.volts(slice(1000, 2000)), store.index["t"]
+
+Thormund 19 Oct 2026 - created for captures larger than memory
+"""
+__all__ = [
+        "captureStore",
+        "INDEX_DTYPE"
+    ]
+
+import json
+import struct
+from time import time
+
+import numpy as np
+
+from .waveform import lecroyWaveform, parse_descriptor, waveformReader
+
+##### store layout constants #####
+
+MAGIC = b"QOLCS001"
+HEADER_SIZE = 4096
+# magic, capacity, count, record size
+HEADER_FORMAT = "<8sQQQ"
+COUNT_OFFSET = 16
+
+INDEX_DTYPE = np.dtype([
+    ("t", "<f8"),
+    ("trigger_time", "<f8"),
+    ("vertical_gain", "<f4"),
+    ("vertical_offset", "<f4"),
+    ("horiz_interval", "<f4"),
+    ("horiz_offset", "<f8"),
+])
+
+class captureStore:
+    """Preallocated, memory-mapped file of fixed-size waveform records."""
+
+    def __init__(self, path: str, mode: str = "r") -> None:
+        """
+        Opens an existing store.
+
+        Input
+        -----
+        path (str): file created by captureStore.create
+        mode (str): Optional. 'r' to read, 'r+' to append further records
+        """
+        if mode not in ("r", "r+"):
+            raise ValueError(f"Illegal value of {mode} passed into argument.")
+        self.path = path
+        self.mode = mode
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        magic, self.capacity, _, self.record_size = struct.unpack_from(
+            HEADER_FORMAT, header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a capture store")
+        start = struct.calcsize(HEADER_FORMAT)
+        self.metadata = json.loads(header[start:].rstrip(b"\0"))
+
+        self._header = np.memmap(path, np.uint8, mode, 0, HEADER_SIZE)
+        self._index = np.memmap(path, INDEX_DTYPE, mode, HEADER_SIZE,
+                                self.capacity)
+        self._records = np.memmap(
+            path, np.uint8, mode, HEADER_SIZE + self.capacity
+            * INDEX_DTYPE.itemsize, (self.capacity, self.record_size))
+        meta = self.metadata
+        shape = (self.capacity, meta["segments"], meta["samples"])
+        dtype = np.dtype(meta["dtype"])
+        # samples of every record, strided over the records' descriptors
+        self._raw = np.ndarray(
+            shape, dtype, buffer=self._records, offset=meta["data_offset"],
+            strides=(self.record_size, meta["samples"] * dtype.itemsize,
+                     dtype.itemsize))
+        if meta["segments"] == 1:
+            self._raw = self._raw[:, 0]
+
+    @classmethod
+    def create(cls, path: str, capacity: int, like: lecroyWaveform,
+               settings: dict = None):
+        """
+        Creates and preallocates a store, returns it opened for appending.
+
+        Input
+        -----
+        path (str): file to create, overwritten if it exists
+        capacity (int): number of records
+        like (lecroyWaveform): waveform with the layout of all records, e.g.
+            the first one downloaded
+        settings (dict): Optional. JSON serialisable run settings
+        """
+        descriptor = like.descriptor
+        metadata = {
+            "dtype": like.raw.dtype.str,
+            "segments": len(like.segments),
+            "samples": like.segments.shape[1],
+            "data_offset": descriptor["data_offset"],
+            "settings": settings or {},
+        }
+        header = struct.pack(HEADER_FORMAT, MAGIC, capacity, 0,
+                             len(like.block)) + json.dumps(metadata).encode()
+        if len(header) > HEADER_SIZE:
+            raise ValueError("settings do not fit into the header")
+        size = (HEADER_SIZE + capacity * INDEX_DTYPE.itemsize
+                + capacity * len(like.block))
+        with open(path, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            f.truncate(size)
+        return cls(path, "r+")
+
+    def __enter__(self):
+        """dunder method for with statement"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """dunder method for with statement"""
+        self.close()
+
+    def close(self) -> None:
+        """flushes and releases the memory maps"""
+        self.flush()
+        del self._raw, self._records, self._index, self._header
+
+    def flush(self) -> None:
+        """writes pending changes to disk"""
+        if self.mode == "r+":
+            self._records.flush()
+            self._index.flush()
+            self._header.flush()
+
+    ###### writing ######
+
+    def __len__(self) -> int:
+        return struct.unpack_from("<Q", self._header, COUNT_OFFSET)[0]
+
+    def _next(self) -> int:
+        count = len(self)
+        if count >= self.capacity:
+            raise ValueError(f"Store is full with {self.capacity} records")
+        return count
+
+    def _commit(self, i: int, waveform: lecroyWaveform, t: float) -> None:
+        entry = self._index[i]
+        entry["t"] = time() if t is None else t
+        entry["trigger_time"] = waveform.trigger_times[0]
+        entry["vertical_gain"] = waveform.gain
+        entry["vertical_offset"] = waveform.offset
+        entry["horiz_interval"] = waveform.interval
+        entry["horiz_offset"] = waveform.horiz_offset
+        struct.pack_into("<Q", self._header, COUNT_OFFSET, i + 1)
+
+    def append(self, waveform: lecroyWaveform, t: float = None) -> int:
+        """
+        Copies a downloaded waveform into the next record.
+        Returns the record number.
+        """
+        if len(waveform.block) != self.record_size:
+            raise ValueError(f"{len(waveform.block)} byte waveform does not "
+                             f"match {self.record_size} byte records")
+        i = self._next()
+        self._records[i] = waveform.block
+        self._commit(i, waveform, t)
+        return i
+
+    def download(self, reader: waveformReader, source: str = "C1",
+                 t: float = None) -> int:
+        """
+        Downloads source with reader straight into the next record, without
+        an intermediate buffer. Returns the record number.
+        """
+        i = self._next()
+        waveform = reader.read(source, out=self._records[i])
+        if len(waveform.block) != self.record_size:
+            raise ValueError(f"{len(waveform.block)} byte waveform does not "
+                             f"match {self.record_size} byte records")
+        self._commit(i, waveform, t)
+        return i
+
+    ###### reading ######
+
+    @property
+    def index(self) -> np.ndarray:
+        """returns the INDEX_DTYPE entries of all records, memory-mapped"""
+        return self._index[:len(self)]
+
+    @property
+    def raw(self) -> np.ndarray:
+        """
+        returns the samples of all records as a memory-mapped (records,
+        samples) or (records, segments, samples) array, read lazily
+        """
+        return self._raw[:len(self)]
+
+    def __getitem__(self, key) -> np.ndarray:
+        """returns raw samples of the selected records, read lazily"""
+        return self.raw[key]
+
+    def volts(self, key) -> np.ndarray:
+        """returns the selected records in volts, loading only those"""
+        index = self.index[key]
+        raw = np.asarray(self.raw[key], dtype=np.float32)
+        extra = (1,) * (raw.ndim - np.ndim(index))
+        gain = index["vertical_gain"].reshape(np.shape(index) + extra)
+        offset = index["vertical_offset"].reshape(np.shape(index) + extra)
+        return gain * raw - offset
+
+    def waveform(self, i: int) -> lecroyWaveform:
+        """returns record i as a lecroyWaveform on the memory map"""
+        if not 0 <= i < len(self):
+            raise IndexError(f"record {i} out of range")
+        block = self._records[i]
+        return lecroyWaveform(block, parse_descriptor(block))
@@ -2,30 +2,65 @@
 LeCroyDSO initializers
 
 Thormund 25 Nov 2022 - Add functions for ease of connecting to DSO via USBTMC
+Thormund 19 Oct 2026 - One shared ResourceManager, LeCroy USB devices listed
+    by VISA query expression and cached for a few seconds
 """
 __all__ = [
+        "get_resource_manager",
         "get_oscilloscope_addr",
-        "connect_dso"
+        "connect_dso",
+        "benchmark"
     ]
 
+from time import monotonic, perf_counter
+
 from pyvisa import ResourceManager
 from lecroydso import LeCroyVISA, LeCroyDSO
 from lecroydso.errors import DSOConnectionError
 
-def get_oscilloscope_addr() -> list:
+##### discovery constants #####
+
+# Example: 'USB0::1535::4131::3505N05494::0::INSTR'
+# USB[board]::manufacturer ID::model code::serial number
+# [::USB interface number][::INSTR]
+# Hardcoded Manufacturer ID: 1535
+LECROY_QUERY = "USB?*::1535::?*::INSTR"
+
+# seconds a discovery result is reused
+CACHE_TTL = 5.
+
+_resource_managers = {}
+_discovered = {}
+
+def get_resource_manager(backend: str = "") -> ResourceManager:
     """
-    Returns possible list of pyvisa resource addresses that contain Lecroy 
+    Returns the process-wide ResourceManager of a VISA backend, creating it
+    on first use, e.g. backend='@py' for pyvisa-py or '@sim' for pyvisa-sim.
+    """
+    rm = _resource_managers.get(backend)
+    if rm is None:
+        rm = _resource_managers[backend] = ResourceManager(backend)
+    return rm
+
+def get_oscilloscope_addr(query: str = LECROY_QUERY, ttl: float = CACHE_TTL,
+                          backend: str = "") -> list:
+    """
+    Returns possible list of pyvisa resource addresses that contain Lecroy
     Oscilloscopes.
+
+    Only resources matching the VISA query expression are returned. Whether
+    other interfaces are probed depends on the backend: pyvisa-py lists
+    every interface it supports, serial and TCPIP included, and filters
+    afterwards. Results are reused for ttl seconds, pass ttl=0 to list
+    afresh.
     """
-    def filter_by_id(x: str):
-        # Example: 'USB0::1535::4131::3505N05494::0::INSTR' 
-        # USB[board]::manufacturer ID::model code::serial number
-        # [::USB interface number][::INSTR]
-        # Hardcoded Manufacturer ID: 1535
-        if x.split("::")[1] == '1535':
-            return True
-        return False
-    return list(filter(filter_by_id, ResourceManager().list_resources()))
+    key = (backend, query)
+    cached = _discovered.get(key)
+    if cached is not None and monotonic() - cached[0] < ttl:
+        return list(cached[1])
+    addresses = list(get_resource_manager(backend).list_resources(query))
+    _discovered[key] = (monotonic(), addresses)
+    return list(addresses)
 
 def connect_dso(resource_address: str, log: bool=False) -> LeCroyDSO:
     """Instance of communication interface to a LeCroy Oscilloscope."""
@@ -35,6 +70,95 @@ def connect_dso(resource_address: str, log: bool=False) -> LeCroyDSO:
         print('Oscilliscope could not be connected to.')
         return
 
+###### benchmark ######
+
+SIM_DEVICES = """spec: "1.0"
+devices:
+  scope:
+    eom:
+      USB INSTR:
+        q: "\\n"
+        r: "\\n"
+    dialogues:
+      - q: "*IDN?"
+        r: "LECROY,WAVERUNNER,LCRY0000N00000,9.0.0"
+  other:
+    eom:
+      ASRL INSTR:
+        q: "\\n"
+        r: "\\n"
+      USB INSTR:
+        q: "\\n"
+        r: "\\n"
+      TCPIP INSTR:
+        q: "\\n"
+        r: "\\n"
+    dialogues:
+      - q: "*IDN?"
+        r: "OTHER"
+resources:
+  USB0::1535::4131::3505N05494::0::INSTR:
+    device: scope
+  USB0::1535::4131::3505N05495::0::INSTR:
+    device: scope
+  USB0::4883::32842::M00000000::0::INSTR:
+    device: other
+  ASRL1::INSTR:
+    device: other
+  ASRL2::INSTR:
+    device: other
+  TCPIP0::192.168.0.10::INSTR:
+    device: other
+"""
+
+def benchmark(repeat: int = 200) -> dict:
+    """
+    Compares, on a pyvisa-sim backend, the seconds per discovery of
+    - the previous approach: a new ResourceManager listing every resource,
+      filtered in Python
+    - a query expression on the shared ResourceManager, uncached
+    - the same with the TTL cache
+
+    pyvisa-sim answers instantly, so real interface probes make every
+    uncached listing slower than shown here.
+
+    Returns dict of case -> seconds per discovery
+    """
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "lecroy.yaml")
+        with open(path, "w") as f:
+            f.write(SIM_DEVICES)
+        backend = f"{path}@sim"
+
+        def listing_everything():
+            resources = ResourceManager(backend).list_resources()
+            return [r for r in resources if r.split("::")[1] == "1535"]
+
+        cases = {
+            "new manager, list all, filter": listing_everything,
+            "shared manager, query": lambda: get_oscilloscope_addr(
+                ttl=0, backend=backend),
+            "shared manager, query, cached": lambda: get_oscilloscope_addr(
+                backend=backend),
+        }
+        results = {}
+        for name, discover in cases.items():
+            discover()
+            start = perf_counter()
+            for _ in range(repeat):
+                discover()
+            results[name] = (perf_counter() - start) / repeat
+        get_resource_manager(backend).close()
+        del _resource_managers[backend]
+        # the simulated scopes must not be returned by later discoveries
+        for key in [key for key in _discovered if key[0] == backend]:
+            del _discovered[key]
+    return results
+
 if __name__ == '__main__':
+    for case, seconds in benchmark().items():
+        print(f"{case}: {seconds * 1e6:.1f} us")
     print(f"{get_oscilloscope_addr() = }")
-    
\ No newline at end of file
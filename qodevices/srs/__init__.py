@@ -4,5 +4,7 @@ Standford Research Systems
 """
 
 __all__ = [
-    "srs_laser_driver"
+    "srs_autotune",
+    "srs_laser_driver",
+    "srs_thermometry"
     ]
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+SRS LDC TEC autotune orchestration
+
+Starting TUNE and polling TUNE? by hand blocks a script for minutes. Here each
+autotune is submitted to an srsAutotuner and returns a Future straight away.
+A single background thread polls every unit at an adaptive interval, short
+right after a start or status change and growing while nothing happens, and
+reads back the TPGN/TIGN/TDGN gains when a unit finishes. Several units tune
+at the same time.
+
+Thormund, 2026.10.19 - created for non-blocking autotune of several LDCs
+"""
+__all__ = ["srsAutotuner", "TUNE_STATUS"]
+
+import heapq
+import itertools
+import logging
+import threading
+from concurrent.futures import Future
+from time import monotonic, time
+
+from .srs_laser_driver import srsLaserDriver
+
+##### autotune constants #####
+
+TUNE_STATUS = {
+    0: 'off',
+    1: 'running',
+    2: 'unstable',
+    3: 'success',
+    4: 'failed',
+    5: 'check_polarity',
+}
+TUNE_RUNNING = 1
+
+# time TUNE? may still report off right after TUNE 1
+START_GRACE = 2.
+
+GAIN_QUERIES = ('TPGN?', 'TIGN?', 'TDGN?')
+
+class _tuneJob:
+    """bookkeeping of one running autotune"""
+
+    def __init__(self, device, name, interval) -> None:
+        self.device = device
+        self.name = name
+        self.interval = interval
+        self.future = Future()
+        self.status = None
+        self.seen_running = False
+        self.polls = 0
+        self.started = time()
+        self.started_monotonic = monotonic()
+
+class srsAutotuner:
+    """
+    Runs TEC autotunes of several srsLaserDriver units from one thread
+    """
+
+    def __init__(self, min_interval: float = 0.5, max_interval: float = 10.,
+                 growth: float = 1.5, timeout: float = 1800.) -> None:
+        """
+        Creates a srsAutotuner instance.
+
+        Input
+        -----
+        min_interval (float): Optional. poll interval in seconds after a
+            start or status change
+        max_interval (float): Optional. longest poll interval in seconds
+        growth (float): Optional. factor the interval grows by per poll
+        timeout (float): Optional. seconds after which a tune is abandoned
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.growth = growth
+        self.timeout = timeout
+        self.records = []
+        self._queue = []
+        self._order = itertools.count()
+        self._wakeup = threading.Condition()
+        self._thread = None
+
+    def submit(self, device: srsLaserDriver, step: float = None,
+               name: str = None) -> Future:
+        """
+        Starts an autotune on device and returns a Future, which resolves to
+        the record of the tune (see records) once it has finished.
+
+        Input
+        -----
+        device (srsLaserDriver): unit to tune. Do not use it from other
+            threads until the Future is done.
+        step (float): Optional. autotune step size, sets TATS first
+        name (str): Optional. label of the unit in the records
+        """
+        name = name or getattr(device, 'port', None) or repr(device)
+        if step is not None:
+            device.tats = step
+        device.tune = 1
+        job = _tuneJob(device, name, self.min_interval)
+        self._schedule(job, self.min_interval)
+        return job.future
+
+    def wait(self, timeout: float = None) -> list:
+        """blocks until all submitted tunes are done, returns the records"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.records
+
+    ###### scheduler ######
+
+    def _schedule(self, job: _tuneJob, delay: float) -> None:
+        with self._wakeup:
+            heapq.heappush(self._queue,
+                           (monotonic() + delay, next(self._order), job))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='srsAutotuner', daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                if not self._queue:
+                    self._thread = None
+                    return
+                due, _, job = self._queue[0]
+                delay = due - monotonic()
+                if delay > 0:
+                    # a newly submitted job may be due sooner
+                    self._wakeup.wait(delay)
+                    continue
+                heapq.heappop(self._queue)
+            self._poll(job)
+
+    def _poll(self, job: _tuneJob) -> None:
+        try:
+            status = int(job.device.tune)
+        except Exception as exc:
+            self._finish(job, exc)
+            return
+        job.polls += 1
+        elapsed = monotonic() - job.started_monotonic
+        if status == TUNE_RUNNING:
+            job.seen_running = True
+        if status != job.status:
+            job.status = status
+            job.interval = self.min_interval
+        else:
+            job.interval = min(job.interval * self.growth, self.max_interval)
+
+        starting = not job.seen_running and elapsed < START_GRACE
+        if (status == TUNE_RUNNING or starting) and elapsed < self.timeout:
+            self._schedule(job, job.interval)
+        else:
+            self._finish(job)
+
+    def _finish(self, job: _tuneJob, exc: Exception = None) -> None:
+        record = {
+            'name': job.name,
+            'status': job.status,
+            'outcome': TUNE_STATUS.get(job.status, 'unknown'),
+            'started': job.started,
+            'elapsed': monotonic() - job.started_monotonic,
+            'polls': job.polls,
+        }
+        if exc is None:
+            try:
+                if job.status == TUNE_RUNNING:
+                    record['outcome'] = 'timeout'
+                    job.device.tune = 0
+                gains = job.device.ask_chained(GAIN_QUERIES)
+                record.update(zip(('tpgn', 'tign', 'tdgn'), map(float, gains)))
+            except Exception as gain_exc:
+                exc = gain_exc
+        self.records.append(record)
+        logging.info(f"autotune finished: {record}")
+        if exc is not None:
+            record['outcome'] = 'error'
+            job.future.set_exception(exc)
+        else:
+            job.future.set_result(record)
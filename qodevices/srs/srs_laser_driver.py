@@ -8,8 +8,23 @@ To Do:
 
 Seth Poh, 2022.03.28 - overhauled srs laser driver control script for temperature part only
 Thormund, 2022.11.18 - switched pyserial dependency, depreciating getresponse
+Thormund, 2026.10.19 - added chained queries and single round trip monitor
 """
 from ..baseclass.baseserial import serial_comm
+from ..baseclass.batching import ask_chained
+
+##### communication constants #####
+
+# the LDC input buffer holds one 256 character line including terminator
+MAX_LINE_LENGTH = 255
+
+MONITOR_QUERIES = {
+    'ttrd': 'TTRD?',
+    'traw': 'TRAW?',
+    'tird': 'TIRD?',
+    'tvrd': 'TVRD?',
+    'tsns': 'TSNS?',
+}
 
 class srsLaserDriver(serial_comm):
     """
@@ -32,6 +47,24 @@ class srsLaserDriver(serial_comm):
         except:
             print('The indicated device cannot be found')
 
+    ###### batched queries ######
+
+    def ask_chained(self, commands) -> list:
+        """
+        Queries several commands in ';' chained lines, one round trip per
+        line instead of one per command. Returns a list of str replies.
+        """
+        return ask_chained(self, commands, max_length=MAX_LINE_LENGTH)
+
+    def monitor(self) -> dict:
+        """
+        returns all tec monitor readings in one round trip, as a dict of
+        ttrd (celsius), traw (raw thermometer), tird (current),
+        tvrd (voltage) and tsns (sensor status)
+        """
+        replies = self.ask_chained(MONITOR_QUERIES.values())
+        return dict(zip(MONITOR_QUERIES, map(float, replies)))
+
     ###### tec control ######
 
     #### tec limits
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+SRS LDC thermometry
+
+Host-side conversion of raw NTC thermistor readings to temperature, using the
+sensor model configured on the instrument. The model and its coefficients are
+read once and cached, after which whole arrays of TRAW? readings or
+resistances convert to celsius with vectorised NumPy. High rate logging can
+then poll TRAW? only and convert in bulk.
+
+Units follow the LDC manual: Steinhart-Hart A, B and C are given in units of
+1e-3, 1e-4 and 1e-7, the beta model R0 and NTC raw readings in kohm, T0 in
+celsius. check() compares against TTRD? to confirm them on a given unit.
+
+Thormund, 2026.10.19 - created for TRAW? only high rate logging
+"""
+__all__ = ["srsThermometry", "benchmark"]
+
+import logging
+from time import perf_counter
+
+import numpy as np
+
+from .srs_laser_driver import srsLaserDriver
+
+##### sensor model constants #####
+
+MODEL_BETA = 0
+MODEL_STEINHART_HART = 1
+MODEL_NONE = 2
+
+STEINHART_HART_SCALE = (1e-3, 1e-4, 1e-7)
+KOHM = 1e3
+ZERO_CELSIUS = 273.15
+
+COEFFICIENT_QUERIES = {
+    'tmdn': 'TMDN?',
+    'tsha': 'TSHA?',
+    'tshb': 'TSHB?',
+    'tshc': 'TSHC?',
+    'tntb': 'TNTB?',
+    'tntr': 'TNTR?',
+    'tntt': 'TNTT?',
+}
+
+class srsThermometry:
+    """
+    Cached LDC thermistor model with vectorised conversions
+    """
+
+    def __init__(self, coefficients: dict) -> None:
+        """
+        Creates a srsThermometry instance from a dict of coefficients as
+        returned by the LDC, keyed like COEFFICIENT_QUERIES. Use
+        srsThermometry.from_device to read them off an instrument.
+        """
+        self.coefficients = {k: float(v) for k, v in coefficients.items()}
+        self.model = int(self.coefficients['tmdn'])
+        if self.model not in (MODEL_BETA, MODEL_STEINHART_HART):
+            raise ValueError(f"Unsupported sensor model {self.model}, \
+                only beta (0) and steinhart-hart (1) thermistors convert")
+
+    @classmethod
+    def from_device(cls, device: srsLaserDriver):
+        """reads the sensor model of device in one round trip"""
+        replies = device.ask_chained(COEFFICIENT_QUERIES.values())
+        return cls(dict(zip(COEFFICIENT_QUERIES, replies)))
+
+    ###### conversions ######
+
+    def resistance_to_celsius(self, resistance) -> np.ndarray:
+        """
+        converts thermistor resistances in ohm to temperatures in degree
+        celsius. Accepts scalars or arrays of any shape.
+        """
+        log_r = np.log(np.asarray(resistance, dtype=float))
+        c = self.coefficients
+        if self.model == MODEL_STEINHART_HART:
+            a, b, c3 = (c[k] * s for k, s in
+                        zip(('tsha', 'tshb', 'tshc'), STEINHART_HART_SCALE))
+            inverse_t = a + b * log_r + c3 * log_r**3
+        else:
+            inverse_t = (1 / (c['tntt'] + ZERO_CELSIUS)
+                         + (log_r - np.log(c['tntr'] * KOHM)) / c['tntb'])
+        return 1 / inverse_t - ZERO_CELSIUS
+
+    def raw_to_celsius(self, raw) -> np.ndarray:
+        """converts TRAW? readings in kohm to degree celsius"""
+        return self.resistance_to_celsius(np.asarray(raw, dtype=float) * KOHM)
+
+    ###### validation ######
+
+    def check(self, device: srsLaserDriver, n: int = 10,
+              tolerance: float = 0.01) -> dict:
+        """
+        Compares host-side conversion of TRAW? against TTRD?, with both read
+        in the same line so that they refer to the same moment.
+
+        Input
+        -----
+        device (srsLaserDriver): the instrument the model was read from
+        n (int): Optional. number of reading pairs
+        tolerance (float): Optional. largest acceptable deviation in K
+
+        Returns dict of raw, ttrd, converted, max_error and ok
+        """
+        pairs = np.array([device.ask_chained(('TRAW?', 'TTRD?'))
+                          for _ in range(n)], dtype=float)
+        raw, ttrd = pairs.T
+        converted = self.raw_to_celsius(raw)
+        max_error = float(np.max(np.abs(converted - ttrd)))
+        if max_error > tolerance:
+            logging.warning(f"host conversion deviates from TTRD? by \
+                {max_error} K, check the sensor model units")
+        return {
+            'raw': raw,
+            'ttrd': ttrd,
+            'converted': converted,
+            'max_error': max_error,
+            'ok': max_error <= tolerance,
+        }
+
+def benchmark(n: int = 1_000_000, repeat: int = 5) -> dict:
+    """
+    Measures conversion throughput for n raw readings with a typical 10 kohm
+    thermistor, for both models. Returns conversions per second by model.
+    """
+    raw = np.random.default_rng(0).uniform(2, 30, n)
+    models = {
+        'beta': {'tmdn': MODEL_BETA, 'tntb': 3950, 'tntr': 10, 'tntt': 25},
+        'steinhart-hart': {'tmdn': MODEL_STEINHART_HART, 'tsha': 1.125,
+                           'tshb': 2.347, 'tshc': 0.855},
+    }
+    rates = {}
+    for name, coefficients in models.items():
+        thermometry = srsThermometry(coefficients)
+        best = np.inf
+        for _ in range(repeat):
+            start = perf_counter()
+            thermometry.raw_to_celsius(raw)
+            best = min(best, perf_counter() - start)
+        rates[name] = n / best
+    return rates
+
+if __name__ == '__main__':
+    for model, rate in benchmark().items():
+        print(f"{model}: {rate:.3g} conversions/s")
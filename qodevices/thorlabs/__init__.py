@@ -6,5 +6,8 @@ Thorlabs devices
 
 __all__ = [
     "thorlabs_laser_driver",
-    "thorlabs_PAX_driver"
+    "thorlabs_liv",
+    "thorlabs_PAX_driver",
+    "thorlabs_pax_sampler",
+    "thorlabs_pax_statistics"
     ]
@@ -4,14 +4,72 @@ Thorlabs PAX1000 Polarimeter driver
 
 Thormund - 2023 Initial version for interacting with Thorlabs Polarimeter
     Includes stokes vector and polarisation calculation in class property
+Thormund - 2026.10.19 - initialize waits for the waveplate instead of sleeping
+Thormund - 2026.10.19 - batched acquisition with vectorised stokes
 """
 
-__all__ = ["thorlabsPolarimeterDriver"]
+__all__ = ["thorlabsPolarimeterDriver", "DATA_FIELDS", "parse_data", "stokes"]
 
+import numpy as np
 from usbtmc.usbtmc import Instrument
-from time import sleep
 from numpy import sin, cos
 
+from ..baseclass.waiting import wait_opc, wait_until
+
+# columns of one SENS:DATA:LAT? data set
+DATA_FIELDS = (
+    "rev",
+    "timestamp",
+    "paxOpMode",
+    "paxFlags",
+    "paxTIARange",
+    "adcMin",
+    "adcMax",
+    "revTime",
+    "misAdj",
+    "theta",
+    "eta",
+    "DOP",
+    "Ptotal",
+)
+THETA, ETA, DOP, PTOTAL = (DATA_FIELDS.index(f)
+                           for f in ("theta", "eta", "DOP", "Ptotal"))
+
+
+def parse_data(replies) -> np.ndarray:
+    """Parses SENS:DATA:LAT? replies all at once.
+
+    Returns (n, 13) float array, columns as in DATA_FIELDS
+    """
+    fields = ",".join(reply.strip() for reply in replies).split(",")
+    data = np.array(fields, dtype=float)
+    if data.size != len(replies) * len(DATA_FIELDS):
+        raise ValueError(f"Unexpected data set in {replies}")
+    return data.reshape(len(replies), len(DATA_FIELDS))
+
+
+def stokes(data) -> np.ndarray:
+    """Computes Stokes parameters of data sets, vectorised.
+
+    Input
+    -----
+    data (array): (n, 13) data sets, as from acquire, or a single one
+
+    Returns (n, 5) array of Ptotal, normalized S1, S2, S3 and DOP,
+    or (5,) for a single data set
+    """
+    data = np.asarray(data, dtype=float)
+    theta = 2 * data[..., THETA]
+    eta = 2 * data[..., ETA]
+    cos_eta = cos(eta)
+    return np.stack((
+        data[..., PTOTAL],
+        cos(theta) * cos_eta,
+        sin(theta) * cos_eta,
+        sin(eta),
+        data[..., DOP],
+    ), axis=-1)
+
 
 class thorlabsPolarimeterDriver(Instrument):
     def __init__(self, *args, **kwargs):
@@ -24,46 +82,62 @@ class thorlabsPolarimeterDriver(Instrument):
         """
         super().__init__(*args, **kwargs)
 
+    def query(self, message: str) -> str:
+        """Write then read string, as named in the Thorlabs documentation"""
+        return self.ask(message)
+
     # convenience commands
-    def initialize(self):
+    def initialize(self, timeout: float = 10.):
         """High level implementation to get PAX started.
 
         Values provided in this func might not necessarily be what you want.
+        Returns once the waveplate delivers measurements, rather than after
+        a fixed delay.
+
+        Input
+        -----
+        timeout (float): Optional. seconds allowed for the waveplate to start
         """
-        self.sens_calc_mode(9)
+        self.sens_calc_mode = 9
         print("PAX has been set to averaging mode 9")
-        self.inp_rot_stat(1)
+        self.inp_rot_stat = 1
+        wait_opc(self, timeout)
+        self.wait_revolutions(2, timeout)
         print("PAX waveplates are now set to rotating")
-        sleep(0.5)
         assert self.sens_calc_mode == "9"
         assert self.inp_rot_stat
 
-    def get_stokes(self) -> tuple(float):
+    def wait_revolutions(self, n: int = 1, timeout: float = 10.) -> float:
+        """Waits until n further waveplate revolutions have completed, i.e.
+        until the revolution counter of the latest data set has advanced by
+        n. A stopped or still spinning up waveplate completes none.
+
+        Returns the time waited in seconds.
+        Raises TimeoutError if they do not complete within timeout.
+        """
+        def revolution():
+            return int(float(self.sens_data_lat().split(",")[0]))
+        target = revolution() + n
+        return wait_until(lambda: revolution() >= target, timeout,
+                          description=f"{n} waveplate revolutions")
+
+    def get_stokes(self) -> tuple:
         """High level implementation to get Stokes vector parameters.
 
         Returns (Ptotal, Normalized S1, S2, S3)
         """
-        (
-            rev,
-            timestamp,
-            paxOpMode,
-            paxFlags,
-            paxTIARange,
-            adcMin,
-            adcMax,
-            revTime,
-            misAdj,
-            theta,
-            eta,
-            DOP,
-            Ptotal,
-        ) = map(float, self.sens_data_lat.rstrip("\n").split(","))
-        return (
-            Ptotal,
-            cos(2 * theta) * cos(2 * eta),
-            sin(2 * theta) * cos(2 * eta),
-            sin(2 * eta),
-        )
+        data = parse_data([self.sens_data_lat()])
+        return tuple(float(x) for x in stokes(data[0])[:4])
+
+    def acquire(self, n: int) -> np.ndarray:
+        """Collects n latest data sets, parsed in one go after collection.
+
+        Returns (n, 13) float array, columns as in DATA_FIELDS. Pass it to
+        stokes() for Ptotal, S1, S2, S3 and DOP of every data set.
+        """
+        query = "SENS:DATA:LAT?"
+        replies = [self.ask(query) for _ in range(n)]
+        return parse_data(replies)
 
     # visa commands, as given by manual
 
@@ -171,7 +245,7 @@ class thorlabsPolarimeterDriver(Instrument):
         """Sets waveplate rotation"""
         t_values = (1, "On", True, "1")
         f_values = (0, "Off", False, "0")
-        if (value not in t_values) or value not in (f_values):
+        if value not in t_values and value not in f_values:
             raise ValueError(f"Illegal value of {value} passed into argument.")
 
         if value in f_values:
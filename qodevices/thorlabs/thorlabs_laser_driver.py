@@ -5,13 +5,39 @@ Thorlabs ITC4001 Laser driver
 Joel and Seth Poh, 2022.03.29 - overhauled laser driver control script
 Thormund - 2022.11.11 - forked from python_general/devices to sort import
     errors, and cleanup methods, along with context management
+Thormund - 2026.10.19 - chained multi-measurement queries
+Thormund - 2026.10.19 - event-driven waits after output changes
 """
 
-__all__ = ["thorlabsLaserDriver"]
+__all__ = ["thorlabsLaserDriver", "MEASURE_DTYPE"]
 
 import logging
+from time import time
+
+import numpy as np
 from usbtmc.usbtmc import Instrument
 
+from ..baseclass.batching import ask_chained
+from ..baseclass.waiting import wait_opc, wait_until
+
+# fields of one measure_all record, and the queries behind them
+MEASURE_QUERIES = {
+    "curr": "MEAS:CURR?",
+    "volt": "MEAS:VOLT?",
+    "temp": "MEAS:TEMP?",
+    "outp": "OUTP?",
+    "outp2": "OUTP2?",
+}
+MEASURE_DTYPE = np.dtype([
+    ("t", np.float64),
+    ("curr", np.float64),
+    ("volt", np.float64),
+    ("temp", np.float64),
+    ("outp", np.int8),
+    ("outp2", np.int8),
+])
+MEASURE_LINE = ";".join(MEASURE_QUERIES.values())
+
 
 class thorlabsLaserDriver(Instrument):
 
@@ -38,6 +64,82 @@ class thorlabsLaserDriver(Instrument):
         return True
         # return super().__exit__(exc_type, exc_value, exc_traceback)
 
+    #### batched queries
+
+    def ask_chained(self, commands) -> list:
+        """
+        Queries several commands in ';' chained SCPI lines, one USBTMC
+        transaction per line instead of one per command.
+        Returns a list of str replies.
+        """
+        return ask_chained(self, commands)
+
+    def _measure_into(self, record) -> None:
+        """fills a MEASURE_DTYPE record from one chained transaction"""
+        reply = self.ask(MEASURE_LINE)
+        record["t"] = time()
+        fields = reply.split(";")
+        if len(fields) != len(MEASURE_QUERIES):
+            raise ValueError(f"Unexpected reply {reply!r} to {MEASURE_LINE}")
+        for name, field in zip(MEASURE_QUERIES, fields):
+            record[name] = float(field)
+
+    def measure_all(self) -> np.void:
+        """
+        returns laser diode current (A), voltage (V), temperature (C) and the
+        ld and tec output states, measured in one transaction, as a record
+        of MEASURE_DTYPE with a timestamp t
+        """
+        record = np.zeros((), dtype=MEASURE_DTYPE)
+        self._measure_into(record)
+        return record[()]
+
+    def acquire(self, n: int) -> np.ndarray:
+        """
+        returns n consecutive measure_all records as a structured array of
+        MEASURE_DTYPE, e.g. data["curr"] is an array of n currents
+        """
+        data = np.zeros(n, dtype=MEASURE_DTYPE)
+        for record in data:
+            self._measure_into(record)
+        return data
+
+    #### waits, instead of fixed sleeps
+
+    def wait_opc(self, timeout: float = 10.) -> float:
+        """
+        waits until all pending operations have completed (*OPC?), returns
+        the time waited in seconds
+        """
+        return wait_opc(self, timeout)
+
+    def wait_outp(self, state: int = 1, timeout: float = 10.) -> float:
+        """
+        waits until the laser diode output reports state, off = 0 and on = 1,
+        returns the time waited in seconds
+        """
+        return wait_until(lambda: int(self.outp) == state, timeout,
+                          description=f"OUTP {state}")
+
+    def wait_outp2(self, state: int = 1, timeout: float = 10.) -> float:
+        """
+        waits until the tec output reports state, off = 0 and on = 1,
+        returns the time waited in seconds
+        """
+        return wait_until(lambda: int(self.outp2) == state, timeout,
+                          description=f"OUTP2 {state}")
+
+    def wait_temp(self, tolerance: float = 0.01,
+                  timeout: float = 60.) -> float:
+        """
+        waits until the temperature is within tolerance (degree celsius) of
+        its setpoint, returns the time waited in seconds
+        """
+        setpoint = float(self.sour2_temp)
+        return wait_until(
+            lambda: abs(self.meas_temp - setpoint) <= tolerance, timeout,
+            max_interval=1., description=f"temperature {setpoint} C")
+
     #### ld output control
 
     @property
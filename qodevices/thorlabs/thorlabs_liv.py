@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Light-current-voltage characterisation with a Thorlabs ITC laser driver
+
+Sweeps the laser diode current of a thorlabsLaserDriver and at each step
+reads the diode current and voltage (one chained transaction) together with
+an external optical power reading. The ITC and the power meter each get their
+own worker thread, so both reads of a step overlap instead of queueing. The
+sweep is checked against the current limit once, rather than re-querying
+SOUR:CURR:LIM? on every step, and results go into preallocated arrays.
+
+The power reading is any callable returning optical power in W, e.g.
+    power=lambda: pax.get_stokes()[0]                  # PAX Ptotal
+    power=lambda: pm.volt / (responsivity * shunt)     # qoDigitalPowerMeter
+
+Thormund - 2026.10.19 - created for routine LIV sweeps
+"""
+
+__all__ = ["livSweep", "liv_fit"]
+
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter, sleep
+
+import numpy as np
+
+from .thorlabs_laser_driver import thorlabsLaserDriver
+
+LIV_QUERIES = ("MEAS:CURR?", "MEAS:VOLT?")
+
+
+def liv_fit(current, power, voltage=None, fit_range=(0.2, 0.8)) -> dict:
+    """Fits the lasing part of an LIV curve.
+
+    A straight line is fitted to the points whose power lies within
+    fit_range of the maximum power. Its slope is the slope efficiency, and
+    its intercept with zero power the threshold current. If voltage is
+    given, the differential resistance above threshold is fitted as well.
+
+    Returns dict of threshold (A), slope_efficiency (W/A), resistance (ohm)
+    Raises ValueError if the fitted line does not rise, e.g. with the laser
+    off or with a fit_range below threshold.
+    """
+    current = np.asarray(current, dtype=float)
+    power = np.asarray(power, dtype=float)
+    low, high = np.multiply(fit_range, np.nanmax(power))
+    lasing = (power >= low) & (power <= high)
+    if np.count_nonzero(lasing) < 2:
+        raise ValueError("Too few points above threshold to fit")
+    slope, intercept = np.polyfit(current[lasing], power[lasing], 1)
+    if not slope > 0:
+        raise ValueError(f"No lasing slope to fit, {slope = }")
+    threshold = -intercept / slope
+    result = {
+        "threshold": threshold,
+        "slope_efficiency": slope,
+        "resistance": np.nan,
+    }
+    if voltage is not None:
+        above = current > threshold
+        if np.count_nonzero(above) >= 2:
+            voltage = np.asarray(voltage, dtype=float)
+            result["resistance"] = np.polyfit(
+                current[above], voltage[above], 1)[0]
+    return result
+
+
+class livSweep:
+    """LIV sweep engine over a thorlabsLaserDriver and a power reading."""
+
+    def __init__(self, itc: thorlabsLaserDriver, power, settle: float = 0.05):
+        """Generates instance of an LIV sweep.
+
+        Input
+        -----
+        itc (thorlabsLaserDriver): driver of the laser diode
+        power (callable): returns the optical power in W
+        settle (float): Optional. wait in seconds after each current step
+        """
+        self.itc = itc
+        self.power = power
+        self.settle = settle
+
+    def run(self, currents, restore: bool = True) -> dict:
+        """Runs the sweep over the given setpoints.
+
+        Input
+        -----
+        currents (array): laser diode current setpoints in amperes
+        restore (bool): Optional. return to the initial setpoint afterwards
+
+        Returns dict of numpy arrays setpoint, current (A), voltage (V),
+        power (W) and step_time (s), plus the liv_fit results if the
+        curve could be fitted
+        """
+        itc = self.itc
+        setpoints = np.asarray(currents, dtype=float)
+        limit = float(itc.sour_curr_lim)
+        if np.any(setpoints < 0) or np.any(setpoints > limit):
+            raise ValueError(
+                f"Sweep leaves the allowed range of 0 to {limit} A")
+        initial = itc.sour_curr
+
+        n = len(setpoints)
+        result = {
+            "setpoint": setpoints,
+            "current": np.full(n, np.nan),
+            "voltage": np.full(n, np.nan),
+            "power": np.full(n, np.nan),
+            "step_time": np.full(n, np.nan),
+        }
+        with ThreadPoolExecutor(1, "itc") as itc_worker, \
+                ThreadPoolExecutor(1, "power") as power_worker:
+            try:
+                for i, setpoint in enumerate(setpoints):
+                    start = perf_counter()
+                    # already checked against the cached limit
+                    itc.write(f"SOUR:CURR {setpoint}")
+                    sleep(self.settle)
+                    electrical = itc_worker.submit(itc.ask_chained, LIV_QUERIES)
+                    optical = power_worker.submit(self.power)
+                    result["current"][i], result["voltage"][i] = map(
+                        float, electrical.result())
+                    result["power"][i] = optical.result()
+                    result["step_time"][i] = perf_counter() - start
+            finally:
+                if restore:
+                    itc.write(f"SOUR:CURR {initial}")
+
+        try:
+            result.update(liv_fit(
+                result["current"], result["power"], result["voltage"]))
+        except ValueError:
+            pass  # e.g. sweep stayed below threshold
+        return result
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Revolution-synchronised sampling of a Thorlabs PAX1000 polarimeter
+
+The PAX completes one data set per waveplate revolution, and
+SENS:DATA:LAT? returns the latest completed one. Polling faster than the
+rotation returns the same data set again; polling slower skips revolutions.
+
+paxSampler polls once per revolution instead. The period starts at
+1/inp_rot_vel and is refined from the revolution counter as data comes in.
+Each fresh data set schedules the next poll slightly less than a period later,
+so the polls drift towards the completion of each revolution. A duplicate
+(repeated timestamp) means the poll was early: it is dropped and retried a
+fraction of a period later. Jumps of the revolution counter are counted as
+missed revolutions.
+
+Thormund - 2026.10.19 - created for gap-free, duplicate-free PAX logging
+"""
+
+__all__ = ["paxSampler"]
+
+from time import perf_counter, sleep, time
+
+import numpy as np
+
+from .thorlabs_PAX_driver import (DATA_FIELDS, parse_data,
+                                  thorlabsPolarimeterDriver)
+
+REV = DATA_FIELDS.index("rev")
+TIMESTAMP = DATA_FIELDS.index("timestamp")
+
+##### scheduling constants #####
+
+# fraction of a period the next poll is brought forward after fresh data
+LEAD = 0.05
+# fraction of a period to wait before polling again after a duplicate
+RETRY = 0.1
+# periods without fresh data after which the waveplate is taken as stopped
+STALL = 10
+
+
+class paxSampler:
+    """Polls a thorlabsPolarimeterDriver once per waveplate revolution."""
+
+    def __init__(self, pax: thorlabsPolarimeterDriver,
+                 velocity: float = None) -> None:
+        """Generates instance of a revolution-synchronised sampler.
+
+        Input
+        -----
+        pax (thorlabsPolarimeterDriver): driver of a rotating PAX
+        velocity (float): Optional. waveplate rotation in Hz, read with
+            inp_rot_vel by default
+        """
+        self.pax = pax
+        if velocity is None:
+            velocity = pax.inp_rot_vel
+        if velocity <= 0:
+            raise ValueError(f"Waveplate is not rotating, {velocity = } Hz")
+        self.period = 1 / velocity
+        self.polls = 0
+        self.duplicates = 0
+        self.missed = 0
+        self._last = None
+
+    def _poll(self) -> np.ndarray:
+        self.polls += 1
+        return parse_data([self.pax.sens_data_lat()])[0]
+
+    def sample(self, n: int) -> dict:
+        """Collects the next n distinct data sets.
+
+        Returns dict of data ((n, 13) array, columns as in DATA_FIELDS),
+        t (host time of arrival of each data set), and the polls,
+        duplicates and missed revolutions counted so far, together with
+        the refined period in seconds.
+        Raises TimeoutError if no new data set arrives for STALL periods.
+        """
+        data = np.empty((n, len(DATA_FIELDS)))
+        t = np.empty(n)
+        i = 0
+        first = None
+        fresh_at = next_poll = perf_counter()
+        while i < n:
+            delay = next_poll - perf_counter()
+            if delay > 0:
+                sleep(delay)
+            # schedule from the start of the poll, so that the query
+            # latency does not add to every cycle
+            now = perf_counter()
+            row = self._poll()
+
+            last = self._last
+            if last is not None and row[TIMESTAMP] == last[TIMESTAMP]:
+                self.duplicates += 1
+                if now - fresh_at > STALL * self.period:
+                    raise TimeoutError(
+                        f"No new data set for {STALL} revolutions")
+                next_poll = now + RETRY * self.period
+                continue
+
+            if last is not None:
+                self.missed += max(int(row[REV] - last[REV]) - 1, 0)
+            if first is None:
+                first = (now, row[REV])
+            elif row[REV] > first[1]:
+                self.period = (now - first[0]) / (row[REV] - first[1])
+            self._last = row
+            data[i] = row
+            t[i] = time()
+            i += 1
+            fresh_at = now
+            next_poll = now + (1 - LEAD) * self.period
+        return {
+            "data": data,
+            "t": t,
+            "polls": self.polls,
+            "duplicates": self.duplicates,
+            "missed": self.missed,
+            "period": self.period,
+        }
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Online polarisation statistics of PAX1000 data
+
+Keeps, in constant memory, the statistics of a polarisation drift study that
+would otherwise need the whole raw stream afterwards:
+- mean and covariance of Ptotal, S1, S2, S3 and DOP
+- Allan deviation of each of them at octave-spaced averaging times
+- angular drift of the polarisation state on the Poincare sphere, relative
+  to the first data set
+
+Data sets are added in chunks as they arrive, e.g. from acquire() or
+paxSampler.sample(), and every update is vectorised over the chunk. Data sets
+are taken to be equally spaced in time, as paxSampler delivers them.
+
+Thormund - 2026.10.19 - created for long polarisation drift studies
+"""
+
+__all__ = ["polarisationStatistics"]
+
+import numpy as np
+
+from ..baseclass.moments import merge_moments
+from .thorlabs_PAX_driver import DATA_FIELDS, stokes
+
+STOKES_FIELDS = ("Ptotal", "S1", "S2", "S3", "DOP")
+SPHERE = slice(1, 4)
+
+##### statistics constants #####
+
+# octaves of averaging time, tau = tau0 * 2**k for k < ALLAN_LEVELS
+ALLAN_LEVELS = 24
+
+
+class polarisationStatistics:
+    """Constant-memory statistics of a stream of PAX data sets."""
+
+    def __init__(self, tau0: float = 1., levels: int = ALLAN_LEVELS) -> None:
+        """Generates instance of an online statistics accumulator.
+
+        Input
+        -----
+        tau0 (float): Optional. time between data sets in seconds, e.g. the
+            period of a paxSampler. By default taus are in data sets.
+        levels (int): Optional. number of octave-spaced Allan taus
+        """
+        self.tau0 = tau0
+        self.levels = levels
+        self.reset()
+
+    def reset(self) -> None:
+        """forgets all statistics"""
+        width = len(STOKES_FIELDS)
+        self._count = 0
+        self._mean = np.zeros(width)
+        self._m2 = np.zeros((width, width))
+        # per octave: sum of squared differences of consecutive averages,
+        # their number, the last average and an unpaired leftover average
+        self._allan_sum = np.zeros((self.levels, width))
+        self._allan_count = np.zeros(self.levels, dtype=np.int64)
+        self._previous = [None] * self.levels
+        self._leftover = [None] * self.levels
+        self._reference = None
+        self._drift = np.nan
+        self._max_drift = 0.
+
+    ###### updates ######
+
+    def update(self, data) -> None:
+        """Adds a chunk of data sets.
+
+        Input
+        -----
+        data (array): (n, 13) PAX data sets as from acquire, or (n, 5)
+            Ptotal, S1, S2, S3, DOP as from stokes()
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        if len(data) == 0:
+            return
+        if data.shape[1] == len(DATA_FIELDS):
+            data = stokes(data)
+        elif data.shape[1] != len(STOKES_FIELDS):
+            raise ValueError(f"Unexpected data shape {data.shape}")
+        self._count = merge_moments(self._count, self._mean, self._m2, data)
+        self._update_allan(data, 0)
+        self._update_drift(data[:, SPHERE])
+
+    def _update_allan(self, values: np.ndarray, level: int) -> None:
+        # values are consecutive averages over 2**level data sets
+        if level >= self.levels or len(values) == 0:
+            return
+        previous = self._previous[level]
+        joined = values if previous is None else np.vstack((previous, values))
+        differences = np.diff(joined, axis=0)
+        self._allan_sum[level] += (differences**2).sum(axis=0)
+        self._allan_count[level] += len(differences)
+        self._previous[level] = values[-1:]
+
+        # pair consecutive averages into the averages of the next octave
+        leftover = self._leftover[level]
+        if leftover is not None:
+            values = np.vstack((leftover, values))
+        paired = len(values) // 2 * 2
+        self._leftover[level] = values[paired:] if paired < len(values) else None
+        self._update_allan(
+            (values[0:paired:2] + values[1:paired:2]) / 2, level + 1)
+
+    def _update_drift(self, sphere: np.ndarray) -> None:
+        # angles between unit Stokes vectors, insensitive to DOP changes
+        norms = np.linalg.norm(sphere, axis=1)
+        valid = norms > 0
+        if not np.any(valid):
+            return
+        units = sphere[valid] / norms[valid, None]
+        if self._reference is None:
+            self._reference = units[0]
+        angles = np.arccos(np.clip(units @ self._reference, -1, 1))
+        self._max_drift = max(self._max_drift, float(angles.max()))
+        mean = units.mean(axis=0)
+        mean /= np.linalg.norm(mean)
+        self._drift = float(np.arccos(np.clip(mean @ self._reference, -1, 1)))
+
+    ###### results ######
+
+    @property
+    def count(self) -> int:
+        """returns number of data sets seen"""
+        return self._count
+
+    def results(self) -> dict:
+        """
+        returns the current estimates:
+        count, fields (names of the columns below), mean, cov (covariance
+        matrix), std, dop_stability (std / mean of DOP),
+        taus (s) and adev (one row per tau, one column per field) for the
+        taus with at least one Allan difference, and
+        reference (unit Stokes vector of the first data set),
+        drift (rad, angle of the latest chunk mean from the reference),
+        max_drift (rad, largest angle of any data set from the reference)
+        """
+        count = self._count
+        cov = (self._m2 / (count - 1) if count > 1
+               else np.full_like(self._m2, np.nan))
+        std = np.sqrt(np.diag(cov))
+        dop = STOKES_FIELDS.index("DOP")
+        levels = np.flatnonzero(self._allan_count)
+        adev = np.sqrt(self._allan_sum[levels]
+                       / (2 * self._allan_count[levels, None]))
+        return {
+            "count": count,
+            "fields": STOKES_FIELDS,
+            "mean": self._mean.copy(),
+            "cov": cov,
+            "std": std,
+            "dop_stability": std[dop] / self._mean[dop],
+            "taus": self.tau0 * 2.**levels,
+            "adev": adev,
+            "reference": self._reference,
+            "drift": self._drift,
+            "max_drift": self._max_drift,
+        }
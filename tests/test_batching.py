@@ -0,0 +1,65 @@
+"""
+Unit tests of baseclass.batching
+"""
+from collections import deque
+
+import pytest
+
+from qodevices.baseclass.batching import ask_chained, chain, split_reply
+
+
+class fakeLine:
+    """answers each query of a ';' chained line, in one reply or, with
+    split=True, one line per query"""
+
+    def __init__(self, split: bool = False, drop: int = 0) -> None:
+        self.split = split
+        self.drop = drop
+        self.written = []
+        self.pending = deque()
+
+    def _answer(self, line: str) -> list:
+        self.written.append(line)
+        return [f"<{c}>" for c in line.split(";") if "?" in c][self.drop:]
+
+    def write(self, line: str) -> None:
+        self._answer(line)
+
+    def ask(self, line: str) -> bytes:
+        replies = self._answer(line)
+        if not self.split:
+            return ";".join(replies).encode()
+        self.pending.extend(r.encode() for r in replies[1:])
+        return replies[0].encode()
+
+    def _serial_read(self) -> bytes:
+        return self.pending.popleft() if self.pending else b""
+
+def test_chain_respects_line_length():
+    lines = chain(["AAAA?", "BBBB?", "CCCC?"], max_length=11)
+    assert lines == [["AAAA?", "BBBB?"], ["CCCC?"]]
+    with pytest.raises(ValueError):
+        chain(["TOO LONG?"], max_length=4)
+
+def test_split_reply():
+    assert split_reply(b" 1.0; 2 ;x\r\n") == ["1.0", "2", "x"]
+
+def test_ask_chained_one_round_trip_per_line():
+    device = fakeLine()
+    replies = ask_chained(device, ["TTRD?", "TIRD?", "TVRD?"])
+    assert replies == ["<TTRD?>", "<TIRD?>", "<TVRD?>"]
+    assert device.written == ["TTRD?;TIRD?;TVRD?"]
+
+def test_commands_without_query_are_written():
+    device = fakeLine()
+    assert ask_chained(device, ["TEON 1", "TEON?"]) == ["<TEON?>"]
+    assert ask_chained(device, ["TEON 0"]) == []
+    assert device.written[-1] == "TEON 0"
+
+def test_replies_on_separate_lines():
+    device = fakeLine(split=True)
+    assert ask_chained(device, ["A?", "B?"]) == ["<A?>", "<B?>"]
+
+def test_missing_reply_raises():
+    with pytest.raises(ValueError):
+        ask_chained(fakeLine(drop=1), ["A?", "B?"])
@@ -0,0 +1,80 @@
+"""
+Unit tests of baseclass.channels, on the homemade drivers' own arrays, with a
+fake pipelined transport instead of a port
+"""
+import numpy as np
+import pytest
+
+from qodevices.homemade.qo_fibre_switch_driver import qoFibreSwitchDriver
+from qodevices.homemade.qo_strain_gauge_driver import qoStrainGaugeDriver
+
+
+class fakeTransport:
+    """answers ask_many from the last values written, 0 by default"""
+
+    def __init__(self) -> None:
+        self.state = {}
+        self.transfers = []
+
+    def __del__(self):
+        pass
+
+    def ask_many(self, queries) -> list:
+        queries = list(queries)
+        self.transfers.append(queries)
+        return [str(self.state.get(q.replace('?', ''), 0)).encode()
+                for q in queries]
+
+    def write_many(self, commands) -> None:
+        commands = list(commands)
+        self.transfers.append(commands)
+        for command in commands:
+            name, channel, value = command.split()
+            self.state[f"{name} {channel}"] = value
+
+class fakeStrainGauge(fakeTransport, qoStrainGaugeDriver):
+    pass
+
+class fakeFibreSwitch(fakeTransport, qoFibreSwitchDriver):
+    pass
+
+def test_read_all_in_one_transfer():
+    device = fakeStrainGauge()
+    device.state.update({"OUT 0": 0.5, "OUT 2": -1.})
+    assert device.out[:].tolist() == [0.5, 0., -1.]
+    assert device.transfers == [['OUT? 0', 'OUT? 1', 'OUT? 2']]
+    assert device.out[2] == -1.
+    assert np.asarray(device.out).shape == (3,)
+
+def test_write_selection_and_broadcast():
+    device = fakeStrainGauge()
+    device.out[1:] = 2.
+    assert device.transfers == [['OUT 1 2.0', 'OUT 2 2.0']]
+    device.out = [1., 2., 3.]
+    assert device.out[::2].tolist() == [1., 3.]
+
+def test_indices_are_positions_not_channel_numbers():
+    device = fakeFibreSwitch()
+    device.switch[0] = 1
+    assert device.transfers == [['SWITCH 1 1']]
+    assert device.switch[[0, 2]].tolist() == [1, 0]
+
+@pytest.mark.parametrize("positions", [2, (0, 1, -1), (0.5, 1, 1)])
+def test_switch_positions_are_validated(positions):
+    device = fakeFibreSwitch()
+    with pytest.raises(ValueError):
+        device.switch[:] = positions
+    assert device.transfers == []
+
+def test_pid_constants_are_validated():
+    device = fakeStrainGauge()
+    device.constp[:] = 1.
+    with pytest.raises(ValueError):
+        device.consti[1] = 600.
+    assert device.transfers == [['CONSTP 0 1.0', 'CONSTP 1 1.0']]
+
+def test_read_only():
+    device = fakeStrainGauge()
+    with pytest.raises(AttributeError):
+        device.inp[0] = 1.
+    assert device.transfers == []
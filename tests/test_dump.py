@@ -0,0 +1,38 @@
+"""
+Unit tests of baseclass.dump on a fake USBTMC laser driver
+"""
+from qodevices.baseclass.dump import dump
+from qodevices.baseclass.usbtmc_transport import (fakeUsbtmcBackend,
+                                                  fake_instrument)
+from qodevices.thorlabs.thorlabs_laser_driver import thorlabsLaserDriver
+
+
+def fake_itc(responder):
+    backend = fakeUsbtmcBackend(responder, transfer_latency=0.,
+                                bandwidth=1e12, response_time=0.)
+    return fake_instrument(thorlabsLaserDriver, backend)
+
+READINGS = {"MEAS:CURR?": "1.000E-2", "MEAS:VOLT?": "1.5",
+            "FILT:STAT": "1"}
+
+def answer_all(command: str) -> bytes:
+    """answers every ';' chained command, as if each were a query"""
+    replies = [READINGS.get(c.strip(), "0") for c in command.split(";")]
+    return (";".join(replies) + "\n").encode()
+
+def test_command_without_question_mark_is_aligned():
+    # the filt getter asks 'FILT:STAT', which a chained line never answers
+    values = dump(fake_itc(answer_all))
+    assert values["filt"] == "1"
+    assert values["meas_curr"] == 1e-2
+    assert values["meas_volt"] == 1.5
+
+def test_missing_replies_become_errors():
+    def short(command: str) -> bytes:
+        # drops the last reply of every chained line
+        replies = answer_all(command).decode().strip().split(";")
+        return (";".join(replies[:-1] or ["x"]) + "\n").encode()
+
+    values = dump(fake_itc(short))
+    assert values
+    assert any(isinstance(value, Exception) for value in values.values())
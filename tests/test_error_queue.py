@@ -0,0 +1,87 @@
+"""
+Unit tests of baseclass.error_queue against a fake SCPI instrument
+"""
+import pytest
+
+from qodevices.baseclass.error_queue import _parse_error, deferredErrors
+
+NO_ERROR = '0,"No error"'
+
+
+class fakeScpi:
+    """
+    Instrument with an error queue and SCPI header path rules: a command
+    after ';' is relative to the path of the previous one, unless it starts
+    with ':'.
+    """
+    KNOWN = {"SOUR:VOLT", "SOUR:CURR", "OUTP"}
+
+    def __init__(self) -> None:
+        self.queue = []
+        self.replies = []
+        self.lines = []
+
+    def write(self, line: str) -> None:
+        self.lines.append(line)
+        path = ""
+        for command in line.split(";"):
+            header = command.split()[0]
+            if header.startswith(":"):
+                header = header[1:]
+            else:
+                header = path + header
+            path = header.rpartition(":")[0]
+            path = path + ":" if path else ""
+            if header == "SYST:ERR?":
+                self.replies.append(self.queue.pop(0) if self.queue
+                                    else NO_ERROR)
+            elif header not in self.KNOWN:
+                self.queue.append('-113,"Undefined header"')
+
+    def read(self) -> str:
+        replies, self.replies = self.replies, []
+        return ";".join(replies)
+
+def test_parse_error():
+    assert _parse_error('-222,"Data out of range"') == (-222,
+                                                        "Data out of range")
+    assert _parse_error(NO_ERROR)[0] == 0
+
+def test_drain_adds_no_errors_of_its_own():
+    instrument = fakeScpi()
+    with deferredErrors(instrument) as errors:
+        instrument.write("SOUR:VOLT 1")
+        assert errors.checkpoint() == []
+    assert instrument.queue == []
+    assert instrument.lines[-1].startswith("SYST:ERR?;:SYST:ERR?")
+
+def test_error_is_linked_to_its_command():
+    instrument = fakeScpi()
+    errors = deferredErrors(instrument, every=1)
+    instrument.write("SOUR:VOLT 1")
+    instrument.write("BOGUS 2")
+    instrument.write("OUTP 1")
+    assert len(errors.errors) == 1
+    error = errors.errors[0]
+    assert error["code"] == -113 and error["command"] == "BOGUS 2"
+    errors.detach()
+    assert "write" not in vars(instrument)
+
+def test_detach_is_idempotent():
+    instrument = fakeScpi()
+    with deferredErrors(instrument) as errors:
+        errors.detach()
+    errors.detach()
+    assert "write" not in vars(instrument)
+    # a wrapper installed over this one is left in place
+    errors = deferredErrors(instrument)
+    outer = deferredErrors(instrument)
+    errors.detach()
+    assert vars(instrument)["write"] == outer._recorded_write
+
+def test_raise_errors():
+    instrument = fakeScpi()
+    errors = deferredErrors(instrument, raise_errors=True)
+    instrument.write("BOGUS")
+    with pytest.raises(ValueError):
+        errors.checkpoint()
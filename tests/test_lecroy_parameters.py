@@ -0,0 +1,64 @@
+"""
+Unit tests of lecroy.parameters on simulatedDSO
+"""
+from time import sleep
+
+import numpy as np
+import pytest
+
+pytest.importorskip("lecroydso")
+
+from qodevices.lecroy.parameters import parameterPoller, STATISTICS
+from qodevices.lecroy.simulated import MEASURE_MODEL, simulatedDSO
+
+
+class countingDSO(simulatedDSO):
+    """counts the VBS queries sent"""
+    queries = 0
+
+    def query_vbs(self, message: str) -> str:
+        self.queries += 1
+        return super().query_vbs(message)
+
+@pytest.fixture
+def dso():
+    return countingDSO(samples=100, trigger_rate=1e4, latency=0., seed=1)
+
+def test_configure(dso):
+    parameterPoller(dso, {"P1": ("amplitude", "c1"),
+                          "P2": ("DELAY", "C1", "C2")})
+    assert dso._parameters["P1"]["paramengine"] == "AMPLITUDE"
+    assert dso._parameters["P2"]["source2"] == "C2"
+    assert dso._statistics
+
+def test_one_query_per_cycle(dso):
+    poller = parameterPoller(dso, {"P1": ("AMPLITUDE", "C1"),
+                                   "P3": ("RISE", "C1")})
+    dso._conn.write("TRMD NORM")
+    sleep(0.01)
+    series = poller.poll(5, clear=True)
+    assert dso.queries == 5
+    assert series["t"].shape == (5,)
+    assert set(series) == {"t", "P1", "P3"}
+    assert set(series["P1"]) == set(STATISTICS)
+    mean, sdev = MEASURE_MODEL["AMPLITUDE"]
+    values = series["P1"]["value"][~np.isnan(series["P1"]["value"])]
+    assert np.all(np.abs(values - mean) < 10 * sdev)
+    assert np.all(np.diff(series["P3"]["num"][1:]) >= 0)
+
+def test_no_data_is_nan(dso):
+    poller = parameterPoller(dso, {"P1": ("AMPLITUDE", "C1")})
+    assert np.isnan(poller.read()).sum() == len(STATISTICS)
+
+def test_values_only(dso):
+    poller = parameterPoller(dso, statistics=False)
+    poller.select("p2")
+    assert poller.columns == ("value", "status")
+    assert poller.read().shape == (1, 2)
+
+def test_invalid_parameter(dso):
+    poller = parameterPoller(dso)
+    with pytest.raises(ValueError):
+        poller.configure("P9", "AMPLITUDE", "C1")
+    with pytest.raises(ValueError):
+        poller.read()
@@ -0,0 +1,28 @@
+"""
+Unit tests of lecroy.sequence on simulatedDSO
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("lecroydso")
+
+from qodevices.lecroy.sequence import sequenceCapture
+from qodevices.lecroy.simulated import simulatedDSO
+
+
+def scope(samples: int = 200) -> simulatedDSO:
+    return simulatedDSO(samples=samples, trigger_rate=2000., latency=0.,
+                        seed=1)
+
+def test_sequence_in_one_transfer():
+    dso = scope()
+    with sequenceCapture(dso, 16) as sequence:
+        waveform = sequence.capture(timeout=2.)
+        assert waveform.segments.shape == (16, 200)
+        assert np.allclose(np.diff(waveform.trigger_times), 1 / 2000.)
+        assert waveform.volts.shape == waveform.times.shape == (16, 200)
+    assert dso.sequence == 0
+
+def test_sequence_needs_segments():
+    with pytest.raises(ValueError):
+        sequenceCapture(scope(), 1)
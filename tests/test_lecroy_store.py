@@ -0,0 +1,67 @@
+"""
+Unit tests of lecroy.store on simulatedDSO
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("lecroydso")
+
+from qodevices.lecroy.sequence import sequenceCapture
+from qodevices.lecroy.simulated import simulatedDSO
+from qodevices.lecroy.store import captureStore
+from qodevices.lecroy.waveform import waveformReader
+
+
+@pytest.fixture
+def dso():
+    dso = simulatedDSO(samples=300, trigger_rate=1e5, latency=0., seed=1)
+    dso._conn.write("TRMD SINGLE;ARM")
+    return dso
+
+def test_download_straight_into_the_file(dso, tmp_path):
+    reader = waveformReader(dso)
+    first = reader.read("C1").copy()
+    path = tmp_path / "run.lcs"
+    with captureStore.create(path, 4, first, settings={"bias": 1.2}) as store:
+        store.append(first, t=1.)
+        for _ in range(3):
+            store.download(reader, "C1")
+        with pytest.raises(ValueError):
+            store.download(reader, "C1")
+
+    store = captureStore(path)
+    assert len(store) == 4
+    assert store.metadata["settings"] == {"bias": 1.2}
+    assert store.raw.shape == (4, 300)
+    assert np.array_equal(store[0], first.raw)
+    assert np.allclose(store.volts(0), first.volts)
+    assert store.volts(slice(1, 3)).shape == (2, 300)
+    assert store.index["t"][0] == 1.
+    assert np.array_equal(store.waveform(3).raw, store[3])
+    with pytest.raises(IndexError):
+        store.waveform(4)
+    store.close()
+
+def test_records_must_match(dso, tmp_path):
+    small = waveformReader(dso).read("C1").copy()
+    store = captureStore.create(tmp_path / "run.lcs", 2, small)
+    other = simulatedDSO(samples=400, trigger_rate=1e5, latency=0.)
+    with pytest.raises(ValueError):
+        store.append(waveformReader(other).read("C1"))
+    assert len(store) == 0
+    store.close()
+
+def test_sequence_records(dso, tmp_path):
+    with sequenceCapture(dso, 5) as sequence:
+        waveform = sequence.capture(timeout=2.).copy()
+    store = captureStore.create(tmp_path / "seq.lcs", 3, waveform)
+    store.append(waveform)
+    assert store.raw.shape == (1, 5, 300)
+    assert np.allclose(store.volts(0), waveform.volts)
+    store.close()
+
+def test_not_a_store(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(bytes(4096))
+    with pytest.raises(ValueError):
+        captureStore(path)
@@ -0,0 +1,35 @@
+"""
+Unit tests of lecroy.transport discovery on a pyvisa-sim backend
+"""
+import pytest
+
+pytest.importorskip("pyvisa_sim")
+
+from qodevices.lecroy import transport
+
+
+@pytest.fixture
+def backend(tmp_path):
+    path = tmp_path / "lecroy.yaml"
+    path.write_text(transport.SIM_DEVICES)
+    backend = f"{path}@sim"
+    yield backend
+    transport.get_resource_manager(backend).close()
+    transport._resource_managers.pop(backend)
+    transport._discovered.clear()
+
+def test_only_lecroy_scopes_are_returned(backend):
+    addresses = transport.get_oscilloscope_addr(backend=backend)
+    assert sorted(addresses) == ["USB0::1535::4131::3505N05494::0::INSTR",
+                                 "USB0::1535::4131::3505N05495::0::INSTR"]
+
+def test_results_are_cached(backend):
+    first = transport.get_oscilloscope_addr(backend=backend)
+    first.clear()
+    assert transport.get_oscilloscope_addr(backend=backend)
+
+def test_benchmark_leaves_no_cache(capsys):
+    results = transport.benchmark(repeat=2)
+    assert len(results) == 3
+    assert transport._discovered == {}
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,107 @@
+"""
+Unit tests of lecroy.waveform on hand-built descriptors and simulatedDSO
+"""
+import struct
+
+import numpy as np
+import pytest
+
+pytest.importorskip("lecroydso")
+
+from pyvisa.constants import StatusCode
+
+from qodevices.lecroy.simulated import simulatedDSO
+from qodevices.lecroy.waveform import (WAVEDESC_SIZE, lecroyWaveform,
+                                       parse_descriptor, waveformReader)
+
+
+def payload(samples, order: str = "<", gain: float = 0.5,
+            offset: float = 1., interval: float = 1e-9,
+            horiz_offset: float = -2e-9) -> bytes:
+    """WF? ALL payload of int16 samples, with the given byte order"""
+    samples = np.asarray(samples, dtype=np.dtype("i2").newbyteorder(order))
+    desc = bytearray(WAVEDESC_SIZE)
+    struct.pack_into(order + "hh", desc, 32, 1, order == "<")
+    struct.pack_into(order + "7l", desc, 36, WAVEDESC_SIZE, 0, 0, 0, 0, 0,
+                     samples.nbytes)
+    struct.pack_into(order + "l", desc, 116, len(samples))
+    struct.pack_into(order + "ff", desc, 156, gain, offset)
+    struct.pack_into(order + "f", desc, 176, interval)
+    struct.pack_into(order + "d", desc, 180, horiz_offset)
+    return bytes(desc) + samples.tobytes()
+
+@pytest.mark.parametrize("order", ["<", ">"])
+def test_parse_descriptor(order):
+    descriptor = parse_descriptor(payload([1, 2, 3], order))
+    assert descriptor["byte_order"] == order
+    assert descriptor["comm_type"] == 1
+    assert descriptor["wave_array_1"] == 6
+    assert descriptor["wave_array_count"] == 3
+    assert descriptor["vertical_gain"] == 0.5
+    assert descriptor["horiz_offset"] == -2e-9
+    assert descriptor["data_offset"] == WAVEDESC_SIZE
+
+@pytest.mark.parametrize("order", ["<", ">"])
+def test_waveform_views_and_scaling(order):
+    block = np.frombuffer(payload([-2, 0, 4], order), dtype=np.uint8)
+    waveform = lecroyWaveform(block, parse_descriptor(block))
+    assert waveform.raw.tolist() == [-2, 0, 4]
+    assert np.shares_memory(waveform.raw, block)
+    assert np.allclose(waveform.volts, [-2., -1., 1.])
+    assert np.allclose(waveform.times, [-2e-9, -1e-9, 0.])
+    assert not np.shares_memory(waveform.copy().raw, block)
+
+@pytest.fixture
+def dso():
+    dso = simulatedDSO(samples=500, trigger_rate=1e5, latency=0., seed=1)
+    dso._conn.write("TRMD SINGLE;ARM")
+    return dso
+
+@pytest.mark.parametrize("fmt", ["BYTE", "WORD"])
+def test_read_from_simulated_scope(dso, fmt):
+    waveform = waveformReader(dso, fmt).read("C1")
+    assert len(waveform) == 500
+    assert waveform.raw.dtype.itemsize == (2 if fmt == "WORD" else 1)
+    assert 0.5 < waveform.volts.max() < 0.7
+
+def test_read_into_out(dso):
+    reader = waveformReader(dso)
+    out = np.zeros(2000, dtype=np.uint8)
+    waveform = reader.read("C1", out=out)
+    assert np.shares_memory(waveform.raw, out)
+    assert np.array_equal(waveform.raw, reader.read("C1").raw)
+
+def test_out_too_small_keeps_link_in_step(dso):
+    reader = waveformReader(dso)
+    with pytest.raises(ValueError):
+        reader.read("C1", out=np.zeros(10, dtype=np.uint8))
+    assert dso._conn.query("*IDN?").startswith("LECROY")
+    assert len(reader.read("C1")) == 500
+
+def test_unknown_source(dso):
+    with pytest.raises(ValueError):
+        waveformReader(dso).read("X9")
+
+class scriptedVisa:
+    """visalib returning scripted (data, status) reads, failing when the
+    script runs out as a read past the END would time out"""
+
+    def __init__(self, *reads) -> None:
+        self.reads = list(reads)
+
+    def read(self, session, count):
+        if not self.reads:
+            raise TimeoutError("read past the end of the message")
+        return self.reads.pop(0)
+
+def test_short_reply_without_block_fails_at_once(dso):
+    visalib = scriptedVisa((b"CMR 1\n", StatusCode.success))
+    with pytest.raises(ValueError, match="No block header"):
+        waveformReader(dso)._read_header(visalib, 0)
+
+def test_header_split_over_reads(dso):
+    more = StatusCode.success_max_count_read
+    visalib = scriptedVisa((b"C1:WF ALL,#", more), (b"9000000", more),
+                           (b"012abc", more))
+    length, data, _ = waveformReader(dso)._read_header(visalib, 0)
+    assert (length, bytes(data)) == (12, b"abc")
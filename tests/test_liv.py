@@ -0,0 +1,52 @@
+"""
+Unit tests of thorlabs.thorlabs_liv on synthetic L-I-V curves
+"""
+import numpy as np
+import pytest
+
+from qodevices.thorlabs.thorlabs_liv import liv_fit, livSweep
+
+
+def curve(current):
+    """30 mA threshold, 0.5 W/A above it, 1.2 V plus 4 ohm"""
+    power = 0.5 * np.clip(current - 0.03, 0, None)
+    return power, 1.2 + 4. * current
+
+def test_fit_recovers_threshold_and_slope():
+    current = np.linspace(0, 0.1, 51)
+    power, voltage = curve(current)
+    result = liv_fit(current, power, voltage)
+    assert result["threshold"] == pytest.approx(0.03)
+    assert result["slope_efficiency"] == pytest.approx(0.5)
+    assert result["resistance"] == pytest.approx(4.)
+
+@pytest.mark.parametrize("power", [np.zeros(51),             # laser off
+                                   np.linspace(2e-3, 1e-3, 51)])  # falling
+def test_no_lasing_slope_is_rejected(power):
+    with pytest.raises(ValueError):
+        liv_fit(np.linspace(0, 0.1, 51), power)
+
+class fakeITC:
+    """laser on a synthetic curve, answers the chained measurement"""
+    sour_curr_lim = "0.1"
+    sour_curr = 0.02
+
+    def __init__(self) -> None:
+        self.setpoint = self.sour_curr
+
+    def write(self, command: str) -> None:
+        self.setpoint = float(command.split()[1])
+
+    def ask_chained(self, queries) -> list:
+        return [str(self.setpoint), str(curve(self.setpoint)[1])]
+
+def test_sweep_fits_and_restores():
+    itc = fakeITC()
+    sweep = livSweep(itc, lambda: curve(itc.setpoint)[0], settle=0)
+    result = sweep.run(np.linspace(0, 0.1, 21))
+    assert itc.setpoint == 0.02
+    assert result["threshold"] == pytest.approx(0.03)
+
+def test_sweep_beyond_limit():
+    with pytest.raises(ValueError):
+        livSweep(fakeITC(), lambda: 0., settle=0).run([0.2])
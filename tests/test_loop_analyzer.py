@@ -0,0 +1,82 @@
+"""
+Unit tests of homemade.qo_loop_analyzer
+"""
+from time import sleep
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from qodevices.baseclass.ringbuffer import ringBuffer
+from qodevices.homemade.qo_loop_analyzer import loopAnalyzer
+from qodevices.homemade.qo_strain_gauge_acquisition import COLUMNS
+
+
+def errors(n: int = 20000, fs: float = 1000., seed: int = 0) -> np.ndarray:
+    """noise on channel 0, noise plus a 125 Hz oscillation on channel 1"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / fs
+    noise = rng.normal(0, 0.01, (n, 2))
+    noise[:, 1] += 0.1 * np.sin(2 * np.pi * 125. * t)
+    return noise + [0.5, -0.2]
+
+def test_chunked_moments_match_numpy():
+    data = errors()
+    analyzer = loopAnalyzer(1000.)
+    for chunk in np.array_split(data, [7, 500, 501, 9000]):
+        analyzer.update(chunk)
+    results = analyzer.results()
+    assert results["count"] == len(data)
+    assert np.allclose(results["mean"], data.mean(axis=0))
+    assert np.allclose(results["std"], data.std(axis=0))
+    assert np.allclose(results["rms"], np.sqrt((data**2).mean(axis=0)))
+    assert np.allclose(results["p2p"], np.ptp(data, axis=0))
+
+def test_oscillation_is_flagged_at_its_frequency():
+    flagged = []
+    analyzer = loopAnalyzer(1000., on_peak=flagged.append)
+    analyzer.update(errors())
+    results = analyzer.results()
+    df = results["freqs"][1]
+    # Parseval: the density integrates to the variance of the signal
+    variance = results["psd"].sum(axis=1) * df
+    assert np.allclose(variance, errors().std(axis=0)**2, rtol=0.1)
+    assert [peak["channel"] for peak in flagged] == [1]
+    assert abs(flagged[0]["frequency"] - 125.) <= df
+    assert len(results["active"][0]) == 0
+
+def test_follow_reads_the_ring_buffer():
+    buffer = ringBuffer(4096, len(COLUMNS))
+    analyzer = loopAnalyzer(1000.)
+    analyzer.follow(SimpleNamespace(buffer=buffer), interval=0.001)
+    # the thread starts reading from the count it sees first
+    sleep(0.05)
+    data = errors(2000)
+    for row in data:
+        buffer.append((0., 0., 0., *row))
+    for _ in range(1000):
+        if analyzer.count >= len(data):
+            break
+        sleep(0.005)
+    analyzer.stop()
+    assert analyzer.dropped == 0
+    assert np.allclose(analyzer.results()["mean"], data.mean(axis=0))
+
+def test_dropped_before_follow():
+    assert loopAnalyzer(1000.).dropped == 0
+
+class failingBuffer:
+    count = 0
+
+    def read_since(self, position):
+        raise OSError("port closed")
+
+def test_follow_keeps_the_exception():
+    analyzer = loopAnalyzer(1000.)
+    analyzer.follow(SimpleNamespace(buffer=failingBuffer()), interval=0.001)
+    analyzer._thread.join(timeout=5)
+    assert isinstance(analyzer.exception, OSError)
+    with pytest.raises(OSError, match="port closed"):
+        analyzer.stop()
+    assert analyzer.exception is None
+    analyzer.stop()
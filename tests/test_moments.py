@@ -0,0 +1,29 @@
+"""
+Unit tests of baseclass.moments against numpy on the whole data
+"""
+import numpy as np
+
+from qodevices.baseclass.moments import merge_moments
+
+
+def _chunks(values, sizes):
+    start = 0
+    for size in sizes:
+        yield values[start:start + size]
+        start += size
+
+def test_variances_match_numpy():
+    values = np.random.default_rng(0).normal(5., 2., (100, 3))
+    count, mean, m2 = 0, np.zeros(3), np.zeros(3)
+    for chunk in _chunks(values, (1, 30, 9, 60)):
+        count = merge_moments(count, mean, m2, chunk)
+    assert count == 100
+    assert np.allclose(mean, values.mean(axis=0))
+    assert np.allclose(m2 / count, values.var(axis=0))
+
+def test_covariance_matches_numpy():
+    values = np.random.default_rng(1).normal(size=(50, 4))
+    count, mean, m2 = 0, np.zeros(4), np.zeros((4, 4))
+    for chunk in _chunks(values, (25, 1, 24)):
+        count = merge_moments(count, mean, m2, chunk)
+    assert np.allclose(m2 / (count - 1), np.cov(values.T))
@@ -0,0 +1,40 @@
+"""
+Unit tests of the vectorised PAX data parsing
+"""
+import numpy as np
+import pytest
+
+from qodevices.thorlabs.thorlabs_PAX_driver import (DATA_FIELDS, parse_data,
+                                                    stokes)
+
+
+def data_set(theta: float, eta: float, dop: float = 0.98,
+             ptotal: float = 1e-3) -> str:
+    values = dict.fromkeys(DATA_FIELDS, 0.)
+    values.update(theta=theta, eta=eta, DOP=dop, Ptotal=ptotal)
+    fields = (repr(float(values[field])) for field in DATA_FIELDS)
+    return ",".join(fields) + "\n"
+
+def test_parse_data():
+    data = parse_data([data_set(0.1, 0.2), data_set(0.3, 0.4)])
+    assert data.shape == (2, len(DATA_FIELDS))
+    assert data[1, DATA_FIELDS.index("eta")] == 0.4
+
+def test_parse_data_rejects_short_sets():
+    with pytest.raises(ValueError):
+        parse_data([data_set(0.1, 0.2), "1,2,3"])
+
+def test_stokes_on_the_sphere():
+    theta = np.linspace(-np.pi / 2, np.pi / 2, 7)
+    eta = np.linspace(-np.pi / 4, np.pi / 4, 7)
+    data = parse_data([data_set(t, e) for t, e in zip(theta, eta)])
+    result = stokes(data)
+    assert result.shape == (7, 5)
+    assert np.allclose(np.linalg.norm(result[:, 1:4], axis=1), 1.)
+    assert np.allclose(result[:, 0], 1e-3) and np.allclose(result[:, 4], 0.98)
+    # horizontal linear polarisation and right circular polarisation
+    assert np.allclose(stokes(parse_data([data_set(0., 0.)]))[0, 1:4],
+                       [1, 0, 0])
+    assert np.allclose(stokes(data[3])[1:4], [1, 0, 0])
+    assert np.allclose(stokes(parse_data([data_set(0., np.pi / 4)]))[0, 3],
+                       1.)
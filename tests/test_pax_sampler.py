@@ -0,0 +1,65 @@
+"""
+Unit tests of thorlabs.thorlabs_pax_sampler with fake rotating polarimeters
+"""
+from time import perf_counter
+
+import numpy as np
+import pytest
+
+from qodevices.thorlabs.thorlabs_PAX_driver import DATA_FIELDS
+from qodevices.thorlabs.thorlabs_pax_sampler import paxSampler
+
+REV = DATA_FIELDS.index("rev")
+TIMESTAMP = DATA_FIELDS.index("timestamp")
+
+def data_set(rev: int) -> str:
+    values = dict.fromkeys(DATA_FIELDS, 0.)
+    values.update(rev=rev, timestamp=rev * 10.)
+    return ",".join(repr(float(values[field])) for field in DATA_FIELDS)
+
+class scriptedPAX:
+    """returns the data sets of a list of revolution numbers in turn,
+    repeating the last one"""
+
+    def __init__(self, revs, inp_rot_vel: float = 1e4) -> None:
+        self.revs = list(revs)
+        self.inp_rot_vel = inp_rot_vel
+
+    def sens_data_lat(self) -> str:
+        rev = self.revs.pop(0) if len(self.revs) > 1 else self.revs[0]
+        return data_set(rev)
+
+class rotatingPAX:
+    """completes one data set per revolution of a waveplate at velocity"""
+
+    def __init__(self, velocity: float = 200.) -> None:
+        self.inp_rot_vel = velocity
+        self.start = perf_counter()
+
+    def sens_data_lat(self) -> str:
+        return data_set(int((perf_counter() - self.start) * self.inp_rot_vel))
+
+def test_duplicates_are_dropped_and_gaps_counted():
+    sampler = paxSampler(scriptedPAX([1, 1, 2, 2, 5, 6]))
+    result = sampler.sample(4)
+    assert result["data"][:, REV].tolist() == [1, 2, 5, 6]
+    assert (result["polls"], result["duplicates"], result["missed"]) == (6, 2,
+                                                                         2)
+
+def test_sampling_follows_the_waveplate():
+    sampler = paxSampler(rotatingPAX(200.))
+    result = sampler.sample(20)
+    revs = result["data"][:, REV]
+    assert np.all(np.diff(revs) >= 1)
+    assert result["missed"] == revs[-1] - revs[0] - 19
+    assert result["period"] == pytest.approx(1 / 200., rel=0.2)
+    # about one poll per revolution, not a busy loop
+    assert result["polls"] < 3 * 20
+
+def test_stalled_waveplate():
+    with pytest.raises(TimeoutError):
+        paxSampler(scriptedPAX([3])).sample(2)
+
+def test_waveplate_not_rotating():
+    with pytest.raises(ValueError):
+        paxSampler(scriptedPAX([1], inp_rot_vel=0.))
@@ -0,0 +1,58 @@
+"""
+Unit tests of thorlabs.thorlabs_pax_statistics
+"""
+import numpy as np
+
+from qodevices.thorlabs.thorlabs_pax_statistics import polarisationStatistics
+
+
+def stream(n: int = 1000, seed: int = 0) -> np.ndarray:
+    """(n, 5) Ptotal, S1, S2, S3, DOP with a slowly drifting state"""
+    rng = np.random.default_rng(seed)
+    angle = np.cumsum(rng.normal(0, 1e-3, n))
+    return np.column_stack((
+        1e-3 + rng.normal(0, 1e-5, n),
+        np.cos(angle), np.sin(angle), np.zeros(n),
+        0.99 + rng.normal(0, 1e-3, n)))
+
+def chunked(data: np.ndarray, seed: int = 1, **kwargs):
+    rng = np.random.default_rng(seed)
+    statistics = polarisationStatistics(**kwargs)
+    start = 0
+    while start < len(data):
+        stop = start + int(rng.integers(1, 50))
+        statistics.update(data[start:stop])
+        start = stop
+    return statistics.results()
+
+def test_moments_match_numpy():
+    data = stream()
+    results = chunked(data)
+    assert results["count"] == len(data)
+    assert np.allclose(results["mean"], data.mean(axis=0))
+    assert np.allclose(results["cov"], np.cov(data, rowvar=False))
+
+def test_allan_deviation_matches_direct_computation():
+    data = stream()
+    results = chunked(data, tau0=0.5)
+    # 1000 data sets give Allan differences up to averages of 256 sets
+    for row, tau in zip(results["adev"], results["taus"]):
+        m = int(tau / 0.5)
+        averages = data[:len(data) // m * m].reshape(-1, m, 5).mean(axis=1)
+        expected = np.sqrt((np.diff(averages, axis=0)**2).mean(axis=0) / 2)
+        assert np.allclose(row, expected)
+    assert results["taus"][0] == 0.5 and results["taus"][-1] == 128.
+
+def test_drift_from_first_state():
+    data = stream()
+    results = chunked(data)
+    assert np.allclose(results["reference"], data[0, 1:4])
+    angles = np.arccos(np.clip(data[:, 1:4] @ data[0, 1:4], -1, 1))
+    assert np.isclose(results["max_drift"], angles.max())
+
+def test_single_data_set_has_no_spread():
+    statistics = polarisationStatistics()
+    statistics.update(stream(1))
+    results = statistics.results()
+    assert np.isnan(results["cov"]).all()
+    assert len(results["adev"]) == 0
@@ -0,0 +1,67 @@
+"""
+Unit tests of control.polarisation_lock with a linear fake plant
+"""
+import numpy as np
+import pytest
+
+from qodevices.control.polarisation_lock import polarisationController
+from qodevices.thorlabs.thorlabs_PAX_driver import DATA_FIELDS
+
+THETA, ETA = DATA_FIELDS.index("theta"), DATA_FIELDS.index("eta")
+
+# Stokes vector at zero volt and its change per volt of outputs 0 and 1
+SOURCE = np.array([0., 0., 1.])
+RESPONSE = np.array([[0.5, 0.], [0., 0.5], [0., 0.]])
+
+class linearPlant:
+    """
+    fake strain gauge and PAX in one, the PAX sees the direction of
+    SOURCE + RESPONSE @ out
+    """
+
+    def __init__(self) -> None:
+        self.out = np.zeros(2)
+
+    def state(self) -> np.ndarray:
+        s = SOURCE + RESPONSE @ self.out
+        return s / np.linalg.norm(s)
+
+    def acquire(self, n: int) -> np.ndarray:
+        s = self.state()
+        data = np.zeros((n, len(DATA_FIELDS)))
+        data[:, THETA] = np.arctan2(s[1], s[0]) / 2
+        data[:, ETA] = np.arcsin(s[2]) / 2
+        return data
+
+def controller(plant, **kwargs):
+    return polarisationController(plant, plant, (1, 1, 1), settle=0.,
+                                  **kwargs)
+
+def test_jacobian_of_linear_plant():
+    plant = linearPlant()
+    jacobian = controller(plant, dither=1e-5).estimate_jacobian()
+    # the direction changes as RESPONSE where it is perpendicular to SOURCE
+    assert np.allclose(jacobian, RESPONSE, atol=1e-4)
+    assert plant.out.tolist() == [0., 0.]
+
+def test_loop_reaches_target():
+    plant = linearPlant()
+    table = controller(plant).run(50, tolerance=1e-3)
+    assert table["error"][-1] < 1e-3
+    assert np.allclose(plant.state(), np.ones(3) / np.sqrt(3), atol=1e-3)
+
+def test_dither_at_a_limit_goes_the_other_way():
+    plant = linearPlant()
+    jacobian = controller(plant, dither=1e-5,
+                          limits=(-1., 0.)).estimate_jacobian()
+    assert np.allclose(jacobian, RESPONSE, atol=1e-4)
+
+def test_no_room_to_dither():
+    with pytest.raises(ValueError):
+        controller(linearPlant(), limits=(0., 0.))
+    plant = linearPlant()
+    lock = controller(plant)
+    lock.limits = (0., 0.)
+    with pytest.raises(ValueError):
+        lock.estimate_jacobian()
+    assert np.all(np.isfinite(plant.out))
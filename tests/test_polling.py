@@ -0,0 +1,48 @@
+"""
+Unit tests of baseclass.polling with plain Python stand-ins for devices
+"""
+import numpy as np
+
+from qodevices.baseclass.polling import pollingManager
+
+
+class counter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def measure_all(self) -> dict:
+        self.count += 1
+        return {"count": self.count, "current": 0.5}
+
+def test_columns_are_aligned_and_typed():
+    devices = {"a": counter(),
+               "b": (counter(), lambda device: "ON"),
+               "c": (counter(), lambda device: (1, None))}
+    with pollingManager(devices) as manager:
+        table = manager.run(3)
+    assert table["a.count"].tolist() == [1., 2., 3.]
+    assert table["a.current"].dtype == float
+    assert table["b"].tolist() == ["ON"] * 3 and table["b"].dtype.kind == "U"
+    assert table["c.1"].dtype == object
+    assert table["slowest"].dtype.kind == "U"
+    assert np.all(table["latency"] >= table["read_time.a"])
+
+def test_no_cycles():
+    with pollingManager({"a": counter()}) as manager:
+        assert manager.run(0) == {}
+
+class changing(counter):
+    """reports an extra key in the second cycle only"""
+
+    def measure_all(self) -> dict:
+        reading = super().measure_all()
+        if self.count == 2:
+            reading["fault"] = "OVERTEMP"
+        return reading
+
+def test_changing_keys_are_filled_with_nan():
+    with pollingManager({"a": changing()}) as manager:
+        table = manager.run(3)
+    assert table["a.count"].tolist() == [1., 2., 3.]
+    fault = table["a.fault"].tolist()
+    assert fault[1] == "OVERTEMP" and np.isnan(fault[0]) and np.isnan(fault[2])
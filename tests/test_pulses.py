@@ -0,0 +1,67 @@
+"""
+Unit tests of lecroy.pulses
+"""
+import numpy as np
+import pytest
+
+from qodevices.lecroy.pulses import (analyse_pulses, arrival_histogram,
+                                     pulseAnalyser)
+
+
+def square(n: int = 3, samples: int = 100, start: int = 40,
+           width: int = 20) -> np.ndarray:
+    segments = np.zeros((n, samples))
+    segments[:, start:start + width] = 1.
+    return segments
+
+def test_square_pulse():
+    results = analyse_pulses(square(), 0.5, interval=1e-9, t0=-5e-8)
+    assert results["found"].all()
+    assert results["crossings"].tolist() == [1, 1, 1]
+    # interpolated half way between samples 39 and 40, and 59 and 60
+    assert np.allclose(results["arrival"], -5e-8 + 39.5e-9)
+    assert np.allclose(results["width"], 20e-9)
+    assert np.allclose(results["amplitude"], 1.)
+    assert np.allclose(results["area"], 20e-9)
+
+def test_negative_pulse_in_codes():
+    results = analyse_pulses(-1000 * square(), 0.5, gain=1e-3, polarity=-1)
+    assert results["found"].all()
+    assert np.allclose(results["amplitude"], 1.)
+
+def test_no_pulse():
+    results = analyse_pulses(np.zeros((2, 50)), 0.5)
+    assert not results["found"].any()
+    assert np.isnan(results["arrival"]).all()
+    assert np.isnan(results["width"]).all()
+    assert np.isnan(results["peak_time"]).all()
+    assert results["area"].tolist() == [0., 0.]
+
+@pytest.mark.parametrize("samples", [0, 1])
+def test_segments_too_short_for_edges(samples):
+    results = analyse_pulses(np.ones((2, samples)), 0.5)
+    assert not results["found"].any()
+    assert np.isnan(results["arrival"]).all()
+
+def test_empty_gate():
+    results = analyse_pulses(square(), 0.5, gate=(60, 60))
+    assert results["found"].all()
+    assert np.isnan(results["area"]).all()
+
+def test_arrival_histogram_skips_missing():
+    segments = np.concatenate((square(2), np.zeros((1, 100))))
+    counts, _ = arrival_histogram(analyse_pulses(segments, 0.5), bins=4)
+    assert counts.sum() == 2
+
+def test_process_pool_matches_in_process():
+    rng = np.random.default_rng(1)
+    segments = (1000 * square(50) + rng.normal(0, 50, (50, 100))) \
+        .astype(np.int16)
+    expected = analyse_pulses(segments, 500)
+    with pulseAnalyser(100, 64, 500, chunk=16, workers=2) as analyser:
+        results = analyser.analyse(segments)
+        assert np.array_equal(results["arrival"], expected["arrival"],
+                              equal_nan=True)
+        assert np.array_equal(results["area"], expected["area"])
+        with pytest.raises(ValueError):
+            analyser.analyse(np.zeros((65, 100)))
@@ -0,0 +1,48 @@
+"""
+Unit tests of baseclass.ringbuffer
+"""
+import numpy as np
+import pytest
+
+from qodevices.baseclass.ringbuffer import ringBuffer
+
+
+def filled(size: int, rows: int) -> ringBuffer:
+    buffer = ringBuffer(size, 2)
+    for i in range(rows):
+        buffer.append((i, i))
+    return buffer
+
+def test_snapshot_before_wrap():
+    buffer = filled(4, 2)
+    assert len(buffer) == 2
+    assert buffer.snapshot().tolist() == [[0, 0], [1, 1]]
+
+def test_row_being_written_is_not_readable():
+    buffer = filled(4, 10)
+    # the writer is half way through the next row, the oldest in memory
+    buffer.slot()[0] = 99
+    rows = buffer.snapshot()
+    assert rows[:, 0].tolist() == [7, 8, 9]
+    assert np.array_equal(rows[:, 0], rows[:, 1])
+    older, newer = buffer.views()
+    assert np.concatenate((older, newer))[:, 0].tolist() == [7, 8, 9]
+
+def test_views_without_copy():
+    buffer = filled(4, 6)
+    older, newer = buffer.views(2)
+    assert np.shares_memory(older, buffer._data)
+    assert np.concatenate((older, newer))[:, 0].tolist() == [4, 5]
+
+def test_read_since_streams_and_skips_overwritten():
+    buffer = filled(4, 2)
+    rows, count = buffer.read_since(0)
+    assert rows[:, 0].tolist() == [0, 1] and count == 2
+    for i in range(2, 12):
+        buffer.append((i, i))
+    rows, count = buffer.read_since(count)
+    assert rows[:, 0].tolist() == [9, 10, 11] and count == 12
+
+def test_too_small():
+    with pytest.raises(ValueError):
+        ringBuffer(1, 2)
@@ -0,0 +1,67 @@
+"""
+Unit tests of srs.srs_autotune with scripted fake LDC units
+"""
+import pytest
+
+from qodevices.srs.srs_autotune import srsAutotuner
+
+
+class fakeLDC:
+    """reports TUNE? from a script, repeating the last status"""
+
+    def __init__(self, statuses, gains=("1.5", "0.25", "0")) -> None:
+        self.statuses = list(statuses)
+        self.gains = gains
+        self.commands = []
+
+    @property
+    def tune(self) -> int:
+        status = self.statuses.pop(0) if len(self.statuses) > 1 \
+            else self.statuses[0]
+        if isinstance(status, Exception):
+            raise status
+        return status
+
+    @tune.setter
+    def tune(self, value: int) -> None:
+        self.commands.append(f"TUNE {value}")
+
+    @property
+    def tats(self):
+        return None
+
+    @tats.setter
+    def tats(self, value: float) -> None:
+        self.commands.append(f"TATS {value}")
+
+    def ask_chained(self, queries) -> list:
+        self.commands.append(";".join(queries))
+        return list(self.gains)
+
+def tuner(**kwargs) -> srsAutotuner:
+    return srsAutotuner(min_interval=1e-3, max_interval=5e-3, **kwargs)
+
+def test_units_tune_side_by_side():
+    autotuner = tuner()
+    slow = fakeLDC([0, 1, 1, 1, 1, 3])
+    fast = fakeLDC([1, 4], gains=("2", "0", "0"))
+    futures = [autotuner.submit(slow, step=0.1, name="slow"),
+               autotuner.submit(fast, name="fast")]
+    records = [future.result(timeout=5) for future in futures]
+    assert [r["outcome"] for r in records] == ["success", "failed"]
+    assert records[0]["tpgn"] == 1.5 and records[1]["tpgn"] == 2.
+    assert records[0]["polls"] == 6
+    assert slow.commands == ["TATS 0.1", "TUNE 1", "TPGN?;TIGN?;TDGN?"]
+    # the faster unit finished first
+    assert [r["name"] for r in autotuner.wait(5)] == ["fast", "slow"]
+
+def test_timeout_stops_the_tune():
+    unit = fakeLDC([1])
+    record = tuner(timeout=0.02).submit(unit).result(timeout=5)
+    assert record["outcome"] == "timeout"
+    assert unit.commands[-2] == "TUNE 0"
+
+def test_poll_error_is_set_on_the_future():
+    future = tuner().submit(fakeLDC([1, OSError("port closed")]))
+    with pytest.raises(OSError):
+        future.result(timeout=5)
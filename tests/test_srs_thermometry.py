@@ -0,0 +1,34 @@
+"""
+Unit tests of the host-side SRS thermistor conversion
+"""
+import numpy as np
+import pytest
+
+from qodevices.srs.srs_thermometry import srsThermometry
+
+BETA = {'tmdn': 0, 'tsha': 0, 'tshb': 0, 'tshc': 0,
+        'tntb': 3950, 'tntr': 10, 'tntt': 25}
+
+def test_beta_model():
+    thermometry = srsThermometry(BETA)
+    kelvin = np.array([[273.15, 298.15], [313.15, 353.15]])
+    resistance = 10e3 * np.exp(3950 * (1 / kelvin - 1 / 298.15))
+    celsius = thermometry.resistance_to_celsius(resistance)
+    assert celsius.shape == (2, 2)
+    assert np.allclose(celsius, kelvin - 273.15)
+    assert np.isclose(thermometry.raw_to_celsius(10.), 25.)
+
+def test_steinhart_hart_model():
+    # coefficients as the LDC reports them, in units of 1e-3, 1e-4, 1e-7
+    coefficients = {**BETA, 'tmdn': '1', 'tsha': '1.129241',
+                    'tshb': '2.341077', 'tshc': '0.8775468'}
+    thermometry = srsThermometry(coefficients)
+    log_r = np.log(10e3)
+    expected = 1 / (1.129241e-3 + 2.341077e-4 * log_r
+                    + 0.8775468e-7 * log_r**3) - 273.15
+    assert np.isclose(thermometry.resistance_to_celsius(10e3), expected)
+    assert abs(expected - 25.) < 0.1
+
+def test_unsupported_model():
+    with pytest.raises(ValueError):
+        srsThermometry({**BETA, 'tmdn': 2})
@@ -0,0 +1,66 @@
+"""
+Unit tests of homemade.qo_strain_gauge_acquisition on a fake serial line
+"""
+from collections import deque
+from time import sleep
+
+import pytest
+from serial import SerialException
+
+from qodevices.homemade.qo_strain_gauge_acquisition import \
+    strainGaugeAcquisition
+from qodevices.homemade.qo_strain_gauge_driver import qoStrainGaugeDriver
+
+
+class fakeStrainGauge(qoStrainGaugeDriver):
+    """answers ALLIN? and ERR? without a serial port, fails after fail_after
+    writes if given"""
+
+    def __init__(self, fail_after: int = None) -> None:
+        self.lines = deque()
+        self.writes = 0
+        self.fail_after = fail_after
+
+    def __del__(self):
+        pass
+
+    def write_raw(self, data: bytes) -> None:
+        self.writes += 1
+        if self.fail_after is not None and self.writes > self.fail_after:
+            raise SerialException("device disconnected")
+        for command in data.decode().split("\n"):
+            if command == "ALLIN?":
+                self.lines.append(b"0.5 0.25")
+            elif command.startswith("ERR?"):
+                self.lines.append(b"0.125")
+
+    def _serial_read(self) -> bytes:
+        return self.lines.popleft() if self.lines else b""
+
+    def reset_input_buffer(self) -> None:
+        self.lines.clear()
+
+def wait_stopped(acquisition, timeout: float = 5.) -> None:
+    for _ in range(int(timeout / 0.01)):
+        if not acquisition.running:
+            return
+        sleep(0.01)
+
+def test_samples_land_in_buffer():
+    acquisition = strainGaugeAcquisition(fakeStrainGauge(), size=64)
+    acquisition.start()
+    while acquisition.buffer.count < 10:
+        sleep(0.001)
+    acquisition.stop()
+    rows = acquisition.snapshot()
+    assert rows[:, 1:].tolist()[0] == [0.5, 0.25, 0.125, 0.125]
+
+def test_serial_failure_stops_and_is_raised():
+    acquisition = strainGaugeAcquisition(fakeStrainGauge(fail_after=5))
+    acquisition.start()
+    wait_stopped(acquisition)
+    assert not acquisition.running
+    assert isinstance(acquisition.exception, SerialException)
+    with pytest.raises(SerialException):
+        acquisition.stop()
+    assert acquisition.exception is None
@@ -0,0 +1,54 @@
+"""
+Unit tests of homemade.qo_strain_gauge_driver.play_waveform without a port
+"""
+import numpy as np
+import pytest
+
+from qodevices.homemade.qo_strain_gauge_driver import qoStrainGaugeDriver
+
+
+class recordingStrainGauge(qoStrainGaugeDriver):
+    """keeps the written bytes instead of sending them"""
+
+    def __init__(self) -> None:
+        self.written = b""
+
+    def __del__(self):
+        pass
+
+    def write_raw(self, data: bytes) -> None:
+        self.written += data
+
+    def flush(self) -> None:
+        pass
+
+def test_single_channel_1d():
+    device = recordingStrainGauge()
+    result = device.play_waveform(1, [0.1, 0.2], rate=1e4)
+    assert result["samples"] == 2
+    assert device.written == b"OUT 1 0.100000\nOUT 1 0.200000\n"
+
+def test_channels_are_columns():
+    device = recordingStrainGauge()
+    device.play_waveform([0, 2], [[0.1, 1.], [0.2, 2.]], rate=1e4)
+    assert device.written.decode().split("\n")[:4] == [
+        "OUT 0 0.100000", "OUT 2 1.000000", "OUT 0 0.200000",
+        "OUT 2 2.000000"]
+
+@pytest.mark.parametrize("samples", [np.zeros(4), np.zeros((2, 3))])
+def test_shape_must_match_channels(samples):
+    with pytest.raises(ValueError):
+        recordingStrainGauge().play_waveform([0, 1], samples, rate=1e4)
+
+def test_empty_waveform_writes_nothing():
+    device = recordingStrainGauge()
+    result = device.play_waveform(0, [], rate=1e4)
+    assert result["samples"] == 0 and np.isnan(result["rate"])
+    assert device.written == b""
+
+def test_rate_is_measured():
+    # one tick covers the whole waveform, the rate must still be measured
+    device = recordingStrainGauge()
+    result = device.play_waveform(0, np.zeros(3), rate=1e4, tick=1.)
+    assert result["rate"] == pytest.approx(3 / result["duration"])
+    assert result["rate"] != 1e4
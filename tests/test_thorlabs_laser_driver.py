@@ -0,0 +1,58 @@
+"""
+Unit tests of the chained measurements of thorlabs.thorlabs_laser_driver on
+a fake USBTMC backend
+"""
+import numpy as np
+import pytest
+
+from qodevices.baseclass.usbtmc_transport import (fakeUsbtmcBackend,
+                                                  fake_instrument)
+from qodevices.thorlabs.thorlabs_laser_driver import (MEASURE_DTYPE,
+                                                      thorlabsLaserDriver)
+
+READINGS = {"MEAS:CURR?": "1.000E-2", "MEAS:VOLT?": "1.5",
+            "MEAS:TEMP?": "25.0", "OUTP?": "1", "OUTP2?": "0"}
+
+class scriptedITC:
+    """answers every query of a ';' chained line, keeps the lines"""
+
+    def __init__(self, readings: dict = READINGS) -> None:
+        self.readings = readings
+        self.lines = []
+
+    def __call__(self, command: str) -> bytes:
+        self.lines.append(command)
+        return (";".join(self.readings[c] for c in command.split(";"))
+                + "\n").encode()
+
+def fake_itc(responder):
+    backend = fakeUsbtmcBackend(responder, transfer_latency=0.,
+                                bandwidth=1e12, response_time=0.)
+    return fake_instrument(thorlabsLaserDriver, backend)
+
+def test_measure_all_in_one_transaction():
+    responder = scriptedITC()
+    record = fake_itc(responder).measure_all()
+    assert responder.lines == [
+        "MEAS:CURR?;MEAS:VOLT?;MEAS:TEMP?;OUTP?;OUTP2?"]
+    assert record.dtype == MEASURE_DTYPE
+    assert (record["curr"], record["volt"], record["temp"]) == (1e-2, 1.5,
+                                                                25.)
+    assert (record["outp"], record["outp2"]) == (1, 0)
+
+def test_acquire_fills_consecutive_records():
+    responder = scriptedITC()
+    data = fake_itc(responder).acquire(3)
+    assert len(responder.lines) == 3
+    assert np.all(data["volt"] == 1.5)
+    assert np.all(np.diff(data["t"]) >= 0) and np.all(data["t"] > 0)
+
+def test_ask_chained_splits_replies():
+    responder = scriptedITC()
+    replies = fake_itc(responder).ask_chained(["MEAS:TEMP?", "OUTP?"])
+    assert replies == ["25.0", "1"]
+    assert responder.lines == ["MEAS:TEMP?;OUTP?"]
+
+def test_short_reply_is_rejected():
+    with pytest.raises(ValueError):
+        fake_itc(lambda command: b"1.5;25.0\n").measure_all()
@@ -0,0 +1,62 @@
+"""
+Unit tests of baseclass.usbtmc_transport on the fake USBTMC backend
+"""
+from qodevices.baseclass.usbtmc_transport import (fakeUsbtmcBackend,
+                                                  fake_instrument,
+                                                  usbtmcTransport)
+from qodevices.thorlabs.thorlabs_laser_driver import thorlabsLaserDriver
+
+BLOCK = b"#41000" + bytes(1000) + b"\n"
+
+def responder(command: str):
+    if command == "DATA?":
+        return BLOCK
+    if command.endswith("?"):
+        return b"1\n"
+    return None
+
+def fake_itc():
+    backend = fakeUsbtmcBackend(responder, transfer_latency=0.,
+                                bandwidth=1e12, response_time=0.)
+    return fake_instrument(thorlabsLaserDriver, backend), backend
+
+def test_settings_are_applied():
+    itc, _ = fake_itc()
+    transport = usbtmcTransport(itc, max_transfer_size=4096, timeout=2.5)
+    assert itc.max_transfer_size == transport.max_transfer_size == 4096
+    assert transport.timeout == 2.5
+
+def test_replies_are_paired_with_their_command():
+    itc, _ = fake_itc()
+    with usbtmcTransport(itc) as transport:
+        itc.write("OUTP 1")
+        assert itc.ask("OUTP?") == "1"
+        itc.ask_raw(b"DATA?")
+    log = transport.log
+    assert log["command"].tolist() == ["OUTP 1", "OUTP?", "DATA?"]
+    assert log["bytes_in"].tolist() == [0, 2, len(BLOCK)]
+    assert all(log["latency"] >= 0)
+    stats = transport.stats()
+    assert stats["DATA?"]["count"] == 1
+    assert stats["DATA?"]["bytes_in"] == len(BLOCK)
+
+def test_read_chunk_sets_bulk_in_size():
+    itc, backend = fake_itc()
+    transport = usbtmcTransport(itc, read_chunk=64)
+    start = backend.transfers
+    assert itc.ask_raw(b"DATA?") == BLOCK
+    small = backend.transfers - start
+    transport.read_chunk = None
+    start = backend.transfers
+    assert itc.ask_raw(b"DATA?") == BLOCK
+    assert backend.transfers - start < small
+    # the instrument's own transfer size is restored after every read
+    assert itc.max_transfer_size != 64
+
+def test_detach_restores_transfers():
+    itc, _ = fake_itc()
+    transport = usbtmcTransport(itc)
+    transport.detach()
+    assert "write_raw" not in vars(itc) and "read_raw" not in vars(itc)
+    assert itc.ask("OUTP?") == "1"
+    assert len(transport.log) == 0
@@ -0,0 +1,67 @@
+"""
+Unit tests of baseclass.waiting with scripted fake instruments
+"""
+import pytest
+from serial import PortNotOpenError
+from usb.core import USBTimeoutError
+
+from qodevices.baseclass.waiting import (wait_opc, wait_register, wait_stb,
+                                         wait_until)
+
+
+class scripted:
+    """answers queries from a list of replies per query, repeating the
+    last one"""
+
+    def __init__(self, replies: dict, timeout: float = 1.) -> None:
+        self.replies = {query: list(r) for query, r in replies.items()}
+        self.timeout = timeout
+        self.asked = []
+
+    def ask(self, query: str):
+        self.asked.append(query)
+        replies = self.replies[query]
+        reply = replies.pop(0) if len(replies) > 1 else replies[0]
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+def test_wait_until_polls_until_true():
+    calls = iter([False, False, True])
+    assert wait_until(lambda: next(calls), min_interval=1e-4) < 1.
+
+def test_wait_until_times_out():
+    with pytest.raises(TimeoutError, match="settled"):
+        wait_until(lambda: False, timeout=0.01, description="settled")
+
+def test_wait_opc_restores_timeout():
+    device = scripted({"*OPC?": ["1"]}, timeout=1.)
+    wait_opc(device, timeout=30.)
+    assert device.timeout == 1.
+
+@pytest.mark.parametrize("reply", [USBTimeoutError("timeout"), b""])
+def test_wait_opc_without_reply(reply):
+    device = scripted({"*OPC?": [reply]})
+    with pytest.raises(TimeoutError):
+        wait_opc(device)
+    assert device.timeout == 1.
+
+@pytest.mark.parametrize("reply, error", [(PortNotOpenError(), OSError),
+                                          ("1;ERR", ValueError),
+                                          ("0", ValueError)])
+def test_wait_opc_passes_other_errors_on(reply, error):
+    device = scripted({"*OPC?": [reply]})
+    with pytest.raises(error) as info:
+        wait_opc(device)
+    assert not isinstance(info.value, TimeoutError)
+    assert device.timeout == 1.
+
+def test_wait_stb_falls_back_to_query():
+    device = scripted({"*STB?": [b"0", b"0", b"+32"]})
+    assert wait_stb(device, 0x20, min_interval=1e-4) == 32
+    assert device.asked == ["*STB?"] * 3
+
+def test_wait_register_value():
+    device = scripted({"STAT:OPER:COND?": ["3", "1", "0"]})
+    assert wait_register(device, "STAT:OPER:COND?", 0x3, value=0,
+                         min_interval=1e-4) == 0